@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import threading
+from typing import Any
+
+from .client import AipiClient
+
+logger = logging.getLogger(__name__)
+
+
+class BotRegistry:
+    """
+    Runs every bot of the AIPI service on one event loop, in a thread of
+    its own, and forgets each bot once it is done, whether its game ended
+    or it failed. Every bot keeps its own websocket, as the game server
+    plays one user per connection.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.lock = threading.Lock()
+        self.bots: dict[int, AipiClient] = {}
+        self.finished_bots: int = 0
+        self.failed_bots: int = 0
+        threading.Thread(
+            target=self.loop.run_forever, name="aipi-bots", daemon=True
+        ).start()
+
+    def add(self, bot: AipiClient):
+        with self.lock:
+            if bot.id in self.bots:
+                raise ValueError(f"Bot {bot.id} is already running")
+            self.bots[bot.id] = bot
+        asyncio.run_coroutine_threadsafe(self.__run(bot), self.loop)
+
+    def has_bot(self, bot_id: int) -> bool:
+        with self.lock:
+            return bot_id in self.bots
+
+    def get_stats(self) -> dict[str, Any]:
+        with self.lock:
+            running_bots = len(self.bots)
+        return {
+            "running_bots": running_bots,
+            "finished_bots": self.finished_bots,
+            "failed_bots": self.failed_bots,
+        }
+
+    async def __run(self, bot: AipiClient):
+        try:
+            await bot.run()
+            self.finished_bots += 1
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            self.failed_bots += 1
+            logger.error("%s: Bot failed: %s", bot.id, e)
+        finally:
+            with self.lock:
+                self.bots.pop(bot.id, None)
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_bot_registry() -> BotRegistry:
+    return BotRegistry.get_instance()
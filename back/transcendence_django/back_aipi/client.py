@@ -3,7 +3,6 @@ import json
 import logging
 import random
 import ssl
-import sys
 from datetime import datetime
 from typing import Any, Callable, Dict
 
@@ -71,6 +70,7 @@ class AipiClient:
         self.rematching: bool = False
         self.arena: Dict[str, Any] = {}
         self.slot: int = 0
+        self.is_over: bool = False
 
     async def run(self):
         logger.info("%s: Start -- %s", self.id, now())
@@ -91,14 +91,15 @@ class AipiClient:
                 )
             except asyncio.TimeoutError:
                 logger.error("%s: Connection attempt timed out. Retrying...", self.id)
-            except asyncio.CancelledError:
-                break
-            finally:
-                backoff_time = 2 ** min(retries, 5)
-                retries += 1
-                if backoff_time > 1 and retries < MAX_CONNECT_ATTEMPTS:
-                    logger.info("%s: Reconnecting in %s seconds", self.id, backoff_time)
-                    await asyncio.sleep(backoff_time)
+            except OSError as e:
+                logger.error("%s: Connection failed: %s. Retrying...", self.id, e)
+            if self.is_over:
+                return
+            backoff_time = 2 ** min(retries, 5)
+            retries += 1
+            if backoff_time > 1 and retries < MAX_CONNECT_ATTEMPTS:
+                logger.info("%s: Reconnecting in %s seconds", self.id, backoff_time)
+                await asyncio.sleep(backoff_time)
         logger.error("%s: Stopping after %s retries", self.id, retries)
 
     async def connect(self):
@@ -135,10 +136,11 @@ class AipiClient:
             if len(response) > 0:
                 # logger.info(f"Sending response: {response}")
                 await websocket.send(response)
+            if self.is_over:
+                return
 
     def goodbye(self):
         logger.info("%s: Ended -- %s", self.id, now())
-        sys.exit()
 
     def answer_message(self, message: str) -> str:
         def __content_from_msg_type(content: Any) -> str:
@@ -201,7 +203,7 @@ class AipiClient:
         def __game_over(game_over: dict[str, Any]) -> str:
             timeout: int | None = game_over.get(TIME)
             if timeout is not None and timeout == 0:
-                self.goodbye()
+                self.is_over = True
             return ""
 
         def __upd_scores(data: Any) -> str:
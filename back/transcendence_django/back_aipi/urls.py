@@ -1,7 +1,8 @@
 from django.urls import path
 
-from .views import AipiView
+from .views import AipiStatsView, AipiView
 
 urlpatterns = [
     path("spawn/", AipiView.as_view(), name="spawn"),
+    path("stats/", AipiStatsView.as_view(), name="stats"),
 ]
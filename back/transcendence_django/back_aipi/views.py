@@ -1,9 +1,7 @@
 # pylint: disable=no-member
-import asyncio
 import json
 import logging
 import random
-import threading
 from http import HTTPStatus
 from typing import Any
 
@@ -13,6 +11,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from transcendence_django.dict_keys import ARENA_ID, ERROR, LOBBY_ID, USER_ID
 
+from .bot_registry import get_bot_registry
 from .client import AipiClient
 from .constants import (
     API_GAME_SOCKET,
@@ -27,7 +26,6 @@ logger = logging.getLogger(__name__)
 
 class AipiView(APIView):
 
-    bots: dict[int, AipiClient] = {}
     coli_rng_offset: int = 0
 
     def __init__(self, **kwargs):
@@ -35,6 +33,7 @@ class AipiView(APIView):
         self.arena_id: str = ""
         self.wss_address: str = ""
         self.ai_user_id: int = -1
+        self.bot_registry = get_bot_registry()
 
     def get(self, request) -> Response:
 
@@ -51,20 +50,14 @@ class AipiView(APIView):
         self.ai_user_id = self.__new_ai_uid()
 
         try:
-            self.bots[self.ai_user_id] = AipiClient(
-                self.wss_address, self.ai_user_id, self.arena_id
+            self.bot_registry.add(
+                AipiClient(self.wss_address, self.ai_user_id, self.arena_id)
             )
-            t = threading.Thread(target=self.run_async_loop_in_thread)
-            t.daemon = True
-            t.start()
             return Response({USER_ID: self.ai_user_id}, status=HTTPStatus.OK)
         except (TypeError, KeyError, ValueError) as e:
             logger.error(e)
             return Response({ERROR: str(e)}, status=HTTPStatus.BAD_REQUEST)
 
-    def run_async_loop_in_thread(self):
-        asyncio.run(self.bots[self.ai_user_id].run())
-
     def __new_ai_uid(self) -> int:
         def __user_id_collision_check(uid: int) -> bool:
             user_response: HTTPResponse = http_get(
@@ -84,10 +77,16 @@ class AipiView(APIView):
         uid: int = random.randint(UID_RNG_BEGIN, UID_RNG_END)
 
         # collisions with ai or real user ids
-        while self.bots.get(uid) is not None or not __user_id_collision_check(uid):
+        while self.bot_registry.has_bot(uid) or not __user_id_collision_check(uid):
             uid = random.randint(
                 UID_RNG_BEGIN + self.coli_rng_offset, UID_RNG_END + self.coli_rng_offset
             )
             self.coli_rng_offset += UID_RNG_STEP
 
         return uid
+
+
+class AipiStatsView(APIView):
+
+    def get(self, _request) -> Response:
+        return Response(get_bot_registry().get_stats(), status=HTTPStatus.OK)
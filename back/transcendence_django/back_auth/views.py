@@ -73,8 +73,7 @@ def logout_view(request):
 def is_logged_view(request):
     try:
         if request.user.is_authenticated:
-            user = CustomUser.objects.get(pk=request.user.id)
-            user.update_last_seen()
+            request.user.update_last_seen()
             return Response({"detail": "User is logged in."}, status=status.HTTP_200_OK)
         return Response(
             {"detail": "User not found"},
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from redis.exceptions import RedisError
+from shared_models.constants import PRESENCE_SWEEP_INTERVAL
+from shared_models.models import CustomUser
+from shared_models.presence import get_presence_group, get_presence_store
+from transcendence_django.dict_keys import (
+    FRIENDS_INFO,
+    FRIENDS_UPDATE,
+    HEARTBEAT,
+    PRESENCE,
+    PRESENCE_SNAPSHOT,
+    PRESENCE_UPDATE,
+    TYPE,
+    USERNAME,
+)
+
+logger = logging.getLogger(__name__)
+
+# pylint: disable=no-member
+
+
+def announce_presence(user_id: int):
+    """
+    Pushes the current presence of the user to the friends. It is read
+    again rather than assumed, as the user may have connected again since
+    the transition.
+    """
+    try:
+        user = CustomUser.objects.get(pk=user_id)
+    except CustomUser.DoesNotExist:
+        return
+    user.notify_friends(user.get_presence())
+
+
+class PresenceConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Presence websocket of a logged in user. Its heartbeats keep the user
+    online; the friends get pushed the user's transitions, and the user
+    gets the friends' ones, after a snapshot of them on connection.
+    Connections that stop beating expire; the sweeper of any process
+    announces their users offline.
+    """
+
+    sweeper: asyncio.Task[None] | None = None
+
+    def __init__(self, *args: tuple[Any, ...], **kwargs: dict[str, Any]):
+        super().__init__(*args, **kwargs)
+        self.user_id: int | None = None
+        self.store = get_presence_store()
+
+    async def connect(self):
+        user = self.scope["user"]
+        if not user.is_authenticated:
+            await self.close()
+            return
+        self.user_id = user.id
+        await self.channel_layer.group_add(
+            get_presence_group(self.user_id), self.channel_name
+        )
+        await self.accept()
+        self.start_sweeper()
+        await self.__beat()
+        friends_info = await database_sync_to_async(user.get_friends_presence)()
+        await self.send_json({TYPE: PRESENCE_SNAPSHOT, FRIENDS_INFO: friends_info})
+
+    async def disconnect(self, code: int):
+        if self.user_id is None:
+            return
+        await self.channel_layer.group_discard(
+            get_presence_group(self.user_id), self.channel_name
+        )
+        try:
+            went_offline = await sync_to_async(
+                self.store.disconnect, thread_sensitive=False
+            )(self.user_id, self.channel_name)
+        except RedisError as e:
+            logger.warning("Presence of user %s not updated: %s", self.user_id, e)
+            return
+        if went_offline:
+            await database_sync_to_async(announce_presence)(self.user_id)
+
+    async def receive_json(self, content: Any, **kwargs: Any):
+        if isinstance(content, dict) and content.get(TYPE) == HEARTBEAT:
+            await self.__beat()
+
+    async def presence_update(self, event: dict[str, Any]):
+        await self.send_json(
+            {
+                TYPE: PRESENCE_UPDATE,
+                USERNAME: event[USERNAME],
+                PRESENCE: event[PRESENCE],
+            }
+        )
+
+    async def friends_update(self, _event: dict[str, Any]):
+        await self.send_json({TYPE: FRIENDS_UPDATE})
+
+    @classmethod
+    def start_sweeper(cls):
+        if cls.sweeper is None or cls.sweeper.done():
+            cls.sweeper = asyncio.create_task(cls.sweep())
+
+    @staticmethod
+    async def sweep():
+        pop_expired = sync_to_async(
+            get_presence_store().pop_expired, thread_sensitive=False
+        )
+        while True:
+            await asyncio.sleep(PRESENCE_SWEEP_INTERVAL)
+            try:
+                expired = await pop_expired()
+            except RedisError as e:
+                logger.warning("Presence sweep failed: %s", e)
+                continue
+            for user_id in expired:
+                await database_sync_to_async(announce_presence)(user_id)
+
+    async def __beat(self):
+        try:
+            came_online = await sync_to_async(
+                self.store.connect, thread_sensitive=False
+            )(self.user_id, self.channel_name)
+        except RedisError as e:
+            logger.warning("Presence of user %s not updated: %s", self.user_id, e)
+            return
+        if came_online:
+            await database_sync_to_async(announce_presence)(self.user_id)
@@ -11,12 +11,6 @@ from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 from rest_framework import status
 from shared_models.models import CustomUser
-from transcendence_django.dict_keys import (
-    FRIENDS_REQUESTS_KEY,
-    OFFLINE_KEY,
-    ONLINE_KEY,
-    PLAYING_KEY,
-)
 
 # pylint: disable=no-member
 
@@ -121,19 +115,7 @@ class DeclineView(FriendshipView):
 def get_friends_info(request):
     try:
         user = CustomUser.objects.get(pk=request.user.id)
-        friend_requests = list(user.get_friend_requests())
-        playing_friends = list(user.get_playing_friends())
-        online_friends = list(user.get_online_friends())
-        offline_friends = list(user.get_offline_friends())
-        return JsonResponse(
-            {
-                FRIENDS_REQUESTS_KEY: friend_requests,
-                PLAYING_KEY: playing_friends,
-                ONLINE_KEY: online_friends,
-                OFFLINE_KEY: offline_friends,
-            },
-            status=status.HTTP_200_OK,
-        )
+        return JsonResponse(user.get_friends_presence(), status=status.HTTP_200_OK)
     except CustomUser.DoesNotExist:
         return JsonResponse(
             {"error": "User does not exist."}, status=HTTPStatus.NOT_FOUND
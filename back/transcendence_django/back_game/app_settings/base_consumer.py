@@ -2,13 +2,22 @@ import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
+from functools import partial
 from typing import Any, Callable, Coroutine, Optional
 
 import autobahn
 from back_game.app_settings.lobby_error import LobbyError
+from back_game.app_settings.local_groups import get_local_groups
+from back_game.app_settings.snapshot_encoder import BINARY_SUBPROTOCOL, SnapshotEncoder
+from back_game.app_settings.update_encoder import EncodedUpdate, dumps
 from back_game.game_arena.arena import Arena
 from back_game.game_settings.game_constants import INVALID_LOBBY, UNKNOWN_LOBBY_ID
 from back_game.monitor.monitor import get_monitor
+from back_game.monitor.traffic_meter import (
+    BINARY_ENCODING,
+    JSON_ENCODING,
+    get_traffic_meter,
+)
 from channels.generic.websocket import AsyncJsonWebsocketConsumer
 from requests.exceptions import ConnectionError
 from transcendence_django.dict_keys import (
@@ -16,6 +25,7 @@ from transcendence_django.dict_keys import (
     ARENA_ID,
     CAPACITY,
     DIRECTION,
+    ENCODED_UPDATE,
     ERROR,
     GAME_ERROR,
     GAME_MESSAGE,
@@ -30,9 +40,11 @@ from transcendence_django.dict_keys import (
     MOVE_PADDLE,
     OVER_CALLBACK,
     PADDLE,
+    PADDLE_INPUT,
     PLAYER,
     PLAYER_NAME,
     PLAYERS,
+    RESYNC,
     START_TIMER,
     START_TIMER_CALLBACK,
     TIME,
@@ -46,13 +58,25 @@ from transcendence_django.dict_keys import (
 logger = logging.getLogger(__name__)
 
 
+def get_lobby_group_name(lobby_id: str) -> str:
+    return f"game_{lobby_id}"
+
+
+def get_arena_group_name(lobby_id: str, arena_id: str) -> str:
+    return f"game_{lobby_id}_{arena_id}"
+
+
 class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
 
     def __init__(self, *args: tuple[Any, ...], **kwargs: dict[str, Any]):
         super().__init__(*args, **kwargs)
         self.room_group_name: str | None = None
+        self.arena_group_name: str | None = None
         self.game = self.get_game_logic_interface()
         self.monitor = self.get_monitor()
+        self.snapshot_encoder: SnapshotEncoder | None = None
+        self.traffic_meter = get_traffic_meter()
+        self.local_groups = get_local_groups()
 
     @abstractmethod
     def get_game_logic_interface(self):
@@ -64,7 +88,7 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
     async def connect(self):
         logger.info("WebSocket connecting: %s", self.scope["path"])
         try:
-            await self.accept()
+            await self.accept(self.__negotiate_subprotocol())
             self.game.init_lobby(self.scope["url_route"]["kwargs"]["lobby_id"])
         except LobbyError as e:
             await self.send_error({LOBBY_ERROR_CODE: e.code, MESSAGE: e.message})
@@ -83,7 +107,9 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
             await self.leave(None)
         except LobbyError:
             pass
+        await self.remove_user_from_arena_group()
         if self.room_group_name is not None:
+            self.local_groups.discard(self.room_group_name, self)
             await self.channel_layer.group_discard(
                 self.room_group_name, self.channel_name
             )
@@ -97,9 +123,11 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
             str, Callable[[dict[str, Any]], Coroutine[Any, Any, Any]]
         ] = {
             MOVE_PADDLE: self.move_paddle,
+            PADDLE_INPUT: self.paddle_input,
             JOIN: self.join,
             LEAVE: self.leave,
             GIVE_UP: self.give_up,
+            RESYNC: self.resync,
         }
         try:
             await message_binding[message_type](message)
@@ -110,10 +138,11 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
         user_id = message[USER_ID]
         player_name = message[PLAYER]
         arena_id: str = message[ARENA_ID]
+        # Bound to the arena rather than to where this consumer is later
         callbacks: dict[str, Optional[Callable[[Any], Coroutine[Any, Any, None]]]] = {
-            UPDATE_CALLBACK: self.send_update,
-            OVER_CALLBACK: self.send_game_over,
-            START_TIMER_CALLBACK: self.send_start_timer,
+            UPDATE_CALLBACK: partial(self.send_arena_update, arena_id),
+            OVER_CALLBACK: partial(self.send_game_over, arena_id),
+            START_TIMER_CALLBACK: partial(self.send_start_timer, arena_id),
         }
         logger.info(
             "Joining game with user_id: %s, player_name: %s, arena_id: %s",
@@ -122,6 +151,8 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
             arena_id,
         )
         await self.game.join(user_id, player_name, arena_id, callbacks)
+        if self.game.arena_id is not None:
+            await self.add_user_to_arena_group(self.game.arena_id)
         await self.send_message(f"{self.game.user_id} has joined the game.")
         await self.send_players()
         await self.send_arena_data()
@@ -134,15 +165,24 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
     async def give_up(self, _):
         await self.game.give_up()
         await self.send_message(f"{self.game.user_id} has given up.")
-        await self.send_update({GIVE_UP: self.game.user_id})
+        await self.send_to_arena({GIVE_UP: self.game.user_id})
         await self.send_players()
         await self.send_arena_data()
 
+    async def resync(self, _):
+        if self.snapshot_encoder is not None:
+            logger.info("Resyncing binary snapshots: %s", self.channel_name)
+            self.snapshot_encoder.reset()
+
+    async def paddle_input(self, message: dict[str, Any]):
+        # Only recorded: the paddle moves and is broadcast with the ticks
+        self.game.set_paddle_input(message[PLAYER], message[DIRECTION])
+
     async def move_paddle(self, message: dict[str, Any]):
         player_name: str = message[PLAYER]
         direction: int = message[DIRECTION]
         paddle_data = self.game.move_paddle(player_name, direction)
-        await self.send_update({PADDLE: paddle_data})
+        await self.send_to_arena({PADDLE: paddle_data})
 
     async def send_arena_data(self):
         if self.game.arena_id is None:
@@ -151,27 +191,27 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
             arena: Arena = self.monitor.get_arena(
                 self.game.lobby.id, self.game.arena_id
             )
-            await self.send_update({ARENA: arena.to_dict()})
+            await self.send_to_arena({ARENA: arena.to_dict()})
         except KeyError:
             pass  # Arena not found
 
-    async def send_start_timer(self, time: float):
+    async def send_start_timer(self, arena_id: str, time: float):
         logger.info("Game will begin in %s seconds...", time)
-        await self.send_update(
+        await self.send_arena_update(
+            arena_id,
             {
                 START_TIMER: {
                     TIME: time,
                     MESSAGE: "Game will begin in ",
                 }
-            }
+            },
         )
 
-    async def send_game_over(self, time: float):
+    async def send_game_over(self, arena_id: str, time: float):
         try:
-            summary = self.monitor.get_game_summary(
-                self.game.lobby.id, self.game.arena_id
-            )
-            await self.send_update(
+            summary = self.monitor.get_game_summary(self.game.lobby.id, arena_id)
+            await self.send_arena_update(
+                arena_id,
                 {
                     GAME_OVER: {
                         PLAYERS: summary[PLAYERS],
@@ -181,7 +221,7 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
                         TIME: time,
                         MESSAGE: "Game over. Thanks for playing!",
                     }
-                }
+                },
             )
         except KeyError:
             pass  # Arena not found
@@ -199,20 +239,73 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
 
     async def add_user_to_channel_group(self):
         logger.info("Adding user to lobby group (Tournament)")
-        self.room_group_name = f"game_{self.game.lobby.id}"
+        self.room_group_name = get_lobby_group_name(self.game.lobby.id)
         logger.info("User Connected to %s", self.room_group_name)
         try:
             await self.channel_layer.group_add(self.room_group_name, self.channel_name)
         except ConnectionError as e:
             logger.error("Connection error: %s", e)
+        self.local_groups.add(self.room_group_name, self)
+
+    async def add_user_to_arena_group(self, arena_id: str):
+        """
+        Subscribes to the traffic of the arena: ticks, paddles, timers and
+        game over. The lobby group only gets what concerns the whole lobby.
+        """
+        arena_group_name = get_arena_group_name(self.game.lobby.id, arena_id)
+        if arena_group_name == self.arena_group_name:
+            return
+        await self.remove_user_from_arena_group()
+        self.arena_group_name = arena_group_name
+        # Locally first, the game may start while the layer is joined
+        self.local_groups.add(arena_group_name, self)
+        try:
+            await self.channel_layer.group_add(arena_group_name, self.channel_name)
+        except ConnectionError as e:
+            logger.error("Connection error: %s", e)
+
+    async def remove_user_from_arena_group(self):
+        if self.arena_group_name is None:
+            return
+        arena_group_name, self.arena_group_name = self.arena_group_name, None
+        self.local_groups.discard(arena_group_name, self)
+        await self.channel_layer.group_discard(arena_group_name, self.channel_name)
+
+    def __negotiate_subprotocol(self) -> str | None:
+        if BINARY_SUBPROTOCOL in self.scope.get("subprotocols", []):
+            self.snapshot_encoder = SnapshotEncoder()
+            return BINARY_SUBPROTOCOL
+        return None
 
     async def __safe_send(self, data: dict[str, Any]):
         try:
-            await self.send(text_data=json.dumps(data))
+            text_data = dumps(data)
         except ValueError as e:
             logger.error("Serialization value error: %s", e)
+            return
         except TypeError as e:
             logger.error("Serialization type error: %s", e)
+            return
+        await self.__safe_send_text(text_data)
+
+    async def __safe_send_text(self, text_data: str, arena_id: str | None = None):
+        try:
+            await self.send(text_data=text_data)
+            if arena_id is not None:
+                self.traffic_meter.record(
+                    arena_id, JSON_ENCODING, self.channel_name, len(text_data)
+                )
+        except ConnectionResetError as e:
+            logger.error("Connection reset error: %s", e)
+        except autobahn.exception.Disconnected as e:
+            logger.error("Connection closed error: %s", e)
+
+    async def __safe_send_bytes(self, bytes_data: bytes, arena_id: str):
+        try:
+            await self.send(bytes_data=bytes_data)
+            self.traffic_meter.record(
+                arena_id, BINARY_ENCODING, self.channel_name, len(bytes_data)
+            )
         except ConnectionResetError as e:
             logger.error("Connection reset error: %s", e)
         except autobahn.exception.Disconnected as e:
@@ -226,25 +319,59 @@ class BaseConsumer(AsyncJsonWebsocketConsumer, ABC):
         error = event[ERROR]
         await self.__safe_send({TYPE: GAME_ERROR, ERROR: error})
 
-    async def game_update(self, event: dict[str, str]):
+    async def game_update(self, event: dict[str, Any]):
         message = event[UPDATE]
-        await self.__safe_send({TYPE: GAME_UPDATE, UPDATE: message})
+        encoded_update: EncodedUpdate = event.get(ENCODED_UPDATE) or EncodedUpdate(
+            message
+        )
+        arena_id = message.get(ARENA_ID)
+        if self.snapshot_encoder is not None:
+            frame, message = self.snapshot_encoder.encode(
+                message, encoded_update.snapshot_cache
+            )
+            if frame is not None:
+                await self.__safe_send_bytes(frame, arena_id)
+            if not message:
+                return
+        try:
+            text_data = encoded_update.get_text(message)
+        except (ValueError, TypeError) as e:
+            logger.error("Serialization error: %s", e)
+            return
+        await self.__safe_send_text(text_data, arena_id)
 
     async def send_error(self, error: dict[str, Any]):
         logger.info("Sending error: %s: %s", error[LOBBY_ERROR_CODE], error[MESSAGE])
         await self.__safe_send({TYPE: GAME_ERROR, ERROR: error})
 
     async def send_update(self, update: dict[str, Any]):
-        update = {**{ARENA_ID: self.game.arena_id}, **update}
+        update[ARENA_ID] = self.game.arena_id
         # logger.info("Sending update: %s", update)
         await self.send_data({TYPE: GAME_UPDATE, UPDATE: update})
 
+    async def send_arena_update(self, arena_id: str, update: dict[str, Any]):
+        update[ARENA_ID] = arena_id
+        await self.send_data(
+            {TYPE: GAME_UPDATE, UPDATE: update},
+            get_arena_group_name(self.game.lobby.id, arena_id),
+        )
+
+    async def send_to_arena(self, update: dict[str, Any]):
+        if self.game.arena_id is not None:
+            await self.send_arena_update(self.game.arena_id, update)
+
     async def send_message(self, message: str):
         logger.info("Sending message: %s", message)
         await self.send_data({TYPE: GAME_MESSAGE, MESSAGE: message})
 
-    async def send_data(self, data: dict[str, Any]):
+    async def send_data(self, data: dict[str, Any], group_name: str | None = None):
+        if group_name is None:
+            group_name = self.room_group_name
         try:
-            await self.channel_layer.group_send(self.room_group_name, data)
+            local_data = data
+            if data[TYPE] == GAME_UPDATE:
+                local_data = {**data, ENCODED_UPDATE: EncodedUpdate(data[UPDATE])}
+            if not await self.local_groups.group_send(group_name, local_data):
+                await self.channel_layer.group_send(group_name, data)
         except asyncio.CancelledError:
             logger.error("WebSocket connection closed while trying to send a message.")
@@ -4,6 +4,7 @@ from typing import Any, Callable, Coroutine, Optional
 from back_game.app_settings.lobby_error import LobbyError
 from back_game.game_settings.game_constants import (
     INVALID_ARENA,
+    INVALID_INPUT,
     INVALID_LOBBY,
     NOT_ENTERED,
     NOT_JOINED,
@@ -72,8 +73,22 @@ class GameLogicInterface:
             )
         except KeyError:
             pass
+        except ValueError as e:
+            raise LobbyError(INVALID_INPUT, str(e)) from e
         return {}
 
+    def set_paddle_input(self, player_name: str, direction: int):
+        if not self.has_joined:
+            raise LobbyError(NOT_JOINED, "Attempt to move paddle without joining.")
+        try:
+            self.monitor.set_paddle_input(
+                self.lobby.id, self.arena_id, player_name, direction
+            )
+        except KeyError:
+            pass
+        except ValueError as e:
+            raise LobbyError(INVALID_INPUT, str(e)) from e
+
     def is_lobby_full(self) -> bool:
         return self.lobby.is_full()
 
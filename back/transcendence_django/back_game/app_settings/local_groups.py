@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from typing import Any
+
+from transcendence_django.dict_keys import TYPE
+
+logger = logging.getLogger(__name__)
+
+
+class LocalGroups:
+    """
+    In-process mirror of the channel layer groups of the game consumers.
+    Lobbies and their arenas only live in the Monitor of the process that
+    created them, and a consumer can only join a lobby found there, so
+    every member of a game group is connected to this process. Messages
+    are handed to those consumers directly; the channel layer is only
+    used when the group has no member here.
+    Delivered messages are shared between consumers and must not be
+    mutated by handlers.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.groups: dict[str, set[Any]] = {}
+        self.local_messages: int = 0
+        self.local_deliveries: int = 0
+        self.layer_messages: int = 0
+
+    def add(self, group: str, consumer: Any):
+        self.groups.setdefault(group, set()).add(consumer)
+
+    def discard(self, group: str, consumer: Any):
+        members = self.groups.get(group)
+        if members is None:
+            return
+        members.discard(consumer)
+        if not members:
+            del self.groups[group]
+
+    async def group_send(self, group: str, message: dict[str, Any]) -> bool:
+        """
+        Dispatches the message to the local members of the group the way
+        the channel layer would, and returns False if there is none.
+        """
+        members = self.groups.get(group)
+        if not members:
+            self.layer_messages += 1
+            return False
+        handler_name = message[TYPE].replace(".", "_")
+        results = await asyncio.gather(
+            *(getattr(consumer, handler_name)(message) for consumer in list(members)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Local delivery to %s failed: %s", group, result)
+        self.local_messages += 1
+        self.local_deliveries += len(results)
+        return True
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "groups": len(self.groups),
+            "consumers": sum(len(members) for members in self.groups.values()),
+            "local_messages": self.local_messages,
+            "local_deliveries": self.local_deliveries,
+            "layer_messages": self.layer_messages,
+        }
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_local_groups() -> LocalGroups:
+    return LocalGroups.get_instance()
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import logging
+import math
+from typing import Any, Callable, Coroutine
+
+import autobahn
+from back_game.app_settings.lobby_error import LobbyError
+from back_game.app_settings.update_encoder import dumps
+from back_game.game_settings.game_constants import (
+    INVALID_REPLAY,
+    INVALID_REPLAY_MESSAGE,
+    INVALID_REPLAY_SPEED,
+    INVALID_REPLAY_TIME,
+    REPLAY_FRAME_RATE,
+    REPLAY_LIVE_POLL_INTERVAL,
+    REPLAY_MAX_SPEED,
+    REPLAY_MIN_SPEED,
+    UNKNOWN_REPLAY,
+)
+from back_game.monitor.monitor import get_monitor
+from back_game.monitor.replay_hub import ReplayStream, get_replay_hub
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from transcendence_django.dict_keys import (
+    ERROR,
+    GAME_ERROR,
+    GAME_UPDATE,
+    LOBBY_ERROR_CODE,
+    MESSAGE,
+    PAUSE,
+    REPLAY,
+    REPLAY_OVER,
+    RESUME,
+    SEEK,
+    SPEED,
+    TIME,
+    TYPE,
+    UPDATE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Plays a game to a viewer, from its stored replay or live from its
+    arena, at 1x to 16x speed. The frames come from the replay stream
+    the viewers of the game share: this consumer only keeps its position.
+    """
+
+    def __init__(self, *args: tuple[Any, ...], **kwargs: dict[str, Any]):
+        super().__init__(*args, **kwargs)
+        self.hub = get_replay_hub()
+        self.stream: ReplayStream | None = None
+        self.frame_index: int = 0
+        self.speed: int = REPLAY_MIN_SPEED
+        self.playing = asyncio.Event()
+        self.player: asyncio.Task | None = None
+
+    async def connect(self):
+        logger.info("WebSocket connecting: %s", self.scope["path"])
+        await self.accept()
+        kwargs = self.scope["url_route"]["kwargs"]
+        try:
+            if "replay_name" in kwargs:
+                self.stream = await self.hub.open(kwargs["replay_name"])
+            else:
+                arena = get_monitor().get_arena(kwargs["lobby_id"], kwargs["arena_id"])
+                self.stream = self.hub.open_live(arena)
+        except KeyError:
+            await self.send_error(UNKNOWN_REPLAY)
+            await self.close()
+            return
+        await self.__safe_send({TYPE: GAME_UPDATE, UPDATE: self.__get_info()})
+        self.playing.set()
+        self.player = asyncio.create_task(self.play())
+        logger.info("WebSocket connected: %s", self.scope["path"])
+
+    async def disconnect(self, close_code: int):
+        if self.player is not None:
+            self.player.cancel()
+            self.player = None
+        if self.stream is not None:
+            self.hub.close(self.stream)
+            self.stream = None
+        logger.info("Disconnect with code: %s", close_code)
+
+    async def receive(self, text_data: str):
+        try:
+            content = json.loads(text_data)
+        except json.JSONDecodeError:
+            content = None
+        message_binding: dict[
+            str, Callable[[dict[str, Any]], Coroutine[Any, Any, Any]]
+        ] = {
+            SEEK: self.seek,
+            SPEED: self.set_speed,
+            PAUSE: self.pause,
+            RESUME: self.resume,
+        }
+        try:
+            if (
+                not isinstance(content, dict)
+                or content.get(TYPE) not in message_binding
+                or not isinstance(content.get(MESSAGE), dict)
+            ):
+                raise LobbyError(INVALID_REPLAY, INVALID_REPLAY_MESSAGE)
+            await message_binding[content[TYPE]](content[MESSAGE])
+        except LobbyError as e:
+            await self.send_error(e.message)
+
+    async def seek(self, message: dict[str, Any]):
+        time = message.get(TIME)
+        if (
+            not isinstance(time, (int, float))
+            or isinstance(time, bool)
+            or not math.isfinite(time)
+            or time < 0
+        ):
+            raise LobbyError(INVALID_REPLAY, INVALID_REPLAY_TIME)
+        self.frame_index = int(time * REPLAY_FRAME_RATE)
+        self.playing.set()
+
+    async def set_speed(self, message: dict[str, Any]):
+        speed = message.get(SPEED)
+        if (
+            not isinstance(speed, int)
+            or isinstance(speed, bool)
+            or not REPLAY_MIN_SPEED <= speed <= REPLAY_MAX_SPEED
+        ):
+            raise LobbyError(INVALID_REPLAY, INVALID_REPLAY_SPEED)
+        self.speed = speed
+
+    async def pause(self, _):
+        self.playing.clear()
+
+    async def resume(self, _):
+        self.playing.set()
+
+    async def play(self):
+        """
+        Sends a frame per frame interval, skipping the frames in between
+        above 1x, and waits for the game to get there when it is live.
+        """
+        stream = self.stream
+        if stream is None:
+            return
+        loop = asyncio.get_running_loop()
+        interval = 1 / REPLAY_FRAME_RATE
+        next_time = loop.time()
+        while True:
+            await self.playing.wait()
+            frame_count = stream.get_frame_count()
+            if frame_count is not None and self.frame_index >= frame_count:
+                self.frame_index = frame_count - 1
+            frame_index = self.frame_index
+            frame = await stream.get_frame(frame_index)
+            if frame is None:
+                await asyncio.sleep(REPLAY_LIVE_POLL_INTERVAL)
+                was_live = stream.is_live()
+                await stream.refresh()
+                if was_live and not stream.is_live():
+                    # Now with its duration
+                    await self.__safe_send(
+                        {TYPE: GAME_UPDATE, UPDATE: self.__get_info()}
+                    )
+                next_time = loop.time()
+                continue
+            if self.frame_index != frame_index:
+                continue  # Sought while it was decoded
+            await self.__safe_send_text(frame)
+            if self.frame_index != frame_index:
+                continue
+            if frame_count is not None and frame_index == frame_count - 1:
+                self.playing.clear()
+                await self.__safe_send(
+                    {
+                        TYPE: GAME_UPDATE,
+                        UPDATE: {REPLAY: stream.name, REPLAY_OVER: True},
+                    }
+                )
+                continue
+            self.frame_index += self.speed
+            next_time = max(next_time + interval, loop.time() - interval)
+            await asyncio.sleep(next_time - loop.time())
+
+    async def send_error(self, message: str):
+        logger.info("Sending error: %s: %s", INVALID_REPLAY, message)
+        await self.__safe_send(
+            {
+                TYPE: GAME_ERROR,
+                ERROR: {LOBBY_ERROR_CODE: INVALID_REPLAY, MESSAGE: message},
+            }
+        )
+
+    def __get_info(self) -> dict[str, Any]:
+        info: dict[str, Any] = {}
+        if self.stream is not None:
+            info = self.stream.get_info()
+        info[SPEED] = self.speed
+        return {REPLAY: info}
+
+    async def __safe_send(self, data: dict[str, Any]):
+        await self.__safe_send_text(dumps(data))
+
+    async def __safe_send_text(self, text_data: str):
+        try:
+            await self.send(text_data=text_data)
+        except ConnectionResetError as e:
+            logger.error("Connection reset error: %s", e)
+        except autobahn.exception.Disconnected as e:
+            logger.error("Connection closed error: %s", e)
@@ -1,4 +1,4 @@
-from back_game.app_settings import consumers
+from back_game.app_settings import consumers, replay_consumer
 from django.urls import re_path
 
 websocket_urlpatterns = [
@@ -9,4 +9,12 @@ websocket_urlpatterns = [
         r"ws/game/tournament/(?P<lobby_id>\w+)/$",
         consumers.TournamentConsumer.as_asgi(),
     ),
+    re_path(
+        r"ws/game/replay/(?P<replay_name>\w+\.replay)/$",
+        replay_consumer.ReplayConsumer.as_asgi(),
+    ),
+    re_path(
+        r"ws/game/replay/(?P<lobby_id>\w+)/(?P<arena_id>\w+)/$",
+        replay_consumer.ReplayConsumer.as_asgi(),
+    ),
 ]
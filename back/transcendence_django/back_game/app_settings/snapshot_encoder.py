@@ -0,0 +1,285 @@
+import logging
+import struct
+from typing import Any
+from weakref import WeakSet
+
+from transcendence_django.dict_keys import (
+    ARENA_ID,
+    BALL,
+    PADDLE,
+    PADDLES,
+    POSITION,
+    SLOT,
+    STATUS,
+)
+
+logger = logging.getLogger(__name__)
+
+BINARY_SUBPROTOCOL = "pong.snapshot.v2"
+
+# Frame layout, little-endian:
+#   header   uint8 arena ref, uint8 field mask
+#   arena id uint64                      if ARENA_ID_FIELD, starts a new baseline
+#   ball     int32 x, int32 y            if BALL_FIELD, fixed point: BALL_SCALE units
+#   status   uint8                       if STATUS_FIELD
+#   paddle   uint8 slot, int16 x, int16 y if PADDLE_FIELD
+#   paddles  uint8 count, then count paddles as above, if PADDLES_FIELD
+ARENA_ID_FIELD = 0x01
+BALL_FIELD = 0x02
+STATUS_FIELD = 0x04
+PADDLE_FIELD = 0x08
+PADDLES_FIELD = 0x10
+
+HEADER = struct.Struct("<BB")
+ARENA_ID_VALUE = struct.Struct("<Q")
+BALL_VALUE = struct.Struct("<ii")
+STATUS_VALUE = struct.Struct("<B")
+PADDLE_VALUE = struct.Struct("<Bhh")
+PADDLE_COUNT_VALUE = struct.Struct("<B")
+
+MAX_ARENA_REFS = 256
+MAX_ARENA_ID = 2**64 - 1
+MIN_COORDINATE = -(2**15)
+MAX_COORDINATE = 2**15 - 1
+# The ball moves by less than a pixel per tick, so it keeps 4 fractional bits
+BALL_SCALE = 16
+MIN_BALL_COORDINATE = -(2**31)
+MAX_BALL_COORDINATE = 2**31 - 1
+PARSED_UPDATE = "parsed_update"
+
+
+class ArenaBaseline:
+
+    def __init__(self):
+        self.ball: tuple[int, int] | None = None
+        self.status: int | None = None
+        self.paddles: dict[int, tuple[int, int]] = {}
+
+
+class SnapshotEncoder:
+    """
+    Encodes the snapshot part of game updates for one client as binary
+    deltas against the last frame sent to it. The arena id is only sent
+    with the first frame of an arena; later frames refer to it by a one
+    byte ref. Updates go through a single ordered websocket, so every
+    frame sent is a frame the client will have decoded before the next
+    one; a client that lost track asks for a resync.
+    The ref of a removed arena is freed for the next new arena, whose
+    first frame starts a new baseline for it on the client.
+    """
+
+    ENCODERS: WeakSet["SnapshotEncoder"] = WeakSet()
+
+    def __init__(self):
+        self.arena_refs: dict[str, int] = {}
+        self.baselines: list[ArenaBaseline] = []
+        self.free_refs: list[int] = []
+        SnapshotEncoder.ENCODERS.add(self)
+
+    def reset(self):
+        self.arena_refs = {}
+        self.baselines = []
+        self.free_refs = []
+
+    def release(self, arena_id: str):
+        arena_ref = self.arena_refs.pop(arena_id, None)
+        if arena_ref is not None:
+            self.free_refs.append(arena_ref)
+
+    @classmethod
+    def release_arena(cls, arena_id: str):
+        for encoder in list(cls.ENCODERS):
+            encoder.release(arena_id)
+
+    def encode(
+        self, update: dict[str, Any], cache: dict[Any, Any] | None = None
+    ) -> tuple[bytes | None, dict[str, Any]]:
+        """
+        Returns the binary frame for the snapshot fields of the update that
+        changed, or None, and the remaining fields to send as JSON.
+        Encoders given the same cache for the same update share the parsing
+        and, when their baselines are equal, the frame.
+        """
+        if cache is None:
+            cache = {}
+        parsed = cache.get(PARSED_UPDATE)
+        if parsed is None:
+            parsed = cache[PARSED_UPDATE] = self.__parse(update)
+        arena_id, ball, status, paddle, paddles, remaining = parsed
+        if arena_id is None:
+            return None, update
+        arena_ref = self.arena_refs.get(arena_id)
+        is_new_arena = arena_ref is None
+        if is_new_arena:
+            if len(self.arena_refs) >= MAX_ARENA_REFS:
+                return None, update
+            if self.free_refs:
+                arena_ref = self.free_refs.pop()
+                self.baselines[arena_ref] = ArenaBaseline()
+            else:
+                arena_ref = len(self.baselines)
+                self.baselines.append(ArenaBaseline())
+            self.arena_refs[arena_id] = arena_ref
+        baseline = self.baselines[arena_ref]
+        paddle_baseline = (
+            baseline.paddles.get(paddle[0]) if paddle is not None else None
+        )
+        paddles_baseline = (
+            tuple(baseline.paddles.get(slot) for slot, *_ in paddles)
+            if paddles is not None
+            else None
+        )
+        frame_key = (
+            arena_ref,
+            is_new_arena,
+            baseline.ball,
+            baseline.status,
+            paddle_baseline,
+            paddles_baseline,
+        )
+        if frame_key not in cache:
+            cache[frame_key] = self.__pack(
+                arena_id, arena_ref, is_new_arena, parsed, baseline
+            )
+        if ball is not None:
+            baseline.ball = ball
+        if status is not None:
+            baseline.status = status
+        if paddle is not None:
+            baseline.paddles[paddle[0]] = paddle[1:]
+        if paddles is not None:
+            for slot, *coordinates in paddles:
+                baseline.paddles[slot] = tuple(coordinates)
+        return cache[frame_key], remaining
+
+    @staticmethod
+    def __pack(
+        arena_id: str,
+        arena_ref: int,
+        is_new_arena: bool,
+        parsed: tuple,
+        baseline: ArenaBaseline,
+    ) -> bytes | None:
+        _, ball, status, paddle, paddles, _ = parsed
+        field_mask = 0
+        values: list[bytes] = []
+        if is_new_arena:
+            field_mask |= ARENA_ID_FIELD
+            values.append(ARENA_ID_VALUE.pack(int(arena_id)))
+        if ball is not None and ball != baseline.ball:
+            field_mask |= BALL_FIELD
+            values.append(BALL_VALUE.pack(*ball))
+        if status is not None and status != baseline.status:
+            field_mask |= STATUS_FIELD
+            values.append(STATUS_VALUE.pack(status))
+        if paddle is not None and baseline.paddles.get(paddle[0]) != paddle[1:]:
+            field_mask |= PADDLE_FIELD
+            values.append(PADDLE_VALUE.pack(*paddle))
+        if paddles is not None:
+            moved = [
+                paddle
+                for paddle in paddles
+                if baseline.paddles.get(paddle[0]) != paddle[1:]
+            ]
+            if moved:
+                field_mask |= PADDLES_FIELD
+                values.append(PADDLE_COUNT_VALUE.pack(len(moved)))
+                values.extend(PADDLE_VALUE.pack(*paddle) for paddle in moved)
+        if field_mask == 0:
+            return None
+        return HEADER.pack(arena_ref, field_mask) + b"".join(values)
+
+    @staticmethod
+    def __parse(update: dict[str, Any]) -> tuple:
+        arena_id = update.get(ARENA_ID)
+        ball = SnapshotEncoder.__get_ball(update)
+        status = update.get(STATUS)
+        paddle = SnapshotEncoder.__get_paddle(update.get(PADDLE))
+        paddles = SnapshotEncoder.__get_paddles(update)
+        if not SnapshotEncoder.__is_valid_arena_id(arena_id) or (
+            ball is None and status is None and paddle is None and paddles is None
+        ):
+            return None, None, None, None, None, update
+        remaining = {
+            key: value
+            for key, value in update.items()
+            if key not in (ARENA_ID, BALL, STATUS, PADDLE, PADDLES)
+            or (key == BALL and ball is None)
+            or (key == PADDLE and paddle is None)
+            or (key == PADDLES and paddles is None)
+        }
+        if remaining:
+            remaining[ARENA_ID] = arena_id
+        return (
+            arena_id,
+            ball,
+            int(status) if status is not None else None,
+            paddle,
+            paddles,
+            remaining,
+        )
+
+    @staticmethod
+    def __is_valid_arena_id(arena_id: Any) -> bool:
+        return (
+            isinstance(arena_id, str)
+            and arena_id.isdigit()
+            and int(arena_id) <= MAX_ARENA_ID
+        )
+
+    @staticmethod
+    def __get_coordinates(position: Any) -> tuple[int, int] | None:
+        try:
+            x, y = int(position["x"]), int(position["y"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if not (
+            MIN_COORDINATE <= x <= MAX_COORDINATE
+            and MIN_COORDINATE <= y <= MAX_COORDINATE
+        ):
+            return None
+        return x, y
+
+    @staticmethod
+    def __get_ball(update: dict[str, Any]) -> tuple[int, int] | None:
+        ball = update.get(BALL)
+        if not isinstance(ball, dict) or ball.keys() != {POSITION}:
+            return None
+        try:
+            x, y = (
+                round(float(ball[POSITION]["x"]) * BALL_SCALE),
+                round(float(ball[POSITION]["y"]) * BALL_SCALE),
+            )
+        except (KeyError, TypeError, ValueError, OverflowError):
+            return None
+        if not (
+            MIN_BALL_COORDINATE <= x <= MAX_BALL_COORDINATE
+            and MIN_BALL_COORDINATE <= y <= MAX_BALL_COORDINATE
+        ):
+            return None
+        return x, y
+
+    @staticmethod
+    def __get_paddles(
+        update: dict[str, Any],
+    ) -> tuple[tuple[int, int, int], ...] | None:
+        paddles = update.get(PADDLES)
+        if not isinstance(paddles, list) or not 0 < len(paddles) <= 255:
+            return None
+        parsed = tuple(SnapshotEncoder.__get_paddle(paddle) for paddle in paddles)
+        if None in parsed:
+            return None
+        return parsed
+
+    @staticmethod
+    def __get_paddle(paddle: Any) -> tuple[int, int, int] | None:
+        if not isinstance(paddle, dict) or paddle.keys() != {SLOT, POSITION}:
+            return None
+        coordinates = SnapshotEncoder.__get_coordinates(paddle[POSITION])
+        if (
+            coordinates is None
+            or not isinstance(paddle[SLOT], int)
+            or not 0 <= paddle[SLOT] <= 255
+        ):
+            return None
+        return paddle[SLOT], *coordinates
@@ -0,0 +1,51 @@
+import json
+import logging
+from typing import Any, Callable
+
+from django.conf import settings
+from transcendence_django.dict_keys import GAME_UPDATE, TYPE, UPDATE
+
+logger = logging.getLogger(__name__)
+
+JSON_ENCODER = "json"
+ORJSON_ENCODER = "orjson"
+
+
+def get_json_dumps(name: str) -> Callable[[Any], str]:
+    if name == ORJSON_ENCODER:
+        try:
+            # pylint: disable-next=import-outside-toplevel
+            import orjson
+
+            return lambda data: orjson.dumps(
+                data, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except ImportError:
+            logger.error("orjson is not installed, using json.")
+    elif name != JSON_ENCODER:
+        logger.error("Unknown JSON encoder %s, using json.", name)
+    return lambda data: json.dumps(data, separators=(",", ":"))
+
+
+dumps = get_json_dumps(settings.GAME_JSON_ENCODER)
+
+
+class EncodedUpdate:
+    """
+    Encodings of one game update, computed once and shared by all the
+    consumers it is delivered to: the JSON text of the update or of what
+    is left of it after the binary snapshot fields, and the binary frames
+    of the snapshot encoders, cached per baseline.
+    """
+
+    def __init__(self, update: dict[str, Any]):
+        self.update: dict[str, Any] = update
+        self.snapshot_cache: dict[Any, Any] = {}
+        self.texts: dict[int, tuple[dict[str, Any], str]] = {}
+
+    def get_text(self, update: dict[str, Any]) -> str:
+        cached = self.texts.get(id(update))
+        if cached is None:
+            cached = (update, dumps({TYPE: GAME_UPDATE, UPDATE: update}))
+            self.texts[id(update)] = cached
+        return cached[1]
@@ -4,6 +4,9 @@ from back_game.app_settings.views import (
     join_lobby,
     join_specific_lobby,
     join_tournament,
+    playing_status_stats,
+    tick_stats,
+    traffic_stats,
 )
 from django.urls import path
 
@@ -13,4 +16,7 @@ urlpatterns = [
     path("join_specific_lobby/", join_specific_lobby, name="join_specific_lobby"),
     path("join_tournament/", join_tournament, name="join_tournament"),
     path("is_user_in_lobby/", is_user_in_lobby, name="is_user_in_lobby"),
+    path("tick_stats/", tick_stats, name="tick_stats"),
+    path("traffic_stats/", traffic_stats, name="traffic_stats"),
+    path("playing_status_stats/", playing_status_stats, name="playing_status_stats"),
 ]
@@ -4,7 +4,9 @@ from http import HTTPStatus
 from json import JSONDecodeError
 from typing import Any
 
+from back_game.app_settings.local_groups import get_local_groups
 from back_game.monitor.monitor import get_monitor
+from back_game.monitor.replay_hub import get_replay_hub
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from transcendence_django.dict_keys import (
@@ -109,9 +111,29 @@ def is_user_in_lobby(request) -> JsonResponse:
         data = json.loads(request.body.decode("utf-8"))
         user_id = data[USER_ID]
         is_user_in_lobby_value: bool = MONITOR.is_user_in_lobby(user_id)
-        return JsonResponse(
-            {"isInLobby": is_user_in_lobby_value}, status=HTTPStatus.OK
-        )
+        return JsonResponse({"isInLobby": is_user_in_lobby_value}, status=HTTPStatus.OK)
     except (JSONDecodeError, TypeError) as e:
         logger.error(e)
         return JsonResponse({ERROR: str(e)}, status=HTTPStatus.BAD_REQUEST)
+
+
+@require_http_methods(["GET"])
+def tick_stats(_request) -> JsonResponse:
+    return JsonResponse(MONITOR.get_tick_stats(), status=HTTPStatus.OK)
+
+
+@require_http_methods(["GET"])
+def playing_status_stats(_request) -> JsonResponse:
+    return JsonResponse(MONITOR.get_playing_status_stats(), status=HTTPStatus.OK)
+
+
+@require_http_methods(["GET"])
+def traffic_stats(_request) -> JsonResponse:
+    return JsonResponse(
+        {
+            "arenas": MONITOR.get_traffic_stats(),
+            "local_fanout": get_local_groups().get_stats(),
+            "replays": get_replay_hub().get_stats(),
+        },
+        status=HTTPStatus.OK,
+    )
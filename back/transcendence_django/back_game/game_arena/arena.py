@@ -1,16 +1,26 @@
 import asyncio
 import datetime
 import logging
+import math
+import random
 from typing import Any, Callable, Coroutine, Optional
 
 from back_game.game_arena.game import Game, GameStatus
 from back_game.game_arena.player import Player, PlayerStatus
 from back_game.game_arena.player_manager import PlayerManager
+from back_game.game_arena.replay_log import ReplayRecorder
 from back_game.game_settings.game_constants import (
+    DEFAULT_BROADCAST_RATE,
+    MAX_ACCUMULATED_TIME,
+    MAX_BROADCAST_RATE,
     MAXIMUM_SCORE,
+    MIN_BROADCAST_RATE,
+    PHYSICS_STEP,
+    REPLAY_KEYFRAME_INTERVAL,
     TIME_START,
     TIME_START_INTERVAL,
     GameStatus,
+    PaddleStatus,
 )
 from django.utils import timezone
 from transcendence_django.dict_keys import (
@@ -18,12 +28,14 @@ from transcendence_django.dict_keys import (
     ARENA_ID,
     BALL,
     BOTS,
+    BROADCAST_RATE,
     COLLIDED_SLOT,
     ID,
     IS_REMOTE,
     KICKED_PLAYERS,
     MAP,
     NB_PLAYERS,
+    OPTIONS,
     OVER_CALLBACK,
     PADDLES,
     PLAYER1,
@@ -44,10 +56,15 @@ logger = logging.getLogger(__name__)
 
 class Arena:
 
-    def __init__(self, players_specs: dict[str, Any]):
+    def __init__(self, players_specs: dict[str, Any], seed: int | None = None):
         self.id: str = str(id(self))
         self.player_manager: PlayerManager = PlayerManager(players_specs)
         self.game: Game = Game(players_specs)
+        self.options: dict[str, Any] = players_specs[OPTIONS]
+        self.seed: int = seed if seed is not None else random.getrandbits(32)
+        self.step_count: int = 0
+        self.replay: ReplayRecorder | None = None
+        self.replay_data: bytes | None = None
         self.start_timer_callback: Optional[
             Callable[[Any], Coroutine[Any, Any, None]]
         ] = None
@@ -58,6 +75,13 @@ class Arena:
             Callable[[Any], Coroutine[Any, Any, None]]
         ] = None
         self.start_time: datetime.datetime | None = None
+        self.broadcast_interval: float = self.__get_broadcast_interval(players_specs)
+        self.accumulator: float = 0
+        self.time_since_broadcast: float = 0
+        self.pending_update: dict[str, Any] = {}
+        self.has_event: bool = False
+        self.state_listener: Optional[Callable[["Arena"], None]] = None
+        self.state_changed: asyncio.Event = asyncio.Event()
 
     def to_dict(self) -> dict[str, Any]:
         if self.player_manager.is_remote:
@@ -110,7 +134,7 @@ class Arena:
     def get_status(self) -> GameStatus:
         return self.game.status
 
-    def enter_arena(self, user_id: int, player_name: str) -> None:
+    def enter_arena(self, user_id: int, player_name: str, is_bot: bool = False) -> None:
         self.player_manager.allow_player_enter_arena(user_id)
         if self.get_status() == GameStatus.CREATED:
             self.game.set_status(GameStatus.WAITING)
@@ -118,26 +142,51 @@ class Arena:
             return
         logger.info("Player %s entered the arena %s", user_id, self.id)
         if self.player_manager.is_remote:
-            self.__enter_remote_mode(user_id, player_name)
+            self.__enter_remote_mode(user_id, player_name, is_bot)
         else:
-            self.__enter_local_mode(user_id, player_name)
+            self.__enter_local_mode(user_id, player_name, is_bot)
+        self.notify_state_change()
 
     async def start_game(self):
-        self.game.set_status(GameStatus.READY_TO_START)
-        self.__reset()
+        self.prepare_game()
         await self.send_update({ARENA: self.to_dict()})
         for time in range(0, TIME_START):
             if self.start_timer_callback is not None:
                 await self.start_timer_callback(TIME_START - time)
             await asyncio.sleep(TIME_START_INTERVAL)
+        self.launch_game()
+        await self.send_update({ARENA: self.to_dict()})
+
+    def prepare_game(self):
+        self.set_status(GameStatus.READY_TO_START)
+        self.game.seed(self.seed)
+        self.__reset()
+
+    def launch_game(self):
         self.game.start()
+        self.replay = ReplayRecorder(
+            self.seed,
+            self.player_manager.nb_players,
+            self.options["ball_speed"],
+            self.options["paddle_size"],
+            {
+                paddle.slot: paddle.player_name
+                for paddle in self.game.paddles.values()
+                if paddle.player_name is not None
+            },
+        )
+        self.replay.record_keyframe(0, self.game, self.__get_scores_by_slot())
+        self.notify_state_change()
         logger.info("Game started. %s", self.id)
         self.start_time = timezone.now()
-        await self.send_update({ARENA: self.to_dict()})
 
     def conclude_game(self):
+        if self.replay is not None:
+            self.replay_data = self.replay.finish(self.step_count)
+            self.replay = None
         self.player_manager.conclude()
         self.game.conclude()
+        self.notify_state_change()
         logger.info("Game is over. %s", self.id)
 
     def player_leave(self, user_id: int):
@@ -147,28 +196,89 @@ class Arena:
             self.game.remove_paddle(player_name)
         else:
             self.__disable_player(user_id)
+        self.notify_state_change()
 
     def player_gave_up(self, user_id: int):
         self.player_manager.player_gave_up(user_id)
+        self.notify_state_change()
 
     def move_paddle(self, player_name: str, direction: int) -> dict[str, Any]:
         if self.game.status != GameStatus.STARTED:
             return {}
+        paddle = self.game.paddles[player_name]
+        is_moving = paddle.status == PaddleStatus.LISTENING
         paddle_dict: dict[str, Any] = self.game.move_paddle(player_name, direction)
         self.player_manager.update_activity_time(player_name)
+        if is_moving and self.replay is not None:
+            self.replay.record_move(self.step_count, paddle.slot, direction)
         return paddle_dict
 
-    def update_game(self) -> dict[str, Any]:
+    def set_paddle_input(self, player_name: str, direction: int):
+        """
+        Records the input of the player. Paddles move on the physics steps
+        and go out with the snapshots, whatever the number of inputs.
+        """
+        paddle = self.game.paddles[player_name]
+        previous_input = paddle.input
+        self.game.set_paddle_input(player_name, direction)
+        self.player_manager.update_activity_time(player_name)
+        if direction != previous_input and self.replay is not None:
+            self.replay.record_input(self.step_count, paddle.slot, direction)
+
+    def move_paddles(self):
+        self.game.move_paddles(PHYSICS_STEP)
+
+    def update_game(self, elapsed: float) -> dict[str, Any] | None:
+        """
+        Advances the physics by fixed steps for the elapsed time and returns
+        the snapshot to broadcast, or None if no broadcast is due yet.
+        Scores and AFK warnings are broadcast as soon as they happen.
+        """
+        if not self.advance_clock(elapsed):
+            return None
+        while self.needs_step():
+            self.move_paddles()
+            self.apply_step(self.game.update(PHYSICS_STEP))
+        return self.collect_update()
+
+    def advance_clock(self, elapsed: float) -> bool:
         if self.can_be_over():
-            return {}
-        update_dict: dict[str, Any] = self.game.update()
-        collided_slot: int | None = update_dict.get(COLLIDED_SLOT)
+            return False
+        self.accumulator = min(self.accumulator + elapsed, MAX_ACCUMULATED_TIME)
+        self.time_since_broadcast += elapsed
+        self.has_event = False
+        return True
+
+    def needs_step(self) -> bool:
+        return self.accumulator >= PHYSICS_STEP and not self.has_event
+
+    def apply_step(self, collided_slot: int | None):
+        self.accumulator -= PHYSICS_STEP
         if collided_slot is not None:
-            update_dict[SCORE] = self.__update_scores(collided_slot)
+            if self.replay is not None:
+                self.replay.record_score(self.step_count, collided_slot)
+            self.pending_update[COLLIDED_SLOT] = collided_slot
+            self.pending_update[SCORE] = self.__update_scores(collided_slot)
+            self.has_event = True
+            self.notify_state_change()
+        self.step_count += 1
+        if self.replay is not None and self.step_count % REPLAY_KEYFRAME_INTERVAL == 0:
+            self.replay.record_keyframe(
+                self.step_count, self.game, self.__get_scores_by_slot()
+            )
+
+    def collect_update(self) -> dict[str, Any] | None:
         kicked_players = self.player_manager.kick_afk_players()
         if kicked_players:
-            update_dict[KICKED_PLAYERS] = kicked_players
+            self.pending_update[KICKED_PLAYERS] = kicked_players
+            self.has_event = True
+            self.notify_state_change()
         self.game.reset_paddles_statuses()
+        if not self.has_event and self.time_since_broadcast < self.broadcast_interval:
+            return None
+        self.time_since_broadcast = 0
+        update_dict = {**self.pending_update, **self.game.get_snapshot()}
+        self.pending_update = {}
         return update_dict
 
     def can_be_started(self) -> bool:
@@ -188,6 +298,33 @@ class Arena:
     def set_status(self, status: GameStatus):
         self.game.set_status(status)
         logger.info("Arena %s game status: %s", self.id, status)
+        self.notify_state_change()
+
+    def notify_state_change(self):
+        """
+        Wakes up the tasks waiting on the arena and tells its listener that
+        its status, players or scores changed.
+        """
+        self.state_changed.set()
+        self.state_changed = asyncio.Event()
+        if self.state_listener is not None:
+            self.state_listener(self)
+
+    async def wait_while_status_in(self, statuses: list[GameStatus], timeout: float):
+        """
+        Returns after timeout seconds, or as soon as the status is not one of
+        statuses anymore.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self.game.status in statuses:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                await asyncio.wait_for(self.state_changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return
 
     def did_player_give_up(self, user_id: int) -> bool:
         return self.player_manager.did_player_give_up(user_id)
@@ -198,6 +335,9 @@ class Arena:
     def is_private(self) -> bool:
         return self.game.is_private
 
+    def get_replay_name(self) -> str:
+        return f"{self.id}_{self.seed:08x}.replay"
+
     async def send_update(self, update_dict: dict[str, Any]):
         assert self.game_update_callback, "Game update callback undefined"
         await self.game_update_callback(update_dict)
@@ -215,6 +355,18 @@ class Arena:
             and self.game_over_callback is not None
         )
 
+    def __get_broadcast_interval(self, players_specs: dict[str, Any]) -> float:
+        rate = players_specs[OPTIONS].get(BROADCAST_RATE, DEFAULT_BROADCAST_RATE)
+        if (
+            isinstance(rate, bool)
+            or not isinstance(rate, (int, float))
+            or not math.isfinite(rate)
+        ):
+            logger.warning("Invalid broadcast rate %r, using the default one", rate)
+            rate = DEFAULT_BROADCAST_RATE
+        rate = min(max(int(rate), MIN_BROADCAST_RATE), MAX_BROADCAST_RATE)
+        return 1 / rate
+
     def __disable_player(self, user_id: int):
         self.player_manager.disable_player(user_id)
 
@@ -241,6 +393,14 @@ class Arena:
         )
         return {PLAYER_NAME: player_name}
 
+    def __get_scores_by_slot(self) -> dict[int, int]:
+        players = self.player_manager.players
+        return {
+            paddle.slot: players[paddle.player_name].score
+            for paddle in self.game.paddles.values()
+            if paddle.player_name in players
+        }
+
     def __get_player_name_by_paddle_slot(self, paddle_slot: int) -> str | None:
         for paddle in self.game.paddles.values():
             if paddle.slot == paddle_slot:
@@ -250,10 +410,19 @@ class Arena:
     def __reset(self):
         self.player_manager.reset()
         self.game.reset()
-
-    def __enter_local_mode(self, user_id: int, player_name: str):
+        self.step_count = 0
+        self.replay = None
+        self.replay_data = None
+        self.accumulator = 0
+        self.time_since_broadcast = 0
+        self.pending_update = {}
+        self.has_event = False
+
+    def __enter_local_mode(self, user_id: int, player_name: str, is_bot: bool):
         if not self.is_full():
-            if self.player_manager.nb_robots and player_name == f"bot{user_id}":
+            if self.player_manager.nb_robots and (
+                is_bot or player_name == f"bot{user_id}"
+            ):
                 self.__register_player(user_id, player_name, True)
                 return
             if (
@@ -262,11 +431,11 @@ class Arena:
                 self.__register_player(user_id, PLAYER1, False)
             self.__register_player(user_id, PLAYER2, False)
 
-    def __enter_remote_mode(self, user_id: int, player_name: str):
+    def __enter_remote_mode(self, user_id: int, player_name: str, is_bot: bool):
         if self.player_manager.is_player_in_game(user_id):
             self.player_manager.enable_player(user_id)
         else:
-            self.__register_player(user_id, player_name, False)
+            self.__register_player(user_id, player_name, is_bot)
 
     def __register_player(self, user_id: int, player_name: str, is_bot: bool):
         self.player_manager.register_player(user_id, player_name, is_bot)
@@ -0,0 +1,111 @@
+import random
+
+from back_game.game_arena.game import Game
+from back_game.game_entities.ball import Ball
+from back_game.game_entities.paddle import Paddle
+from back_game.game_settings.game_constants import (
+    BOT_AIM_PRECISION,
+    BOT_FOLLOW_PRECISION,
+    BOTTOM_SLOT,
+    LEFT_SLOT,
+    RIGHT_SLOT,
+    TOP_SLOT,
+)
+
+
+def is_bot_id(user_id: int) -> bool:
+    # Bots played by the game server have negative ids, users never do
+    return user_id < 0
+
+
+class Bot:
+    """
+    AI player of an arena, played by the game server from the game state
+    in memory. It reacts as often as the arena broadcasts, like the bots
+    fed by the websocket did: it follows the ball while it is not losing,
+    and aims at where the ball will cross its paddle axis when it is.
+    """
+
+    def __init__(self, user_id: int, rng: random.Random | None = None):
+        self.user_id: int = user_id
+        self.player_name: str = f"bot{user_id}"
+        self.time_since_reaction: float = 0
+        self.rng: random.Random = rng if rng is not None else random.Random()
+
+    def is_reacting(self, elapsed: float, reaction_interval: float) -> bool:
+        self.time_since_reaction += elapsed
+        if self.time_since_reaction < reaction_interval:
+            return False
+        self.time_since_reaction = 0
+        return True
+
+    def get_direction(self, game: Game, is_losing: bool) -> int:
+        paddle = game.paddles.get(self.player_name)
+        if paddle is None:
+            return 0
+        if is_losing:
+            return self.__aim(game, paddle)
+        return self.__follow(game.ball, paddle)
+
+    def __follow(self, ball: Ball, paddle: Paddle) -> int:
+        is_vertical = paddle.slot in (LEFT_SLOT, RIGHT_SLOT)
+        paddle_position = paddle.get_position()
+        if is_vertical:
+            delta = ball.position.y - paddle_position.y
+        else:
+            delta = ball.position.x - paddle_position.x
+        return self.__get_direction(
+            paddle, is_vertical, delta, BOT_FOLLOW_PRECISION + self.rng.random() / 2.0
+        )
+
+    def __aim(self, game: Game, paddle: Paddle) -> int:
+        ball = game.ball
+        paddle_position = paddle.get_position()
+        is_vertical = paddle.slot in (LEFT_SLOT, RIGHT_SLOT)
+        if is_vertical:
+            speed_across, speed_along = ball.speed.x, ball.speed.y
+            ball_across, ball_along = ball.position.x, ball.position.y
+            paddle_across, paddle_along = paddle_position.x, paddle_position.y
+            map_size = game.map.height
+        else:
+            speed_across, speed_along = ball.speed.y, ball.speed.x
+            ball_across, ball_along = ball.position.y, ball.position.x
+            paddle_across, paddle_along = paddle_position.y, paddle_position.x
+            map_size = game.map.width
+        # A ball moving along the paddle axis never reaches it
+        time_to_paddle = 0.0
+        if speed_across != 0:
+            time_to_paddle = abs(paddle_across - ball_across) / abs(speed_across)
+        target = ball_along + time_to_paddle * speed_along
+        # Reflect the crossing point off the walls until it is in the map
+        while target < 0 or target > map_size:
+            if target < 0:
+                target = -target
+            else:
+                target = 2 * map_size - target
+        if self.__is_ball_coming(paddle.slot, ball):
+            delta = target - paddle_along
+        else:
+            delta = map_size / 2 - paddle_along
+        return self.__get_direction(paddle, is_vertical, delta, BOT_AIM_PRECISION)
+
+    @staticmethod
+    def __is_ball_coming(slot: int, ball: Ball) -> bool:
+        return (
+            (slot == LEFT_SLOT and ball.speed.x < 0)
+            or (slot == RIGHT_SLOT and ball.speed.x > 0)
+            or (slot == TOP_SLOT and ball.speed.y < 0)
+            or (slot == BOTTOM_SLOT and ball.speed.y > 0)
+        )
+
+    @staticmethod
+    def __get_direction(
+        paddle: Paddle, is_vertical: bool, delta: float, precision: float
+    ) -> int:
+        # Moves only if the target is out of the paddle
+        paddle_size = paddle.rectangle.height if is_vertical else paddle.rectangle.width
+        if delta < -paddle_size * precision:
+            return -1
+        if delta > paddle_size * precision:
+            return 1
+        return 0
@@ -6,11 +6,20 @@ from back_game.game_entities.ball import Ball
 from back_game.game_entities.paddle import Paddle
 from back_game.game_physics.collision import Collision
 from back_game.game_settings.game_constants import (
+    PADDLE_MOVE_RATE,
     VALID_DIRECTIONS,
+    VALID_INPUTS,
     GameStatus,
     PaddleStatus,
 )
-from transcendence_django.dict_keys import NB_PLAYERS, OPTIONS, STATUS
+from transcendence_django.dict_keys import (
+    BALL,
+    NB_PLAYERS,
+    OPTIONS,
+    PADDLES,
+    POSITION,
+    STATUS,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +41,7 @@ class Game:
         }
         self.ball: Ball = Ball(self.paddles, ball_speed)
         self.map: Map = Map()  # depends on the number of players
+        self.moved_paddles: dict[int, Paddle] = {}
 
     def add_paddle(self, player_name: str):
         for key, paddle in list(self.paddles.items()):
@@ -44,6 +54,10 @@ class Game:
     def remove_paddle(self, player_name: str):
         paddle = self.paddles[player_name]
         paddle.unset_player_name()
+        paddle.input = 0
+
+    def seed(self, seed: int):
+        self.ball.seed_serves(seed)
 
     def start(self):
         self.set_status(GameStatus.STARTED)
@@ -60,25 +74,53 @@ class Game:
         paddle = self.paddles[player_name]
         if paddle.status == PaddleStatus.LISTENING:
             paddle.status = PaddleStatus.PROCESSING
-            paddle.move(direction)
-            try:
-                Collision.update_ball_collision(self.ball, paddle)
-            except ValueError:
-                logger.error("Paddle cannot move due to collision.")
-                paddle.move(-direction)
+            self.__move_paddle(paddle, direction)
             paddle.status = PaddleStatus.MOVED
         return paddle.get_dict_update()
 
+    def set_paddle_input(self, player_name: str, direction: int):
+        """
+        Records the direction the player holds, -1, 1, or 0 once released.
+        The paddle moves by it on every physics step.
+        """
+        if direction not in VALID_INPUTS:
+            raise ValueError("Direction is invalid. It should be -1, 0 or 1.")
+        self.paddles[player_name].input = direction
+
+    def move_paddles(self, dt: float):
+        for paddle in self.paddles.values():
+            if paddle.input:
+                rate = paddle.rate
+                self.__move_paddle(paddle, paddle.input * dt * PADDLE_MOVE_RATE)
+                if paddle.rate != rate:
+                    self.moved_paddles[paddle.slot] = paddle
+
     def reset_paddles_statuses(self):
         for paddle in self.paddles.values():
             paddle.reset_status()
 
-    def update(self) -> dict[str, Any]:
-        ball_update: dict[str, Any] = Collision.resolve_collision(self.ball)
-        game_status: dict[str, Any] = {STATUS: self.status}
-        return {**ball_update, **game_status}
+    def update(self, dt: float) -> int | None:
+        return Collision.resolve_collision(self.ball, dt)
+
+    def get_snapshot(self) -> dict[str, Any]:
+        snapshot = {BALL: {POSITION: self.ball.position.to_dict()}, STATUS: self.status}
+        if self.moved_paddles:
+            snapshot[PADDLES] = [
+                paddle.get_dict_update() for paddle in self.moved_paddles.values()
+            ]
+            self.moved_paddles = {}
+        return snapshot
 
     def reset(self):
         for paddle in self.paddles.values():
             paddle.reset()
         self.ball.reset()
+        self.moved_paddles = {}
+
+    def __move_paddle(self, paddle: Paddle, direction: float):
+        paddle.move(direction)
+        try:
+            Collision.update_ball_collision(self.ball, paddle)
+        except ValueError:
+            logger.error("Paddle cannot move due to collision.")
+            paddle.move(-direction)
@@ -5,7 +5,7 @@ from back_game.game_entities.ball import Ball
 from back_game.game_entities.paddle import Paddle
 from back_game.game_geometry.position import Position
 from back_game.game_physics.collision import Collision
-from transcendence_django.dict_keys import BALL, POSITION
+from transcendence_django.dict_keys import BALL, COLLIDED_SLOT, POSITION
 
 logger = logging.getLogger(__name__)
 
@@ -21,15 +21,15 @@ class GameLogic:
 
     @staticmethod
     def detect_collision(ball: Ball, new_position: Position) -> dict[str, Any]:
-        update = Collision.handle_collision(new_position, ball)
-        ball_position_update = {BALL: {POSITION: ball.position.__dict__}}
+        collided_slot = Collision.handle_collision(new_position, ball)
+        ball_position_update = {BALL: {POSITION: ball.position.to_float_dict()}}
         return (
-            {**update, **ball_position_update}
-            if update is not None
+            {COLLIDED_SLOT: collided_slot, **ball_position_update}
+            if collided_slot is not None
             else ball_position_update
         )
 
     @staticmethod
     def update_ball_position(new_position: Position):
-        ball_position_update = {BALL: {POSITION: new_position.__dict__}}
+        ball_position_update = {BALL: {POSITION: new_position.to_float_dict()}}
         return ball_position_update
@@ -30,26 +30,29 @@ logger = logging.getLogger(__name__)
 
 
 class PlayerManager:
+    """
+    Players of an arena, indexed by name and by user id, with a count of
+    players per status. Player statuses must only be changed through the
+    manager to keep the counts right.
+    In local mode both players share the user id; it maps to the first one.
+    """
+
     def __init__(self, player_specs: dict[str, Any]):
         self.__fill_player_specs(player_specs)
         self.players: dict[str, Player] = {}
+        self.players_by_user_id: dict[int, Player] = {}
+        self.status_counts: list[int] = [0] * len(PlayerStatus)
         self.winner: Player | None = None
         self.last_kick_check: float = time.time()
 
     def is_empty(self) -> bool:
-        return self.__count_players(PlayerStatus.ENABLED) == 0
+        return self.status_counts[PlayerStatus.ENABLED] == 0
 
     def is_full(self) -> bool:
-        enable_players_count = self.__count_players(PlayerStatus.ENABLED)
-        disable_players_count = self.__count_players(PlayerStatus.DISABLED)
-        logger.info(
-            f"IS FULL? {enable_players_count} + {disable_players_count} vs"
-            + f" {self.nb_players}"
-        )
-        return enable_players_count + disable_players_count == self.nb_players
+        return self.__count_present_players() == self.nb_players
 
     def remove_player(self, player_name):
-        del self.players[player_name]
+        self.__forget_player(self.players.pop(player_name))
 
     def allow_player_enter_arena(self, user_id: int):
         if not self.is_player_in_game(user_id) and self.is_full():
@@ -65,20 +68,16 @@ class PlayerManager:
         self.__change_player_status(user_id, PlayerStatus.GIVEN_UP)
 
     def is_player_in_game(self, user_id: int) -> bool:
-        return any(player.user_id == user_id for player in self.players.values())
+        return user_id in self.players_by_user_id
 
     def has_enough_players(self) -> bool:
-        enable_players_count = self.__count_players(PlayerStatus.ENABLED)
-        disable_players_count = self.__count_players(PlayerStatus.DISABLED)
-        return enable_players_count + disable_players_count == self.nb_players
+        return self.__count_present_players() == self.nb_players
 
     def did_player_give_up(self, user_id: int) -> bool:
         try:
             if not self.is_remote:
-                return len(self.players) > 0 and all(
-                    player.status == PlayerStatus.GIVEN_UP
-                    for player in self.players.values()
-                )
+                given_up_count = self.status_counts[PlayerStatus.GIVEN_UP]
+                return len(self.players) > 0 and given_up_count == len(self.players)
             player = self.__get_player_from_user_id(user_id)
             return player.status == PlayerStatus.GIVEN_UP
         except KeyError:
@@ -129,8 +128,16 @@ class PlayerManager:
         self.__finish_active_players()
 
     def __add_player(self, user_id: int, player_name: str, is_bot: bool):
+        replaced_player = self.players.get(player_name)
         player = Player(user_id, player_name, is_bot)
         self.players[player_name] = player
+        self.status_counts[player.status] += 1
+        if replaced_player is None:
+            self.players_by_user_id.setdefault(user_id, player)
+            return
+        self.status_counts[replaced_player.status] -= 1
+        self.__index_user(replaced_player.user_id)
+        self.__index_user(user_id)
 
     def __finish_active_players(self):
         for player in self.players.values():
@@ -140,7 +147,7 @@ class PlayerManager:
     def __finish_given_up_players(self):
         for player in self.players.values():
             if player.status == PlayerStatus.GIVEN_UP:
-                player.status = PlayerStatus.OVER
+                self.__set_player_status(player, PlayerStatus.OVER)
 
     def __get_winner(self) -> Player | None:
         active_players = [
@@ -152,17 +159,37 @@ class PlayerManager:
             self.winner = max(active_players, key=lambda player: player.score)
         return self.winner
 
-    def __count_players(self, state: PlayerStatus = PlayerStatus.ENABLED) -> int:
-        return sum(player.status == state for player in self.players.values())
+    def __count_present_players(self) -> int:
+        return (
+            self.status_counts[PlayerStatus.ENABLED]
+            + self.status_counts[PlayerStatus.DISABLED]
+        )
+
+    def __forget_player(self, player: Player):
+        self.status_counts[player.status] -= 1
+        if self.players_by_user_id.get(player.user_id) is player:
+            self.__index_user(player.user_id)
+
+    def __index_user(self, user_id: int):
+        self.players_by_user_id.pop(user_id, None)
+        for player in self.players.values():
+            if player.user_id == user_id:
+                self.players_by_user_id[user_id] = player
+                return
+
+    def __set_player_status(self, player: Player, status: PlayerStatus):
+        self.status_counts[player.status] -= 1
+        self.status_counts[status] += 1
+        player.status = status
 
     def __change_player_status(self, user_id: int, status: PlayerStatus):
         if self.is_remote:
             player = self.__get_player_from_user_id(user_id)
-            player.status = status
+            self.__set_player_status(player, status)
             logger.info("Player %s status changed to %s", player.player_name, status)
         else:
             for player in self.players.values():
-                player.status = status
+                self.__set_player_status(player, status)
 
     def __finish_player(self, user_id: int):
         self.__change_player_status(user_id, PlayerStatus.OVER)
@@ -200,7 +227,7 @@ class PlayerManager:
         return kicked_players
 
     def __get_player_from_user_id(self, user_id: int) -> Player:
-        for player in self.players.values():
-            if player.user_id == user_id:
-                return player
-        raise KeyError(UNKNOWN_USER)
+        player = self.players_by_user_id.get(user_id)
+        if player is None:
+            raise KeyError(UNKNOWN_USER)
+        return player
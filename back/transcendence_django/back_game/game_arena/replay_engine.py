@@ -0,0 +1,117 @@
+import logging
+from typing import Any, Iterator
+
+from back_game.game_arena.game import Game
+from back_game.game_arena.replay_log import (
+    END_EVENT,
+    INPUT_EVENT,
+    KEYFRAME_EVENT,
+    MOVE_EVENT,
+    SCORE_EVENT,
+    ReplayLog,
+)
+from back_game.game_physics.physics_engine import ObjectPhysicsEngine
+from back_game.game_settings.game_constants import PHYSICS_STEP
+from transcendence_django.dict_keys import NB_PLAYERS, OPTIONS
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayCursor:
+    """
+    A game rebuilt from a replay log, at a physics step. It moves forward
+    by re-simulating the steps with the logged inputs.
+    """
+
+    def __init__(self, log: ReplayLog, step: int, offset: int):
+        self.log: ReplayLog = log
+        self.game: Game = Game(
+            {
+                NB_PLAYERS: log.nb_players,
+                OPTIONS: {
+                    "ball_speed": log.ball_speed,
+                    "paddle_size": log.paddle_size,
+                    "is_private": False,
+                },
+            }
+        )
+        self.game.seed(log.seed)
+        self.paddle_keys: dict[int, str] = {
+            paddle.slot: key for key, paddle in self.game.paddles.items()
+        }
+        self.physics_engine = ObjectPhysicsEngine()
+        self.events: Iterator[tuple[int, int, Any]] = log.read_events(step, offset)
+        self.next_event: tuple[int, int, Any] | None = next(self.events, None)
+        self.step: int = step
+        self.scores: dict[int, int] = {}
+        self.is_over: bool = False
+        self.__apply_inputs()
+
+    def step_to(self, step: int) -> list[int]:
+        """
+        Plays the steps up to step, or to the end of the game, and returns
+        the slots collided by the ball on the way, one per point.
+        """
+        collided_slots: list[int] = []
+        while self.step < step and not self.is_over:
+            self.game.move_paddles(PHYSICS_STEP)
+            collided_slot = self.physics_engine.step([self.game], PHYSICS_STEP)[0]
+            if collided_slot is not None:
+                self.scores[collided_slot] = self.scores.get(collided_slot, 0) + 1
+                collided_slots.append(collided_slot)
+            self.__check_score(collided_slot)
+            self.step += 1
+            self.__apply_inputs()
+        return collided_slots
+
+    def __apply_inputs(self):
+        while self.next_event is not None and self.next_event[0] == self.step:
+            _, event_type, value = self.next_event
+            if event_type == SCORE_EVENT:
+                return
+            if event_type == INPUT_EVENT:
+                slot, direction = value
+                self.game.paddles[self.paddle_keys[slot]].input = direction
+            elif event_type == MOVE_EVENT:
+                slot, direction = value
+                paddle_key = self.paddle_keys[slot]
+                # Each logged move did move the paddle
+                self.game.paddles[paddle_key].reset_status()
+                self.game.move_paddle(paddle_key, direction)
+            elif event_type == KEYFRAME_EVENT:
+                self.scores = value.restore(self.game)
+            elif event_type == END_EVENT:
+                self.is_over = True
+            self.next_event = next(self.events, None)
+
+    def __check_score(self, collided_slot: int | None):
+        logged_slot = None
+        if (
+            self.next_event is not None
+            and self.next_event[0] == self.step
+            and self.next_event[1] == SCORE_EVENT
+        ):
+            logged_slot = self.next_event[2]
+            self.next_event = next(self.events, None)
+        if logged_slot != collided_slot:
+            logger.error(
+                "Replay diverged at step %s: %s collided instead of %s",
+                self.step,
+                collided_slot,
+                logged_slot,
+            )
+
+
+class ReplayEngine:
+    """
+    Rebuilds any physics step of a replayed game: it restores the last
+    keyframe before the step and re-simulates the steps from there.
+    """
+
+    def __init__(self, log: ReplayLog):
+        self.log: ReplayLog = log
+
+    def seek(self, step: int) -> ReplayCursor:
+        cursor = ReplayCursor(self.log, *self.log.get_keyframe(step))
+        cursor.step_to(step)
+        return cursor
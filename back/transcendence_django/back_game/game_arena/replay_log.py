@@ -0,0 +1,293 @@
+import bisect
+import struct
+from typing import Any, Iterator
+
+from back_game.game_arena.game import Game
+
+REPLAY_MAGIC = b"PRPL"
+REPLAY_VERSION = 1
+
+# Log layout, integers are unsigned LEB128 varints unless stated otherwise:
+#   header    magic, version, seed, nb_players, ball speed, paddle size,
+#             player count, then per player slot, name length, utf-8 name
+#   events    step delta << 3 | event type, then by type:
+#     input     slot << 2 | direction + 1, held from that step on
+#     move      slot << 2 | direction + 1, one move_paddle of a legacy client
+#     score     collided slot, the step it happened in
+#     keyframe  float64 ball x, y, speed x, y, velocity, speed rate,
+#               player turn, serve count, then per paddle in slot order
+#               float64 rate, input + 1, score
+#     end       -
+#   index     keyframe count, then per keyframe step delta, offset delta
+#   trailer   uint32 offset of the index
+# Inputs and moves logged at step N are applied before the physics step N.
+INPUT_EVENT = 0
+MOVE_EVENT = 1
+SCORE_EVENT = 2
+KEYFRAME_EVENT = 3
+END_EVENT = 4
+EVENT_TYPE_BITS = 3
+EVENT_TYPE_MASK = (1 << EVENT_TYPE_BITS) - 1
+
+BALL_STATE = struct.Struct("<6d")
+PADDLE_RATE = struct.Struct("<d")
+INDEX_OFFSET = struct.Struct("<I")
+
+
+def write_varint(buffer: bytearray, value: int):
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+class Keyframe:
+
+    def __init__(
+        self,
+        ball: tuple[float, ...],
+        player_turn: int,
+        serve_count: int,
+        paddles: list[tuple[float, int, int]],
+    ):
+        self.ball: tuple[float, ...] = ball
+        self.player_turn: int = player_turn
+        self.serve_count: int = serve_count
+        # Rate, input and score of each paddle, in slot order
+        self.paddles: list[tuple[float, int, int]] = paddles
+
+    def restore(self, game: Game) -> dict[int, int]:
+        """
+        Puts the game back in the state of the keyframe and returns the
+        scores by slot.
+        """
+        ball = game.ball
+        x, y, speed_x, speed_y, velocity, speed_rate = self.ball
+        ball.position.set_coordinates(x, y)
+        ball.speed.x, ball.speed.y, ball.speed.absolute_velocity = (
+            speed_x,
+            speed_y,
+            velocity,
+        )
+        ball.speed_rate = speed_rate
+        ball.player_turn = self.player_turn
+        ball.serve_count = self.serve_count
+        scores: dict[int, int] = {}
+        paddles = sorted(game.paddles.values(), key=lambda paddle: paddle.slot)
+        for paddle, (rate, direction, score) in zip(paddles, self.paddles):
+            paddle.set_rate(rate)
+            paddle.input = direction
+            scores[paddle.slot] = score
+        return scores
+
+
+class ReplayRecorder:
+    """
+    Writes the replay log of a game while it is played: the inputs of the
+    players and the points, at the physics step they happened in, and a
+    keyframe of the game state now and then so that a replay can start
+    anywhere. Everything else is re-simulated from the seed of the serves.
+    """
+
+    def __init__(
+        self,
+        seed: int,
+        nb_players: int,
+        ball_speed: int,
+        paddle_size: int,
+        player_names: dict[int, str],
+    ):
+        self.buffer = bytearray(REPLAY_MAGIC)
+        for value in (REPLAY_VERSION, seed, nb_players, ball_speed, paddle_size):
+            write_varint(self.buffer, value)
+        write_varint(self.buffer, len(player_names))
+        for slot, player_name in sorted(player_names.items()):
+            name = player_name.encode()
+            write_varint(self.buffer, slot)
+            write_varint(self.buffer, len(name))
+            self.buffer += name
+        self.keyframes: list[tuple[int, int]] = []
+        self.last_step: int = 0
+        self.is_finished: bool = False
+
+    def record_input(self, step: int, slot: int, direction: int):
+        self.__write_event(step, INPUT_EVENT)
+        write_varint(self.buffer, slot << 2 | direction + 1)
+
+    def record_move(self, step: int, slot: int, direction: int):
+        self.__write_event(step, MOVE_EVENT)
+        write_varint(self.buffer, slot << 2 | direction + 1)
+
+    def record_score(self, step: int, slot: int):
+        self.__write_event(step, SCORE_EVENT)
+        write_varint(self.buffer, slot)
+
+    def record_keyframe(self, step: int, game: Game, scores: dict[int, int]):
+        self.keyframes.append((step, len(self.buffer)))
+        self.__write_event(step, KEYFRAME_EVENT)
+        ball = game.ball
+        self.buffer += BALL_STATE.pack(
+            ball.position.x,
+            ball.position.y,
+            ball.speed.x,
+            ball.speed.y,
+            ball.speed.absolute_velocity,
+            ball.speed_rate,
+        )
+        write_varint(self.buffer, ball.player_turn)
+        write_varint(self.buffer, ball.serve_count)
+        for paddle in sorted(game.paddles.values(), key=lambda paddle: paddle.slot):
+            self.buffer += PADDLE_RATE.pack(paddle.rate)
+            write_varint(self.buffer, paddle.input + 1)
+            write_varint(self.buffer, scores.get(paddle.slot, 0))
+
+    def finish(self, step: int) -> bytes:
+        self.__write_event(step, END_EVENT)
+        index_offset = len(self.buffer)
+        write_varint(self.buffer, len(self.keyframes))
+        last_step = last_offset = 0
+        for keyframe_step, offset in self.keyframes:
+            write_varint(self.buffer, keyframe_step - last_step)
+            write_varint(self.buffer, offset - last_offset)
+            last_step, last_offset = keyframe_step, offset
+        self.buffer += INDEX_OFFSET.pack(index_offset)
+        self.is_finished = True
+        return bytes(self.buffer)
+
+    def get_log(self) -> "ReplayLog":
+        """
+        Returns the log recorded so far, to replay a game still played.
+        """
+        return ReplayLog(bytes(self.buffer), list(self.keyframes))
+
+    def __write_event(self, step: int, event_type: int):
+        write_varint(
+            self.buffer, (step - self.last_step) << EVENT_TYPE_BITS | event_type
+        )
+        self.last_step = step
+
+
+class ReplayLog:
+    """
+    Reads a replay log. A finished log carries the index of its
+    keyframes; the log of a game still played comes with them.
+    """
+
+    def __init__(self, data: bytes, keyframes: list[tuple[int, int]] | None = None):
+        if data[: len(REPLAY_MAGIC)] != REPLAY_MAGIC:
+            raise ValueError("Not a replay log")
+        self.data: bytes = data
+        offset = len(REPLAY_MAGIC)
+        header: list[int] = []
+        for _ in range(6):
+            value, offset = read_varint(data, offset)
+            header.append(value)
+        version, seed, nb_players, ball_speed, paddle_size, player_count = header
+        if version != REPLAY_VERSION:
+            raise ValueError(f"Unknown replay version {version}")
+        self.seed: int = seed
+        self.nb_players: int = nb_players
+        self.ball_speed: int = ball_speed
+        self.paddle_size: int = paddle_size
+        self.player_names: dict[int, str] = {}
+        for _ in range(player_count):
+            slot, offset = read_varint(data, offset)
+            length, offset = read_varint(data, offset)
+            self.player_names[slot] = data[offset : offset + length].decode()
+            offset += length
+        self.events_offset: int = offset
+        if keyframes is None:
+            self.events_end, self.keyframes = self.__read_index()
+        else:
+            self.events_end, self.keyframes = len(data), keyframes
+        if not self.keyframes:
+            raise ValueError("Replay log without keyframe")
+        self.keyframe_steps: list[int] = [step for step, _ in self.keyframes]
+
+    def is_finished(self) -> bool:
+        return self.events_end != len(self.data)
+
+    def get_end_step(self) -> int | None:
+        """
+        Returns the step the game ended at, or None if it is still played.
+        Only the events after the last keyframe are read.
+        """
+        if not self.is_finished():
+            return None
+        step, offset = self.keyframes[-1]
+        for step, _, _ in self.read_events(step, offset):
+            pass
+        return step
+
+    def get_keyframe(self, step: int) -> tuple[int, int]:
+        """
+        Returns the step and the offset of the last keyframe at or before step.
+        """
+        index = bisect.bisect_right(self.keyframe_steps, step) - 1
+        return self.keyframes[max(index, 0)]
+
+    def read_events(self, step: int, offset: int) -> Iterator[tuple[int, int, Any]]:
+        """
+        Yields the step, type and value of the events from offset, the
+        offset of an event logged at step, such as a keyframe.
+        """
+        data = self.data
+        is_first = True
+        while offset < self.events_end:
+            header, offset = read_varint(data, offset)
+            if not is_first:
+                step += header >> EVENT_TYPE_BITS
+            is_first = False
+            event_type = header & EVENT_TYPE_MASK
+            value: Any = None
+            if event_type in (INPUT_EVENT, MOVE_EVENT):
+                value, offset = read_varint(data, offset)
+                value = (value >> 2, (value & 0x03) - 1)
+            elif event_type == SCORE_EVENT:
+                value, offset = read_varint(data, offset)
+            elif event_type == KEYFRAME_EVENT:
+                value, offset = self.__read_keyframe(offset)
+            yield step, event_type, value
+            if event_type == END_EVENT:
+                return
+
+    def __read_keyframe(self, offset: int) -> tuple[Keyframe, int]:
+        data = self.data
+        ball = BALL_STATE.unpack_from(data, offset)
+        offset += BALL_STATE.size
+        player_turn, offset = read_varint(data, offset)
+        serve_count, offset = read_varint(data, offset)
+        paddles: list[tuple[float, int, int]] = []
+        for _ in range(self.nb_players):
+            (rate,) = PADDLE_RATE.unpack_from(data, offset)
+            offset += PADDLE_RATE.size
+            direction, offset = read_varint(data, offset)
+            score, offset = read_varint(data, offset)
+            paddles.append((rate, direction - 1, score))
+        return Keyframe(ball, player_turn, serve_count, paddles), offset
+
+    def __read_index(self) -> tuple[int, list[tuple[int, int]]]:
+        (index_offset,) = INDEX_OFFSET.unpack_from(
+            self.data, len(self.data) - INDEX_OFFSET.size
+        )
+        count, offset = read_varint(self.data, index_offset)
+        keyframes: list[tuple[int, int]] = []
+        step = keyframe_offset = 0
+        for _ in range(count):
+            step_delta, offset = read_varint(self.data, offset)
+            offset_delta, offset = read_varint(self.data, offset)
+            step += step_delta
+            keyframe_offset += offset_delta
+            keyframes.append((step, keyframe_offset))
+        return index_offset, keyframes
@@ -1,4 +1,5 @@
 import logging
+import random
 from typing import Any
 
 from back_game.game_entities.ball_speed_randomizer import BallSpeedRandomizer
@@ -10,6 +11,7 @@ from back_game.game_settings.game_constants import (
     GAME_HEIGHT,
     GAME_WIDTH,
     SPEED_INCREASE_RATE,
+    SPEED_REFERENCE_RATE,
 )
 from transcendence_django.dict_keys import (
     BALL_X_OUT_OF_BOUNDS,
@@ -38,14 +40,21 @@ class Ball:
         self.paddles: dict[str, Paddle] = paddles
         self.player_turn = 0
         self.speed = Speed(0, 0)
+        # Scratch objects reused by the physics step instead of allocating
+        self.next_position: Position = Position()
+        self.push_position: Position = Position()
+        self.collision_point: Position = Position()
+        self.next_speed: Speed = Speed(0, 0)
         self.initial_speed_rate = speed_rate[speed_index]
         self.speed_rate = self.initial_speed_rate
+        self.serve_seed: int | None = None
+        self.serve_count: int = 0
         self.__set_random_speed()
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            POSITION: self.position.__dict__,
-            SPEED: self.speed.__dict__,
+            POSITION: self.position.to_float_dict(),
+            SPEED: self.speed.to_float_dict(),
             RADIUS: self.radius,
         }
 
@@ -58,19 +67,35 @@ class Ball:
             raise ValueError(BALL_Y_OUT_OF_BOUNDS)
         self.position.set_coordinates(x, y)
 
-    def get_next_position(self) -> Position:
-        return Position(self.position.x + self.speed.x, self.position.y + self.speed.y)
+    def get_next_position(self, dt: float) -> Position:
+        scale = dt * SPEED_REFERENCE_RATE
+        self.next_position.set_coordinates(
+            self.position.x + self.speed.x * scale,
+            self.position.y + self.speed.y * scale,
+        )
+        return self.next_position
 
     def set_speed(self, speed: Speed):
         self.speed_rate *= SPEED_INCREASE_RATE
         speed.multiply_by_scalar(self.speed_rate)
         self.speed.update(speed)
 
+    def seed_serves(self, seed: int):
+        # Each serve draws from its own generator, so that a replay can
+        # resume from any point knowing only how many serves came before
+        self.serve_seed = seed
+        self.serve_count = 0
+
     def reset(self):
-        self.position = Position(GAME_WIDTH / 2, GAME_HEIGHT / 2)
+        self.position.set_coordinates(GAME_WIDTH / 2, GAME_HEIGHT / 2)
         self.speed_rate = self.initial_speed_rate
         self.__set_random_speed()
 
     def __set_random_speed(self):
-        self.set_speed(BallSpeedRandomizer.generate_random_speed(self.player_turn))
+        rng = None
+        if self.serve_seed is not None:
+            rng = random.Random(f"{self.serve_seed}:{self.serve_count}")
+            self.serve_count += 1
+        BallSpeedRandomizer.set_random_speed(self.next_speed, self.player_turn, rng)
+        self.set_speed(self.next_speed)
         self.player_turn = (self.player_turn + 1) % 2
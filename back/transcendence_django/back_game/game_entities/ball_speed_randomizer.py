@@ -7,26 +7,36 @@ from back_game.game_settings.game_constants import INITIAL_SPEED_X, INITIAL_SPEE
 logger = logging.getLogger(__name__)
 
 random_ball_speeds = [
-    {
+    [
         Speed(-INITIAL_SPEED_X, 0),
         Speed(-INITIAL_SPEED_X, -INITIAL_SPEED_Y / 2),
         Speed(-INITIAL_SPEED_X, INITIAL_SPEED_Y / 2),
         Speed(-INITIAL_SPEED_X, INITIAL_SPEED_Y / 3),
         Speed(-INITIAL_SPEED_X, -INITIAL_SPEED_Y / 3),
-    },
-    {
+    ],
+    [
         Speed(INITIAL_SPEED_X, 0),
         Speed(INITIAL_SPEED_X, -INITIAL_SPEED_Y / 2),
         Speed(INITIAL_SPEED_X, INITIAL_SPEED_Y / 2),
         Speed(INITIAL_SPEED_X, -INITIAL_SPEED_Y / 3),
-    },
+    ],
 ]
 
 
 class BallSpeedRandomizer:
 
+    rng: random.Random = random.Random()
+
+    @staticmethod
+    def seed(seed: int):
+        # Makes the serves of the process reproducible, for simulations
+        BallSpeedRandomizer.rng.seed(seed)
+
     @staticmethod
-    def generate_random_speed(player_turn: int) -> Speed:
-        chosen_set = random_ball_speeds[player_turn]
-        random_speed = random.choice(list(chosen_set))
-        return random_speed
+    def set_random_speed(
+        speed: Speed, player_turn: int, rng: random.Random | None = None
+    ):
+        if rng is None:
+            rng = BallSpeedRandomizer.rng
+        random_speed = rng.choice(random_ball_speeds[player_turn])
+        speed.set_components(random_speed.x, random_speed.y)
@@ -41,6 +41,7 @@ class Paddle:
         self.slot: int = slot
         self.player_name: str | None = None
         self.status: PaddleStatus = PaddleStatus.LISTENING
+        self.input: int = 0
         self.speed_rate: float = PADDLE_INITIAL_SPEED_RATE
         self.rectangle: Rectangle = Rectangle(
             slot,
@@ -51,11 +52,15 @@ class Paddle:
         self.rate: float = 0.5
         self.axis: dict[str, Position] = self.__calculate_axis(num_players)
         self.__update_position()
-        log.info("Paddle created at %s", self.rectangle.position.__dict__)
+        log.info("Paddle created at %s", self.rectangle.position.to_dict())
 
     def __update_position(self):
-        new_position = self.__convert_rate_to_position(self.rate)
-        self.rectangle.update_position(new_position)
+        start = self.axis[START]
+        end = self.axis[END]
+        self.rectangle.update_position(
+            round(start.x + (end.x - start.x) * self.rate),
+            round(start.y + (end.y - start.y) * self.rate),
+        )
 
     def __calculate_axis(self, num_players: int) -> dict[str, Position]:
         if num_players == 2:
@@ -87,17 +92,11 @@ class Paddle:
             "Slot: %s, Angle: %s, Start: %s, End: %s",
             self.slot,
             angle,
-            start.__dict__,
-            end.__dict__,
+            start.to_dict(),
+            end.to_dict(),
         )
         return {START: start.round(), END: end.round()}
 
-    def __convert_rate_to_position(self, rate: float) -> Position:
-        return Position(
-            self.axis[START].x + (self.axis[END].x - self.axis[START].x) * rate,
-            self.axis[START].y + (self.axis[END].y - self.axis[START].y) * rate,
-        ).round()
-
     def set_player_name(self, player_name: str):
         self.player_name = player_name
 
@@ -108,7 +107,7 @@ class Paddle:
         return {
             SLOT: self.slot,
             PLAYER_NAME: self.player_name,
-            POSITION: self.rectangle.position.__dict__,
+            POSITION: self.rectangle.position.to_dict(),
             SPEED: self.speed_rate,
             WIDTH: self.rectangle.width,
             HEIGHT: self.rectangle.height,
@@ -117,7 +116,7 @@ class Paddle:
     def get_dict_update(self) -> dict[str, Any]:
         return {
             SLOT: self.slot,
-            POSITION: self.rectangle.position.__dict__,
+            POSITION: self.rectangle.position.to_dict(),
         }
 
     def get_edges(self) -> Edges:
@@ -138,6 +137,9 @@ class Paddle:
         self.rectangle.width = config[WIDTH]
         self.rectangle.height = config[HEIGHT]
 
-    def move(self, direction: int):
-        self.rate = min(max(self.rate + self.speed_rate * direction, 0), 1)
+    def move(self, direction: float):
+        self.set_rate(self.rate + self.speed_rate * direction)
+
+    def set_rate(self, rate: float):
+        self.rate = min(max(rate, 0), 1)
         self.__update_position()
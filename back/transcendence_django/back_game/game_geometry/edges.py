@@ -2,6 +2,8 @@ from back_game.game_geometry.position import Position
 
 
 class Edges:
+    __slots__ = ("bottom", "top", "left", "right")
+
     def __init__(self, position: Position, width: int, height: int):
         self.bottom: float = 0
         self.top: float = 0
@@ -1,4 +1,6 @@
 class Position:
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float = 0, y: float = 0):
         self.x: float = x
         self.y: float = y
@@ -6,6 +8,9 @@ class Position:
     def to_dict(self) -> dict[str, int]:
         return {"x": int(self.x), "y": int(self.y)}
 
+    def to_float_dict(self) -> dict[str, float]:
+        return {"x": self.x, "y": self.y}
+
     def set_coordinates(self, x: float, y: float):
         self.x = x
         self.y = y
@@ -13,6 +13,17 @@ from transcendence_django.dict_keys import HEIGHT, POSITION, WIDTH
 
 
 class Rectangle:
+    __slots__ = (
+        "slot",
+        "position",
+        "width",
+        "height",
+        "edges",
+        "convexity_center",
+        "distance_from_center",
+        "version",
+    )
+
     def __init__(self, slot: int, position: Position, width: int, height: int):
         self.slot: int = slot
         self.position: Position = position
@@ -22,22 +33,29 @@ class Rectangle:
             self.width = height
             self.height = width
         self.edges: Edges = Edges(position, width, height)
-        self.convexity_center: Position = self.__get_convexity_center()
+        self.convexity_center: Position = Position()
         self.distance_from_center: float = 0
+        self.version: int = 0
+        self.__update_convexity_center()
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            POSITION: self.position.__dict__,
+            POSITION: self.position.to_dict(),
             WIDTH: self.width,
             HEIGHT: self.height,
         }
 
-    def update_position(self, position: Position):
-        self.position = position
-        self.edges.update(position, self.width, self.height)
-        self.convexity_center = self.__get_convexity_center()
+    def update_position(self, x: float, y: float):
+        """
+        Moves the rectangle in place; version is bumped on every move so
+        that cached copies of the geometry can tell they are stale.
+        """
+        self.position.set_coordinates(x, y)
+        self.edges.update(self.position, self.width, self.height)
+        self.__update_convexity_center()
+        self.version += 1
 
-    def __get_convexity_center(self) -> Position:
+    def __update_convexity_center(self):
         self.distance_from_center = self.height * TANGENT_FACTOR
         center_x, center_y = self.position.x, self.position.y
         if self.slot == LEFT_SLOT:
@@ -50,4 +68,4 @@ class Rectangle:
             center_y = self.edges.bottom + self.distance_from_center
         else:
             raise ValueError("Oopsie! Too many paddles?")
-        return Position(center_x, center_y)
+        self.convexity_center.set_coordinates(center_x, center_y)
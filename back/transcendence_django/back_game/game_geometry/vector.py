@@ -4,10 +4,16 @@ from back_game.game_geometry.position import Position
 
 
 class Vector(Position):
+    __slots__ = ()
 
     def magnitude(self) -> float:
-        return math.sqrt(self.x**2 + self.y**2)
+        return math.sqrt(self.x * self.x + self.y * self.y)
 
     def unit_vector(self) -> "Vector":
         magnitude_value = self.magnitude()
         return Vector(self.x / magnitude_value, self.y / magnitude_value)
+
+    def normalize(self):
+        magnitude_value = self.magnitude()
+        self.x = self.x / magnitude_value
+        self.y = self.y / magnitude_value
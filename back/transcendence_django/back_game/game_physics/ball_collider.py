@@ -27,14 +27,15 @@ class BallCollider:
         if collide_y:
             ball.speed.reverse_y_direction()
         else:
-            ball.position = new_position
+            ball.position.set_coordinates(new_position.x, new_position.y)
         return None
 
     @staticmethod
     def push_ball(ball: Ball, paddle: Paddle):
         paddle_edges = paddle.get_edges()
         side = BallCollider.__get_collision_side(ball.position, paddle)
-        push_position = Position(ball.position.x, ball.position.y)
+        push_position = ball.push_position
+        push_position.set_coordinates(ball.position.x, ball.position.y)
         match side:
             case "top":
                 push_position.y = paddle_edges.top - ball.radius
@@ -45,7 +46,7 @@ class BallCollider:
             case "right":
                 push_position.x = paddle_edges.right + ball.radius
         ball.set_position(push_position)
-        logger.info("Ball collided with paddle %s on the %s side.", paddle.slot, side)
+        logger.debug("Ball collided with paddle %s on the %s side.", paddle.slot, side)
 
     @staticmethod
     def __get_side(
@@ -0,0 +1,332 @@
+import logging
+
+import numpy as np
+from back_game.game_arena.game import Game
+from back_game.game_entities.paddle import Paddle
+from back_game.game_physics.physics_engine import NUMPY_ENGINE, PhysicsStepError
+from back_game.game_settings.game_constants import (
+    BOTTOM_SLOT,
+    GAME_HEIGHT,
+    GAME_WIDTH,
+    INITIAL_BALL_SPEED_COEFF,
+    LEFT_SLOT,
+    RIGHT_SLOT,
+    SPEED_INCREASE_RATE,
+    SPEED_REFERENCE_RATE,
+    TOP_SLOT,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 64
+DEFAULT_MAX_PADDLES = 4
+
+# Ball columns
+BALL_X, BALL_Y, BALL_RADIUS, SPEED_X, SPEED_Y, SPEED_RATE = range(6)
+BALL_COLUMNS = 6
+
+# Paddle columns
+(
+    PADDLE_LEFT,
+    PADDLE_RIGHT,
+    PADDLE_TOP,
+    PADDLE_BOTTOM,
+    PADDLE_X,
+    PADDLE_Y,
+    CENTER_X,
+    CENTER_Y,
+    DISTANCE_FROM_CENTER,
+    PADDLE_SLOT,
+) = range(10)
+PADDLE_COLUMNS = 10
+
+
+class NumpyPhysicsEngine:
+    """
+    Steps every game in one vectorized call. Ball state is kept in a
+    (games, 6) buffer and paddle state in a (games, paddles, 10) buffer.
+    The entity objects remain the source of truth: balls are refreshed
+    before each step and written back after it, paddle rows only when
+    the paddle moved. Produces the same results as the Collision path,
+    operation for operation.
+    """
+
+    name = NUMPY_ENGINE
+
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        max_paddles: int = DEFAULT_MAX_PADDLES,
+    ):
+        self.capacity: int = 0
+        self.max_paddles: int = 0
+        self.balls: np.ndarray = np.zeros((0, BALL_COLUMNS))
+        self.paddles: np.ndarray = np.zeros((0, 0, PADDLE_COLUMNS))
+        self.paddle_mask: np.ndarray = np.zeros((0, 0), dtype=bool)
+        self.paddle_keys: list[tuple | None] = []
+        self.__allocate(capacity, max_paddles)
+
+    def step(self, games: list[Game], dt: float) -> list[int | None]:
+        nb_games = len(games)
+        if nb_games == 0:
+            return []
+        self.__gather(games)
+        balls = self.balls[:nb_games]
+        paddles = self.paddles[:nb_games]
+        hits = self.__get_paddle_hits(balls, paddles, self.paddle_mask[:nb_games])
+        has_hit = hits.any(axis=1)
+        hit_rows = np.flatnonzero(has_hit)
+        free_rows = np.flatnonzero(~has_hit)
+        bounces: list[tuple[int, float, float, float, float, float, float]] = []
+        if hit_rows.size:
+            hit_paddles = paddles[hit_rows, hits[hit_rows].argmax(axis=1)]
+            bounces = self.__get_paddle_bounces(balls, hit_rows, hit_paddles)
+        goals: list[tuple[int, bool]] = []
+        wall_bounces: list[tuple[int, float]] = []
+        moves: list[tuple[int, float, float]] = []
+        if free_rows.size:
+            goals, wall_bounces, moves = self.__get_ball_moves(balls, free_rows, dt)
+        # Written back only once every game is computed, game by game
+        collided_slots: list[int | None] = [None] * nb_games
+        failures: dict[int, Exception] = {}
+        for row, x, y, speed_x, speed_y, absolute_velocity, speed_rate in bounces:
+            try:
+                ball = games[row].ball
+                ball.position.set_coordinates(x, y)
+                ball.speed.x, ball.speed.y = speed_x, speed_y
+                ball.speed.absolute_velocity = absolute_velocity
+                ball.speed_rate = speed_rate
+            except Exception as e:  # pylint: disable=broad-except
+                failures[row] = e
+        for row, is_left in goals:
+            try:
+                games[row].ball.reset()
+                collided_slots[row] = int(is_left) + 1
+            except Exception as e:  # pylint: disable=broad-except
+                failures[row] = e
+        for row, speed_y in wall_bounces:
+            try:
+                games[row].ball.speed.y = speed_y
+            except Exception as e:  # pylint: disable=broad-except
+                failures[row] = e
+        for row, x, y in moves:
+            try:
+                games[row].ball.position.set_coordinates(x, y)
+            except Exception as e:  # pylint: disable=broad-except
+                failures[row] = e
+        if failures:
+            raise PhysicsStepError(collided_slots, failures)
+        return collided_slots
+
+    def __allocate(self, capacity: int, max_paddles: int):
+        capacity = max(capacity, self.capacity)
+        max_paddles = max(max_paddles, self.max_paddles)
+        if capacity == self.capacity and max_paddles == self.max_paddles:
+            return
+        logger.info(
+            "Allocating physics buffers for %s games and %s paddles",
+            capacity,
+            max_paddles,
+        )
+        self.capacity = capacity
+        self.max_paddles = max_paddles
+        self.balls = np.zeros((capacity, BALL_COLUMNS))
+        self.paddles = np.zeros((capacity, max_paddles, PADDLE_COLUMNS))
+        self.paddle_mask = np.zeros((capacity, max_paddles), dtype=bool)
+        self.paddle_keys = [None] * capacity
+
+    def __gather(self, games: list[Game]):
+        nb_games = len(games)
+        max_paddles = max(len(game.ball.paddles) for game in games)
+        if nb_games > self.capacity or max_paddles > self.max_paddles:
+            capacity = max(self.capacity, 1)
+            while capacity < nb_games:
+                capacity *= 2
+            self.__allocate(capacity, max_paddles)
+        ball_values: list[float] = []
+        for row, game in enumerate(games):
+            ball = game.ball
+            position = ball.position
+            speed = ball.speed
+            ball_values += (
+                position.x,
+                position.y,
+                ball.radius,
+                speed.x,
+                speed.y,
+                ball.speed_rate,
+            )
+            paddles = list(ball.paddles.values())
+            paddle_key = (
+                game,
+                *((paddle, paddle.rectangle.version) for paddle in paddles),
+            )
+            if self.paddle_keys[row] != paddle_key:
+                self.paddle_keys[row] = paddle_key
+                self.__write_paddles(row, paddles)
+        self.balls[:nb_games] = np.reshape(ball_values, (nb_games, BALL_COLUMNS))
+        self.paddle_keys[nb_games:] = [None] * (self.capacity - nb_games)
+
+    def __write_paddles(self, row: int, paddles: list[Paddle]):
+        """
+        Rectangle.update_position refreshes the position, edges and convexity
+        center together and bumps the version, so the row only needs to be
+        rewritten when one of the versions changed.
+        """
+        self.paddles[row] = 0
+        self.paddle_mask[row] = False
+        self.paddle_mask[row, : len(paddles)] = True
+        self.paddles[row, : len(paddles)] = [
+            (
+                paddle.rectangle.edges.left,
+                paddle.rectangle.edges.right,
+                paddle.rectangle.edges.top,
+                paddle.rectangle.edges.bottom,
+                paddle.rectangle.position.x,
+                paddle.rectangle.position.y,
+                paddle.rectangle.convexity_center.x,
+                paddle.rectangle.convexity_center.y,
+                paddle.rectangle.distance_from_center,
+                paddle.slot,
+            )
+            for paddle in paddles
+        ]
+
+    @staticmethod
+    def __get_closest_points(
+        x: np.ndarray, y: np.ndarray, paddles: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        closest_x = np.maximum(
+            np.minimum(x, paddles[..., PADDLE_RIGHT]), paddles[..., PADDLE_LEFT]
+        )
+        closest_y = np.maximum(
+            np.minimum(y, paddles[..., PADDLE_BOTTOM]), paddles[..., PADDLE_TOP]
+        )
+        return closest_x, closest_y
+
+    @staticmethod
+    def __get_paddle_hits(
+        balls: np.ndarray, paddles: np.ndarray, mask: np.ndarray
+    ) -> np.ndarray:
+        x = balls[:, BALL_X, None]
+        y = balls[:, BALL_Y, None]
+        closest_x, closest_y = NumpyPhysicsEngine.__get_closest_points(x, y, paddles)
+        distance_x = x - closest_x
+        distance_y = y - closest_y
+        distance = np.sqrt(distance_x * distance_x + distance_y * distance_y)
+        return (distance < balls[:, BALL_RADIUS, None]) & mask
+
+    @staticmethod
+    def __get_paddle_bounces(
+        balls: np.ndarray,
+        rows: np.ndarray,
+        paddles: np.ndarray,
+    ) -> list[tuple[int, float, float, float, float, float, float]]:
+        x = balls[rows, BALL_X]
+        y = balls[rows, BALL_Y]
+        radius = balls[rows, BALL_RADIUS]
+        closest_x, closest_y = NumpyPhysicsEngine.__get_closest_points(x, y, paddles)
+        distance_x = x - closest_x
+        distance_y = y - closest_y
+        is_horizontal = np.abs(distance_x) > np.abs(distance_y)
+        is_right = distance_x > paddles[:, PADDLE_X] - x
+        is_bottom = distance_y > paddles[:, PADDLE_Y] - y
+        push_x = np.where(
+            is_horizontal,
+            np.where(
+                is_right,
+                paddles[:, PADDLE_RIGHT] + radius,
+                paddles[:, PADDLE_LEFT] - radius,
+            ),
+            x,
+        )
+        push_y = np.where(
+            is_horizontal,
+            y,
+            np.where(
+                is_bottom,
+                paddles[:, PADDLE_BOTTOM] + radius,
+                paddles[:, PADDLE_TOP] - radius,
+            ),
+        )
+        is_in_bounds = (
+            (push_x >= radius)
+            & (push_x <= GAME_WIDTH - radius)
+            & (push_y >= radius)
+            & (push_y <= GAME_HEIGHT - radius)
+        )
+        if not is_in_bounds.all():
+            logger.error("Ball could not be pushed out of a paddle.")
+        collision_x, collision_y = NumpyPhysicsEngine.__get_closest_points(
+            push_x, push_y, paddles
+        )
+        slot = paddles[:, PADDLE_SLOT]
+        distance_from_center = paddles[:, DISTANCE_FROM_CENTER]
+        direction_x = np.where(
+            slot == LEFT_SLOT,
+            distance_from_center,
+            np.where(
+                slot == RIGHT_SLOT,
+                -distance_from_center,
+                collision_x - paddles[:, CENTER_X],
+            ),
+        )
+        direction_y = np.where(
+            slot == BOTTOM_SLOT,
+            distance_from_center,
+            np.where(
+                slot == TOP_SLOT,
+                -distance_from_center,
+                collision_y - paddles[:, CENTER_Y],
+            ),
+        )
+        magnitude = np.sqrt(direction_x * direction_x + direction_y * direction_y)
+        speed_x = INITIAL_BALL_SPEED_COEFF * (direction_x / magnitude)
+        speed_y = INITIAL_BALL_SPEED_COEFF * (direction_y / magnitude)
+        speed_rate = balls[rows, SPEED_RATE] * SPEED_INCREASE_RATE
+        norm = np.sqrt(speed_x * speed_x + speed_y * speed_y)
+        speed_x = (speed_x / norm) * speed_rate
+        speed_y = (speed_y / norm) * speed_rate
+        absolute_velocity = np.sqrt(speed_x * speed_x + speed_y * speed_y)
+        return list(
+            zip(
+                rows[is_in_bounds].tolist(),
+                push_x[is_in_bounds].tolist(),
+                push_y[is_in_bounds].tolist(),
+                speed_x[is_in_bounds].tolist(),
+                speed_y[is_in_bounds].tolist(),
+                absolute_velocity[is_in_bounds].tolist(),
+                speed_rate[is_in_bounds].tolist(),
+            )
+        )
+
+    @staticmethod
+    def __get_ball_moves(
+        balls: np.ndarray, rows: np.ndarray, dt: float
+    ) -> tuple[
+        list[tuple[int, bool]], list[tuple[int, float]], list[tuple[int, float, float]]
+    ]:
+        """
+        Returns the goals with their side, the wall bounces with their
+        new vertical speed and the moves with their new position.
+        """
+        scale = dt * SPEED_REFERENCE_RATE
+        radius = balls[rows, BALL_RADIUS]
+        speed_y = balls[rows, SPEED_Y]
+        new_x = balls[rows, BALL_X] + balls[rows, SPEED_X] * scale
+        new_y = balls[rows, BALL_Y] + speed_y * scale
+        is_left_goal = new_x <= radius
+        is_goal = is_left_goal | (new_x >= GAME_WIDTH - radius)
+        is_bounce = ~is_goal & ((new_y <= radius) | (new_y >= GAME_HEIGHT - radius))
+        is_move = ~is_goal & ~is_bounce
+        return (
+            list(zip(rows[is_goal].tolist(), is_left_goal[is_goal].tolist())),
+            list(zip(rows[is_bounce].tolist(), (-speed_y[is_bounce]).tolist())),
+            list(
+                zip(
+                    rows[is_move].tolist(),
+                    new_x[is_move].tolist(),
+                    new_y[is_move].tolist(),
+                )
+            ),
+        )
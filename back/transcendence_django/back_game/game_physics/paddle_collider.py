@@ -27,22 +27,30 @@ class PaddleCollider:
         closest_y: float = max(
             min(ball.position.y, paddle_edges.bottom), paddle_edges.top
         )
-        return Position(closest_x, closest_y)
+        ball.collision_point.set_coordinates(closest_x, closest_y)
+        return ball.collision_point
 
     @staticmethod
     def get_ball_speed_after_paddle_collision(
-        paddle: Paddle, collision_point: Position
+        paddle: Paddle, collision_point: Position, speed: Speed
     ) -> Speed:
-        speed_component = PaddleCollider.__get_ball_speed_direction(
-            paddle, collision_point
+        """
+        Writes the speed of the ball bouncing off the paddle into speed.
+        """
+        speed_component_x, speed_component_y = (
+            PaddleCollider.__get_ball_speed_direction(paddle, collision_point)
         )
-        u_speed = speed_component.unit_vector()
-        return Speed(
-            INITIAL_BALL_SPEED_COEFF * u_speed.x, INITIAL_BALL_SPEED_COEFF * u_speed.y
+        speed.set_components(speed_component_x, speed_component_y)
+        speed.normalize()
+        speed.set_components(
+            INITIAL_BALL_SPEED_COEFF * speed.x, INITIAL_BALL_SPEED_COEFF * speed.y
         )
+        return speed
 
     @staticmethod
-    def __get_ball_speed_direction(paddle: Paddle, collision_point: Position) -> Speed:
+    def __get_ball_speed_direction(
+        paddle: Paddle, collision_point: Position
+    ) -> tuple[float, float]:
         if paddle.slot == LEFT_SLOT:
             speed_component_x = paddle.rectangle.distance_from_center
         elif paddle.slot == RIGHT_SLOT:
@@ -57,4 +65,4 @@ class PaddleCollider:
             speed_component_y = collision_point.y - paddle.rectangle.convexity_center.y
         else:
             speed_component_x = collision_point.x - paddle.rectangle.convexity_center.x
-        return Speed(speed_component_x, speed_component_y)
+        return speed_component_x, speed_component_y
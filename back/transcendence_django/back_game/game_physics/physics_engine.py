@@ -0,0 +1,79 @@
+import logging
+
+from back_game.game_arena.game import Game
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+OBJECT_ENGINE = "object"
+NUMPY_ENGINE = "numpy"
+
+
+class PhysicsStepError(Exception):
+    """
+    Raised by a physics engine once it stepped every game but the failing
+    ones, with the collided slots of all games and the errors by row.
+    A game that fails is not stepped twice, nor are the others: any other
+    error raised by an engine means that no game was stepped.
+    """
+
+    def __init__(
+        self, collided_slots: list[int | None], failures: dict[int, Exception]
+    ):
+        super().__init__(f"{len(failures)} games failed to step")
+        self.collided_slots: list[int | None] = collided_slots
+        self.failures: dict[int, Exception] = failures
+
+
+class ObjectPhysicsEngine:
+    """
+    Steps each game through the per-object Collision path.
+    """
+
+    name = OBJECT_ENGINE
+
+    def step(self, games: list[Game], dt: float) -> list[int | None]:
+        collided_slots: list[int | None] = []
+        failures: dict[int, Exception] = {}
+        for row, game in enumerate(games):
+            try:
+                collided_slots.append(game.update(dt))
+            except ValueError as exc:
+                logger.error("Ball could not be pushed out of a paddle: %s", exc)
+                collided_slots.append(None)
+            except Exception as e:  # pylint: disable=broad-except
+                failures[row] = e
+                collided_slots.append(None)
+        if failures:
+            raise PhysicsStepError(collided_slots, failures)
+        return collided_slots
+
+
+class PhysicsEngineFactory:
+
+    INSTANCE = None
+
+    @staticmethod
+    def create(name: str):
+        if name == NUMPY_ENGINE:
+            try:
+                # pylint: disable-next=import-outside-toplevel
+                from back_game.game_physics.numpy_engine import NumpyPhysicsEngine
+
+                return NumpyPhysicsEngine()
+            except ImportError:
+                logger.error("NumPy is not installed, using the object engine.")
+        elif name != OBJECT_ENGINE:
+            logger.error("Unknown physics engine %s, using the object engine.", name)
+        return ObjectPhysicsEngine()
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls.create(settings.GAME_PHYSICS_ENGINE)
+            logger.info("Physics engine: %s", cls.INSTANCE.name)
+        return cls.INSTANCE
+
+
+def get_physics_engine():
+    return PhysicsEngineFactory.get_instance()
@@ -2,16 +2,25 @@ from back_game.game_geometry.vector import Vector
 
 
 class Speed(Vector):
+    __slots__ = ("absolute_velocity",)
 
     def __init__(self, x: float, y: float):
         super().__init__(x, y)
         self.absolute_velocity = self.magnitude()
 
+    def to_float_dict(self) -> dict[str, float]:
+        return {"x": self.x, "y": self.y, "absolute_velocity": self.absolute_velocity}
+
     def update(self, new_speed: "Speed"):
         self.x = new_speed.x
         self.y = new_speed.y
         self.absolute_velocity = new_speed.absolute_velocity
 
+    def set_components(self, x: float, y: float):
+        self.x = x
+        self.y = y
+        self.absolute_velocity = self.magnitude()
+
     def reverse_y_direction(self):
         self.y *= -1
 
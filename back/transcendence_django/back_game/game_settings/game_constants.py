@@ -8,8 +8,14 @@ NOT_JOINED = 1
 INVALID_ARENA = 2
 INVALID_LOBBY = 3
 NOT_ENTERED = 4
+INVALID_REPLAY = 5
+INVALID_INPUT = 6
 UNKNOWN_LOBBY_ID = "Unknown lobby_id"
 UNKNOWN_ARENA_ID = "Unknown arena_id"
+UNKNOWN_REPLAY = "Unknown replay"
+INVALID_REPLAY_SPEED = "Invalid replay speed"
+INVALID_REPLAY_MESSAGE = "Invalid replay message"
+INVALID_REPLAY_TIME = "Invalid replay time"
 
 # Game area dimensions
 GAME_HEIGHT = 800
@@ -38,6 +44,8 @@ BOTTOM_SLOT = 3
 TOP_SLOT = 4
 CONVEXITY = 90
 VALID_DIRECTIONS = [-1, 1]
+VALID_INPUTS = [-1, 0, 1]
+PADDLE_MOVE_RATE = 60  # moves per second while an input is held
 
 # Tournament
 
@@ -59,12 +67,17 @@ TOURNAMENT_ARENA_COUNT = 2
 TOURNAMENT_MAX_ROUND = int(math.log2(TOURNAMENT_ARENA_COUNT) + 1)
 
 # Game loop parameters
-ARENA_LOOP_INTERVAL = 0.5
-LOBBY_LOOP_INTERVAL = 0.5
-MONITOR_LOOP_INTERVAL = 0.5
-NEXT_ROUND_LOOP_INTERVAL = 0.5
 WAIT_NEXT_ROUND_INTERVAL = 3
-RUN_LOOP_INTERVAL = 0.005
+PHYSICS_RATE = 120  # Hz
+PHYSICS_STEP = 1 / PHYSICS_RATE
+MAX_ACCUMULATED_TIME = 0.25  # seconds of simulation caught up at most per update
+SPEED_REFERENCE_RATE = 200  # speeds are expressed in units per 5 ms
+DEFAULT_BROADCAST_RATE = 60  # Hz
+MIN_BROADCAST_RATE = 10
+MAX_BROADCAST_RATE = PHYSICS_RATE
+RUN_LOOP_INTERVAL = PHYSICS_STEP
+MAX_CATCH_UP_TICKS = 5
+TICK_STATS_WINDOW = 1000
 TIMEOUT_GAME_OVER = 5
 TIMEOUT_INTERVAL = 1
 AFK_TIMEOUT = 30  # seconds
@@ -73,6 +86,45 @@ AFK_WARNING_THRESHOLD = 10  # seconds
 TIME_START = 3
 TIME_START_INTERVAL = 1
 
+# Game history persistence
+HISTORY_QUEUE_SIZE = 1024  # summaries waiting to be written at most
+HISTORY_BATCH_SIZE = 64
+HISTORY_MAX_ATTEMPTS = 5
+HISTORY_RETRY_DELAY = 0.5  # seconds, doubled on every attempt
+LEADERBOARD_RECONCILE_INTERVAL = 3600  # seconds
+
+# Internal services
+USER_SERVICE_URL = "https://back-user"
+AIPI_SERVICE_URL = "https://back-aipi"
+SERVICE_CERT_FILE = "/etc/ssl/public.crt"
+SERVICE_KEY_FILE = "/etc/ssl/private.key"
+SERVICE_POOL_SIZE = 32  # connections per service
+SERVICE_KEEPALIVE_TIMEOUT = 30  # seconds an idle connection is kept
+SERVICE_REQUEST_TIMEOUT = 3  # seconds
+SERVICE_FAILURE_THRESHOLD = 5  # failures in a row opening the circuit
+SERVICE_RESET_TIMEOUT = 10  # seconds before a call is let through again
+PLAYING_STATUS_FLUSH_DELAY = 0.25  # seconds the status changes are held
+PLAYING_STATUS_BATCH_SIZE = 100  # users per call
+
+# Bots
+IN_PROCESS_BOTS = True  # played by the game server rather than the AIPI service
+BOT_AIM_PRECISION = 0.85
+BOT_FOLLOW_PRECISION = 0.70
+
+# Replays
+REPLAY_KEYFRAME_INTERVAL = PHYSICS_RATE * 5  # physics steps between keyframes
+REPLAY_FRAME_RATE = 30  # frames per second of play sent to the viewers
+REPLAY_FRAME_STEPS = PHYSICS_RATE // REPLAY_FRAME_RATE  # physics steps per frame
+REPLAY_CHUNK_FRAMES = REPLAY_FRAME_RATE * 2  # frames decoded at once
+REPLAY_CACHED_CHUNKS = 64  # encoded chunks kept per replay
+REPLAY_MIN_SPEED = 1
+REPLAY_MAX_SPEED = 16
+REPLAY_LIVE_POLL_INTERVAL = 0.5  # seconds between the reads of a live log
+
+# Simulation
+SIMULATION_MAX_TICKS = PHYSICS_RATE * 600  # ten minutes of play per match
+SIMULATION_SCRIPT = [-1, -1, 0, 1, 1, 0]  # inputs of the scripted bots
+
 # Rectangle
 TANGENT_FACTOR = 1 / (2 * math.tan(CONVEXITY / 2))
 
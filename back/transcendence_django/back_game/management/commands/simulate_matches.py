@@ -0,0 +1,85 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+
+from back_game.game_settings.game_constants import PHYSICS_STEP, SIMULATION_MAX_TICKS
+from back_game.monitor.match_simulator import (
+    AI_INPUTS,
+    SCRIPTED_INPUTS,
+    simulate_matches,
+)
+from django.core.management.base import BaseCommand
+
+
+def silence_game_logs():
+    # Every point and status change is logged at INFO
+    logging.disable(logging.INFO)
+
+
+class Command(BaseCommand):
+    help = (
+        "Plays bot matches headless, as fast as the CPU allows, on a process "
+        "pool and reports the throughput per core and the match statistics."
+    )
+    requires_system_checks = []  # Touches neither the database nor the urls
+
+    def add_arguments(self, parser):
+        parser.add_argument("--matches", type=int, default=1000)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--inputs", choices=[AI_INPUTS, SCRIPTED_INPUTS], default=AI_INPUTS
+        )
+        parser.add_argument("--ball-speed", type=int, default=2)
+        parser.add_argument("--paddle-size", type=int, default=2)
+        parser.add_argument("--max-ticks", type=int, default=SIMULATION_MAX_TICKS)
+
+    def handle(self, *args, **options):
+        workers = max(1, min(options["workers"], options["matches"]))
+        seeds = list(range(options["seed"], options["seed"] + options["matches"]))
+        task = partial(
+            simulate_matches,
+            ball_speed=options["ball_speed"],
+            paddle_size=options["paddle_size"],
+            inputs=options["inputs"],
+            max_ticks=options["max_ticks"],
+        )
+        start = perf_counter()
+        with ProcessPoolExecutor(workers, initializer=silence_game_logs) as pool:
+            results = list(pool.map(task, [seeds[i::workers] for i in range(workers)]))
+        elapsed = perf_counter() - start
+        for worker, result in enumerate(results, 1):
+            self.stdout.write(
+                f"Worker {worker}: {result['matches']} matches, {result['ticks']} "
+                f"ticks in {result['seconds']:.2f} s, "
+                f"{result['matches'] / result['seconds']:.1f} matches/s, "
+                f"{result['ticks'] / result['seconds']:.0f} ticks/s"
+            )
+        self.__write_summary(results, workers, elapsed)
+
+    def __write_summary(self, results: list[dict], workers: int, elapsed: float):
+        matches = sum(result["matches"] for result in results)
+        ticks = sum(result["ticks"] for result in results)
+        points = sum(result["points"] for result in results)
+        busy = sum(result["seconds"] for result in results)
+        wins: dict[int, int] = {}
+        for result in results:
+            for slot, count in result["wins"].items():
+                wins[slot] = wins.get(slot, 0) + count
+        self.stdout.write(
+            f"Per core: {matches / busy:.1f} matches/s, {ticks / busy:.0f} ticks/s"
+        )
+        self.stdout.write(
+            f"Total: {matches} matches on {workers} workers in {elapsed:.2f} s, "
+            f"{matches / elapsed:.1f} matches/s, {ticks / elapsed:.0f} ticks/s"
+        )
+        self.stdout.write(
+            f"Game time: {ticks * PHYSICS_STEP / matches:.1f} s per match, "
+            f"{ticks * PHYSICS_STEP / max(points, 1):.1f} s per point"
+        )
+        self.stdout.write(
+            f"Wins per slot: {dict(sorted(wins.items()))}, unfinished: "
+            f"{sum(result['unfinished'] for result in results)}"
+        )
@@ -0,0 +1,78 @@
+import logging
+from typing import Any, Callable
+
+from back_game.game_arena.arena import Arena
+from back_game.game_arena.bot import Bot
+
+logger = logging.getLogger(__name__)
+
+
+class BotDriver:
+    """
+    Plays the bots of the arenas of the game server on the arena tick,
+    after the physics steps, so a bot costs neither a thread nor a socket.
+    A bot holds its input until it reacts again, like a player its key.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.bots: dict[str, list[Bot]] = {}
+        self.last_bot_id: int = 0
+
+    def add_bot(self, arena: Arena, bot_factory: Callable[[int], Bot] = Bot) -> Bot:
+        """
+        Enters a new bot in the arena. Raises a ValueError if it is full.
+        """
+        self.last_bot_id -= 1
+        bot = bot_factory(self.last_bot_id)
+        arena.enter_arena(bot.user_id, bot.player_name, is_bot=True)
+        self.bots.setdefault(arena.id, []).append(bot)
+        logger.info("Bot %s entered the arena %s", bot.user_id, arena.id)
+        return bot
+
+    def remove_arena(self, arena_id: str):
+        self.bots.pop(arena_id, None)
+
+    def play(self, arenas: list[Arena], elapsed: float):
+        for arena in arenas:
+            bots = self.bots.get(arena.id)
+            if not bots:
+                continue
+            for bot in bots:
+                if not bot.is_reacting(elapsed, arena.broadcast_interval):
+                    continue
+                is_losing = self.__is_losing(arena, bot)
+                direction = bot.get_direction(arena.game, is_losing)
+                try:
+                    arena.set_paddle_input(bot.player_name, direction)
+                except KeyError:
+                    pass  # Paddle given back while waiting for players
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "bot_count": sum(len(bots) for bots in self.bots.values()),
+            "bot_arena_count": len(self.bots),
+        }
+
+    @staticmethod
+    def __is_losing(arena: Arena, bot: Bot) -> bool:
+        players = arena.get_players()
+        bot_player = players.get(bot.player_name)
+        if bot_player is None:
+            return False
+        return any(
+            player.score > bot_player.score
+            for player_name, player in players.items()
+            if player_name != bot.player_name
+        )
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_bot_driver() -> BotDriver:
+    return BotDriver.get_instance()
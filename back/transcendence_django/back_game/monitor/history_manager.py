@@ -1,52 +1,205 @@
+import asyncio
+import atexit
+import logging
+import threading
 from typing import Any
 
 from asgiref.sync import sync_to_async
+from back_game.game_settings.game_constants import (
+    HISTORY_BATCH_SIZE,
+    HISTORY_MAX_ATTEMPTS,
+    HISTORY_QUEUE_SIZE,
+    HISTORY_RETRY_DELAY,
+    LEADERBOARD_RECONCILE_INTERVAL,
+)
 from django.apps import apps
+from django.db import DatabaseError, connection, transaction
+from redis.exceptions import RedisError
 from transcendence_django.dict_keys import (
     ARENA_ID,
     IS_BOT,
     IS_REMOTE,
     PLAYERS,
+    REPLAY,
     START_TIME,
     USER_ID,
     WINNER,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class HistoryManager:
+    """
+    Persists the summaries of finished games in the background, off the
+    game loop. Summaries wait in a bounded queue and are written in
+    batches, each in one transaction: a bulk insert of the summaries and
+    of their links to the players, one update of the players' counters
+    and the update of their ratings. Failed batches are retried with a
+    growing delay; what is still queued is written at exit. A batch is
+    owned by the writer that takes it under the write lock, so the exit
+    flush never writes a batch the loop is writing, or has written.
+    The leaderboard is reconciled in a worker thread, off the thread the
+    other database calls share, and never while a batch is written.
+    """
+
+    INSTANCE = None
 
     def __init__(self):
         self.game_summary_model = apps.get_model("shared_models", "GameSummary")
         self.custom_user_model = apps.get_model("shared_models", "CustomUser")
+        # pylint: disable-next=import-outside-toplevel
+        from shared_models.leaderboard import get_leaderboard
+
+        self.leaderboard = get_leaderboard()
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(HISTORY_QUEUE_SIZE)
+        self.in_flight: list[dict[str, Any]] = []
+        self.write_lock = threading.Lock()
+        self.rating_lock = asyncio.Lock()
+        self.task: asyncio.Task[None] | None = None
+        self.reconcile_task: asyncio.Task[None] | None = None
 
     async def save_game_summary(self, summary: dict[str, Any]):
-        if summary[WINNER] is None:
-            winner_user_id = None
-        else:
-            winner_user_id = summary[WINNER].get(USER_ID)
-        game_summary = await sync_to_async(self.game_summary_model.objects.create)(
+        try:
+            self.__validate(summary)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            # Dropped alone, rather than with the batch it would spoil
+            logger.error("Invalid game summary %s: %r", summary, e)
+            return
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+        if self.reconcile_task is None or self.reconcile_task.done():
+            self.reconcile_task = asyncio.create_task(self.reconcile_leaderboard())
+        await self.queue.put(summary)
+
+    async def run(self):
+        while True:
+            summaries = [await self.queue.get()]
+            while len(summaries) < HISTORY_BATCH_SIZE and not self.queue.empty():
+                summaries.append(self.queue.get_nowait())
+            self.in_flight = summaries
+            await self.__write_with_retries(summaries)
+            with self.write_lock:
+                if self.in_flight is summaries:
+                    self.in_flight = []
+
+    async def reconcile_leaderboard(self):
+        while True:
+            await asyncio.sleep(LEADERBOARD_RECONCILE_INTERVAL)
+            try:
+                async with self.rating_lock:
+                    await sync_to_async(self.__reconcile, thread_sensitive=False)()
+            except DatabaseError as e:
+                logger.warning("Leaderboard reconciliation failed: %s", e)
+            except RedisError as e:
+                logger.warning("Leaderboard reconciliation failed: %s", e)
+
+    def flush(self):
+        with self.write_lock:
+            summaries, self.in_flight = self.in_flight, []
+            while not self.queue.empty():
+                summaries.append(self.queue.get_nowait())
+            if not summaries:
+                return
+            try:
+                self.write_batch(summaries)
+                logger.info("Flushed %s game summaries", len(summaries))
+            except DatabaseError as e:
+                logger.error("Lost %s game summaries: %s", len(summaries), e)
+
+    def write_in_flight(self, summaries: list[dict[str, Any]]):
+        """
+        Writes the batch of the loop, unless the exit flush took it.
+        """
+        with self.write_lock:
+            if self.in_flight is not summaries:
+                return
+            self.write_batch(summaries)
+            self.in_flight = []
+
+    def write_batch(self, summaries: list[dict[str, Any]]):
+        try:
+            with transaction.atomic():
+                game_summaries = self.game_summary_model.objects.bulk_create(
+                    [self.__create_game_summary(summary) for summary in summaries]
+                )
+                user_summaries = [
+                    (self.__get_user_ids(summary), game_summary)
+                    for summary, game_summary in zip(summaries, game_summaries)
+                ]
+                self.custom_user_model.objects.add_game_summaries(
+                    [
+                        (user_id, game_summary)
+                        for user_ids, game_summary in user_summaries
+                        for user_id in user_ids
+                    ]
+                )
+                self.leaderboard.rate_games(user_summaries)
+        except DatabaseError:
+            # The connection may be broken; the next attempt opens a new one.
+            connection.close()
+            raise
+
+    async def __write_with_retries(self, summaries: list[dict[str, Any]]):
+        for attempt in range(HISTORY_MAX_ATTEMPTS):
+            try:
+                async with self.rating_lock:
+                    await sync_to_async(self.write_in_flight)(summaries)
+                return
+            except DatabaseError as e:
+                logger.warning(
+                    "Writing %s game summaries failed (attempt %s): %s",
+                    len(summaries),
+                    attempt + 1,
+                    e,
+                )
+                await asyncio.sleep(HISTORY_RETRY_DELAY * 2**attempt)
+        logger.error("Dropped %s game summaries", len(summaries))
+
+    def __reconcile(self):
+        try:
+            self.leaderboard.reconcile()
+        finally:
+            # Opened in a worker thread that may not run it next time
+            connection.close()
+
+    def __validate(self, summary: dict[str, Any]):
+        """
+        Builds the summary as a batch would, raising if it cannot be.
+        """
+        self.__create_game_summary(summary)
+        if not self.__get_user_ids(summary) and not summary[IS_REMOTE]:
+            logger.error("No human player in game %s", summary[ARENA_ID])
+
+    def __create_game_summary(self, summary: dict[str, Any]):
+        winner = summary[WINNER]
+        return self.game_summary_model(
             arena_id=summary[ARENA_ID],
-            winner_user_id=winner_user_id,
+            winner_user_id=winner.get(USER_ID) if winner is not None else None,
             players=summary[PLAYERS],
             is_remote=summary[IS_REMOTE],
             start_time=summary[START_TIME],
+            replay=summary.get(REPLAY) or "",
         )
-        if summary[IS_REMOTE]:
-            for player in summary[PLAYERS]:
-                await self.__save_game_summary_for_player(player, game_summary)
-        else:
-            player = self.__get_human_player(players=summary[PLAYERS])
-            await self.__save_game_summary_for_player(player, game_summary)
-
-    def __get_human_player(self, players) -> dict[str, Any]:
-        for player in players:
-            if not player[IS_BOT]:
-                return player
-        raise ValueError("No human player found in game summary")
-
-    async def __save_game_summary_for_player(self, player, game_summary):
-        user_id = player.get(USER_ID)
-        is_bot = player.get(IS_BOT)
-        if user_id and not is_bot:
-            user = await sync_to_async(self.custom_user_model.objects.get)(pk=user_id)
-            await user.save_game_summary(game_summary)
+
+    @staticmethod
+    def __get_user_ids(summary: dict[str, Any]) -> list[int]:
+        humans = [
+            player[USER_ID]
+            for player in summary[PLAYERS]
+            if player.get(USER_ID) and not player.get(IS_BOT)
+        ]
+        if not summary[IS_REMOTE]:
+            return humans[:1]
+        return list(dict.fromkeys(humans))
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+            atexit.register(cls.INSTANCE.flush)
+        return cls.INSTANCE
+
+
+def get_history_manager() -> HistoryManager:
+    return HistoryManager.get_instance()
@@ -3,19 +3,22 @@ import logging
 import random
 import string
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
+from asgiref.sync import sync_to_async
 from back_game.game_arena.arena import Arena
 from back_game.game_arena.game import GameStatus
 from back_game.game_settings.game_constants import (
-    MONITOR_LOOP_INTERVAL,
-    RUN_LOOP_INTERVAL,
     TIMEOUT_GAME_OVER,
     TIMEOUT_INTERVAL,
     GameStatus,
 )
-from back_game.monitor.history_manager import HistoryManager
-from transcendence_django.dict_keys import ARENA, START_TIME
+from back_game.monitor.history_manager import get_history_manager
+from back_game.monitor.lobby_index import get_lobby_index
+from back_game.monitor.replay_store import REPLAY_STORE_ERRORS, get_replay_store
+from back_game.monitor.tick_scheduler import get_tick_scheduler
+from back_game.monitor.traffic_meter import get_traffic_meter
+from transcendence_django.dict_keys import ARENA, REPLAY, START_TIME
 
 logger = logging.getLogger(__name__)
 
@@ -25,10 +28,16 @@ class Lobby(ABC):
     def __init__(self, players_specs: dict[str, int]):
         self.id: str = self._generate_random_id(10)
         self.players_specs = players_specs
-        self.history_manager = HistoryManager()
+        self.history_manager = get_history_manager()
+        self.tick_scheduler = get_tick_scheduler()
+        self.traffic_meter = get_traffic_meter()
+        self.lobby_index = get_lobby_index()
         self.users: Dict[int, Arena] = {}
         self.arenas: Dict[str, Arena] = {}
         self.user_count = 0
+        self.changed: asyncio.Event = asyncio.Event()
+        self.state_tasks: Dict[str, asyncio.Task[None]] = {}
+        self.pending_arena_ids: set[str] = set()
 
     @abstractmethod
     def is_tournament(self) -> bool:
@@ -95,20 +104,27 @@ class Lobby(ABC):
 
     def add_arena(self):
         new_arena = Arena(self.players_specs)
-        asyncio.create_task(self.arena_loop(new_arena))
-        asyncio.create_task(self.run_game_loop(new_arena))
+        new_arena.state_listener = self.on_arena_state_changed
+        self.tick_scheduler.add_arena(new_arena)
         self.arenas[new_arena.id] = new_arena
+        self.lobby_index.add_free_lobby(self.is_tournament(), self.id)
+
+    def detach_arenas(self):
+        for arena_id in self.arenas:
+            self.tick_scheduler.remove_arena(arena_id)
+            self.traffic_meter.remove_arena(arena_id)
 
     async def add_user_into_arena(self, user_id: int, arena_id: str):
         if user_id in self.users:
             return
         if len(self.users) < self.user_count:
             arena: Arena = self.arenas[arena_id]
-            self.users[user_id] = arena
+            self.assign_user(user_id, arena)
             self.on_user_added()
             logger.info("User %s added to lobby %s", user_id, self.id)
             if self.is_full():
                 logger.info("Lobby %s is full!", self.id)
+                self.lobby_index.discard_free_lobby(self.is_tournament(), self.id)
                 await self.on_lobby_full()
         else:
             logger.error(
@@ -125,10 +141,25 @@ class Lobby(ABC):
                 assignations[str(user_id)] = arena.to_dict()
         return assignations
 
+    def assign_user(self, user_id: int, arena: Arena | None):
+        self.users[user_id] = arena
+        self.lobby_index.set_user(
+            user_id, self.id, arena.id if arena is not None else None
+        )
+        self.notify_change()
+
     def delete_user(self, user_id: int):
         if user_id in self.users:
             del self.users[user_id]
+            self.lobby_index.remove_user(user_id, self.id)
+            self.lobby_index.add_free_lobby(self.is_tournament(), self.id)
             logger.info("User %s deleted from lobby %s", user_id, self.id)
+            self.notify_change()
+
+    def remove_from_index(self):
+        for user_id in self.users:
+            self.lobby_index.remove_user(user_id, self.id)
+        self.lobby_index.discard_free_lobby(self.is_tournament(), self.id)
 
     def is_empty(self) -> bool:
         return not bool(self.arenas)
@@ -148,6 +179,18 @@ class Lobby(ABC):
         if summary[START_TIME] is not None:
             await self.history_manager.save_game_summary(summary)
 
+    async def save_replay(self, arena: Arena, summary: dict[str, Any]):
+        if arena.replay_data is None:
+            return
+        name = arena.get_replay_name()
+        try:
+            await sync_to_async(get_replay_store().save, thread_sensitive=False)(
+                name, arena.replay_data
+            )
+            summary[REPLAY] = name
+        except REPLAY_STORE_ERRORS:
+            logger.exception("Replay of arena %s not saved", arena.id)
+
     async def __update_game_states(self, arena: Arena):
         arena_status = arena.get_status()
         if arena.can_be_started():
@@ -155,23 +198,53 @@ class Lobby(ABC):
         elif arena.can_be_over():
             arena.conclude_game()
             summary = arena.get_game_summary()
+            await self.save_replay(arena, summary)
             await self.save_game_summary(summary)
             if arena_status != GameStatus.STARTED:
                 arena.set_status(GameStatus.DEAD)
         elif arena_status == GameStatus.OVER:
             await self.__game_over(arena)
 
-    async def arena_loop(self, arena: Arena):
-        while arena.get_status() != GameStatus.DEAD:
-            await self.__update_game_states(arena)
-            await asyncio.sleep(MONITOR_LOOP_INTERVAL)
+    async def monitor_arena(self, arena: Arena):
+        await self.__update_game_states(arena)
+
+    def notify_change(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+    async def wait_until(self, condition: Callable[[], bool]):
+        """
+        Returns once condition holds, checking it again on every change of
+        the users or of the arenas of the lobby.
+        """
+        while not condition():
+            await self.changed.wait()
+
+    def on_arena_state_changed(self, arena: Arena):
+        """
+        Runs the state handler of the arena, or runs it again once it is
+        done if it is already running.
+        """
+        self.notify_change()
+        if arena.id in self.state_tasks:
+            self.pending_arena_ids.add(arena.id)
+            return
+        self.state_tasks[arena.id] = asyncio.create_task(
+            self.__handle_arena_state(arena)
+        )
 
-    async def run_game_loop(self, arena: Arena):
-        while arena:
-            if arena.get_status() == GameStatus.STARTED:
-                update_message = arena.update_game()
-                await arena.send_update(update_message)
-            await asyncio.sleep(RUN_LOOP_INTERVAL)
+    async def __handle_arena_state(self, arena: Arena):
+        try:
+            while True:
+                self.pending_arena_ids.discard(arena.id)
+                await self.monitor_arena(arena)
+                if arena.id not in self.pending_arena_ids:
+                    return
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("State handler of arena %s failed: %s", arena.id, e)
+        finally:
+            self.state_tasks.pop(arena.id, None)
+            self.pending_arena_ids.discard(arena.id)
 
     async def __game_over(self, arena: Arena):
         logger.info("Game over in arena %s", arena.id)
@@ -182,16 +255,15 @@ class Lobby(ABC):
         arena.set_status(GameStatus.DYING)
         await arena.send_update({ARENA: arena.to_dict()})
         time = TIMEOUT_GAME_OVER + 1
-        while (
-            arena.get_status() in [GameStatus.DYING, GameStatus.WAITING] and time > 0
-        ):
+        dying_statuses = [GameStatus.DYING, GameStatus.WAITING]
+        while arena.get_status() in dying_statuses and time > 0:
             time -= TIMEOUT_INTERVAL
             if arena.game_over_callback is not None:
                 await arena.game_over_callback(time)
             if time <= 0 and arena.get_status() == GameStatus.DYING:
                 arena.set_status(GameStatus.DEAD)
             else:
-                await asyncio.sleep(TIMEOUT_INTERVAL)
+                await arena.wait_while_status_in(dying_statuses, TIMEOUT_INTERVAL)
         logger.info("Users in arena %s: %s", arena.id, arena.get_players().keys())
         logger.info("Users in lobby %s: %s", self.id, self.users.keys())
 
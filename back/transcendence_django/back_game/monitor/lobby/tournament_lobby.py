@@ -6,8 +6,6 @@ from back_game.game_arena.arena import Arena
 from back_game.game_arena.game import GameStatus
 from back_game.game_arena.player import Player
 from back_game.game_settings.game_constants import (
-    ARENA_LOOP_INTERVAL,
-    NEXT_ROUND_LOOP_INTERVAL,
     TOURNAMENT_ARENA_COUNT,
     TOURNAMENT_MAX_ROUND,
     WAIT_NEXT_ROUND_INTERVAL,
@@ -47,6 +45,7 @@ class TournamentLobby(Lobby):
 
     def disable(self):
         self.is_active = False
+        self.notify_change()
 
     def on_user_added(self):
         self.__update_rounds_map()
@@ -72,12 +71,11 @@ class TournamentLobby(Lobby):
             self.__set_next_round_arenas()
         self.round_count += 1
         logger.debug("Tournament round %s", self.round_count)
+        self.notify_change()
 
-    async def arena_loop(self, arena: Arena):
-        while self.round_count <= TOURNAMENT_MAX_ROUND and self.is_active:
-            logger.debug("Arena %s loop", arena.id)
-            await super().arena_loop(arena)
-            await asyncio.sleep(ARENA_LOOP_INTERVAL)
+    async def monitor_arena(self, arena: Arena):
+        if self.round_count <= TOURNAMENT_MAX_ROUND and self.is_active:
+            await super().monitor_arena(arena)
 
     async def next_round_loop(self):
         while self.round_count <= TOURNAMENT_MAX_ROUND:
@@ -85,11 +83,12 @@ class TournamentLobby(Lobby):
             await self.send_tournament_map()
             await asyncio.sleep(WAIT_NEXT_ROUND_INTERVAL)
             await self.send_assignations()
-            while not self.can_round_be_set():
-                if not self.is_active:
-                    return
-                logger.debug("Waiting for next round")
-                await asyncio.sleep(NEXT_ROUND_LOOP_INTERVAL)
+            logger.debug("Waiting for next round")
+            await self.wait_until(
+                lambda: self.can_round_be_set() or not self.is_active
+            )
+            if not self.can_round_be_set():
+                return
 
     async def send_assignations(self):
         assignations: dict[str, Any] = self.get_assignations()
@@ -185,10 +184,10 @@ class TournamentLobby(Lobby):
                 for new_arena in self.arenas.values():
                     if new_arena.is_full():
                         continue
-                    self.users[user_id] = new_arena
+                    self.assign_user(user_id, new_arena)
                     break
             else:
-                self.users[user_id] = None
+                self.assign_user(user_id, None)
                 losers.append(user_id)
         for loser in losers:
             self.delete_user(loser)
\ No newline at end of file
@@ -0,0 +1,66 @@
+import logging
+from collections import OrderedDict
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class LobbyIndex:
+    """
+    Reverse indexes of the lobbies, kept up to date by the lobbies
+    themselves: the lobby and arena of every user, and per mode the
+    lobbies that may have a free slot for matchmaking.
+    A free lobby candidate is only a hint; it is checked when picked and
+    discarded once it is full. Lobbies are added back whenever a user
+    leaves them or they get a new arena.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.user_locations: dict[int, tuple[str, str | None]] = {}
+        # OrderedDict, as finding the first key of a dict after popping from
+        # its front scans the deleted entries
+        self.free_lobbies: dict[bool, OrderedDict[str, None]] = {
+            False: OrderedDict(),
+            True: OrderedDict(),
+        }
+
+    def set_user(self, user_id: int, lobby_id: str, arena_id: str | None):
+        self.user_locations[user_id] = (lobby_id, arena_id)
+
+    def remove_user(self, user_id: int, lobby_id: str):
+        location = self.user_locations.get(user_id)
+        if location is not None and location[0] == lobby_id:
+            del self.user_locations[user_id]
+
+    def get_lobby_id(self, user_id: int) -> str | None:
+        location = self.user_locations.get(user_id)
+        return location[0] if location is not None else None
+
+    def get_arena_id(self, user_id: int) -> str | None:
+        location = self.user_locations.get(user_id)
+        return location[1] if location is not None else None
+
+    def add_free_lobby(self, is_tournament: bool, lobby_id: str):
+        self.free_lobbies[is_tournament][lobby_id] = None
+
+    def discard_free_lobby(self, is_tournament: bool, lobby_id: str):
+        self.free_lobbies[is_tournament].pop(lobby_id, None)
+
+    def get_free_lobby_ids(self, is_tournament: bool) -> Iterator[str]:
+        """
+        Yields the free lobby candidates of the mode, oldest first. They
+        must not be added or discarded while iterating.
+        """
+        return iter(self.free_lobbies[is_tournament])
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_lobby_index() -> LobbyIndex:
+    return LobbyIndex.get_instance()
@@ -1,25 +1,26 @@
 import asyncio
 import logging
-from http import HTTPStatus
 from typing import Any
 
-import aiohttp
 from back_game.game_arena.arena import Arena
+from back_game.game_arena.bot import is_bot_id
 from back_game.game_settings.game_constants import (
-    LOBBY_LOOP_INTERVAL,
+    AIPI_SERVICE_URL,
+    IN_PROCESS_BOTS,
     TOURNAMENT_SPECS,
     GameStatus,
 )
+from back_game.monitor.bot_driver import get_bot_driver
 from back_game.monitor.lobby.classic_lobby import ClassicLobby
 from back_game.monitor.lobby.lobby import Lobby
 from back_game.monitor.lobby.tournament_lobby import TournamentLobby
-from requests import JSONDecodeError, Response
-from requests import get as http_get
+from back_game.monitor.lobby_index import get_lobby_index
+from back_game.monitor.playing_status_batcher import PlayingStatusBatcher
+from back_game.monitor.service_client import ServiceError, get_service_client
 from transcendence_django.dict_keys import (
     AI_OPPONENTS_LOCAL,
     AI_OPPONENTS_ONLINE,
     ARENA_ID,
-    IS_PLAYING,
     LOBBY_ID,
     OPTIONS,
     USER_ID,
@@ -31,6 +32,10 @@ logger = logging.getLogger(__name__)
 class LobbyManager:
     def __init__(self):
         self.lobbies: dict[str, Lobby] = {}
+        self.lobby_index = get_lobby_index()
+        self.service_client = get_service_client()
+        self.bot_driver = get_bot_driver()
+        self.playing_status_batcher = PlayingStatusBatcher(self.service_client)
 
     async def add_to_lobby(
         self,
@@ -71,6 +76,8 @@ class LobbyManager:
                     await self.delete_user_from_lobby(user_id, lobby)
             else:
                 lobby.disable()
+                lobby.detach_arenas()
+                lobby.remove_from_index()
                 self.lobbies.pop(lobby_id)
                 logger.info("Lobby %s deleted", lobby_id)
 
@@ -89,7 +96,7 @@ class LobbyManager:
         lobby = self.get_lobby_from_user_id(user_id)
         if lobby is None and is_remote:
             logger.info("User %s is not in a lobby and is remote", user_id)
-            return self.__get_available_lobby(user_id, is_remote=True)
+            return self.__get_available_lobby(user_id)
         if lobby is None or lobby.is_tournament():
             return None
         arena = self.get_arena_from_user_id(user_id)
@@ -112,12 +119,11 @@ class LobbyManager:
         return new_lobby
 
     async def run_lobby_loop(self, lobby: Lobby):
-        while lobby and not lobby.can_be_deleted():
-            await asyncio.sleep(LOBBY_LOOP_INTERVAL)
+        await lobby.wait_until(lobby.can_be_deleted)
         await self.delete_lobby(lobby.id)
 
     async def join_tournament(self, user_id: int) -> dict[str, Any] | None:
-        lobby_dict = self.__get_available_lobby(user_id, is_remote=True, is_tournament=True)
+        lobby_dict = self.__get_available_lobby(user_id, is_tournament=True)
         if lobby_dict is None and self.get_lobby_from_user_id(user_id) is None:
             await self.create_new_lobby(user_id, TOURNAMENT_SPECS, is_tournament=True)
             return self.get_lobby_dict_from_user_id(user_id)
@@ -139,20 +145,16 @@ class LobbyManager:
         bots: int = int(players_specs[OPTIONS][AI_OPPONENTS_LOCAL]) + int(
             players_specs[OPTIONS][AI_OPPONENTS_ONLINE]
         )
-        while bots:
-            bots -= 1
-            try:
-                aipi_response: Response = http_get(
-                    url="https://back-aipi/aipi/spawn/",
-                    verify=False,  # does not work otherwise
-                    cert=("/etc/ssl/public.crt", "/etc/ssl/private.key"),
-                    json={LOBBY_ID: lobby_id, ARENA_ID: arena_id},
-                    timeout=3,
-                )
-                ai_user_id: int = aipi_response.json()[USER_ID]
+        if IN_PROCESS_BOTS:
+            for _ in range(bots):
+                await self.__add_bot(lobby_id, arena_id)
+            return
+        ai_user_ids = await asyncio.gather(
+            *(self.__spawn_bot(lobby_id, arena_id) for _ in range(bots))
+        )
+        for ai_user_id in ai_user_ids:
+            if ai_user_id is not None:
                 await self.add_ai_to_lobby(ai_user_id, lobby_id, arena_id)
-            except (ConnectionRefusedError, JSONDecodeError) as e:
-                logger.error(e)
 
     async def add_user_to_lobby(self, user_id: int, lobby_id: str, arena_id: str):
         await self.add_to_lobby(user_id, lobby_id, arena_id)
@@ -200,41 +202,65 @@ class LobbyManager:
             return None
         return lobby.get_arena_from_user_id(user_id)
 
+    def get_arena_id_from_user_id(self, user_id: int) -> str | None:
+        return self.lobby_index.get_arena_id(user_id)
+
     def get_lobby_from_user_id(self, user_id: int) -> Lobby | None:
-        for lobby in self.lobbies.values():
-            if user_id in lobby.users:
-                return lobby
-        return None
+        lobby_id = self.lobby_index.get_lobby_id(user_id)
+        if lobby_id is None:
+            return None
+        return self.get_lobby(lobby_id)
 
     async def update_user_playing_status(self, user_id, is_playing):
-        url = f'https://back-user/user/update_playing_status/'
-        params = {
-            USER_ID: user_id,
-            IS_PLAYING: int(is_playing),
-        }
-
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(url, params=params, ssl=False) as response:
-                    if response.status == HTTPStatus.OK:
-                        logger.info(f"Successfully updated playing status for user {user_id}")
-                    else:
-                        logger.error(f"Failed to update playing status: {response}")
-            except aiohttp.ClientError as e:
-                logger.error(f"Error updating playing status: {e}")
+        if not is_bot_id(user_id):
+            self.playing_status_batcher.update(user_id, is_playing)
+
+    async def __add_bot(self, lobby_id: str, arena_id: str):
+        arena = self.get_arena(lobby_id, arena_id)
+        if arena is None:
+            return
+        try:
+            bot = self.bot_driver.add_bot(arena)
+        except ValueError as e:
+            logger.error("Bot not added in lobby %s: %s", lobby_id, e)
+            return
+        await self.add_ai_to_lobby(bot.user_id, lobby_id, arena_id)
+
+    async def __spawn_bot(self, lobby_id: str, arena_id: str) -> int | None:
+        try:
+            response = await self.service_client.get_json(
+                AIPI_SERVICE_URL,
+                "/aipi/spawn/",
+                json={LOBBY_ID: lobby_id, ARENA_ID: arena_id},
+            )
+            return int(response[USER_ID])
+        except (ServiceError, KeyError, TypeError, ValueError) as e:
+            logger.error("Bot not spawned in lobby %s: %s", lobby_id, e)
+            return None
 
     def __get_available_lobby(
-        self, user_id: int, is_remote: bool = True, is_tournament: bool = False
+        self, user_id: int, is_tournament: bool = False
     ) -> dict[str, Any] | None:
-        for lobby in self.lobbies.values():
-            if lobby.is_tournament() == is_tournament:
+        # Only the lobbies gone or full leave the candidates: one that has
+        # no arena to offer right now may have one later.
+        stale_lobby_ids: list[str] = []
+        try:
+            for lobby_id in self.lobby_index.get_free_lobby_ids(is_tournament):
+                lobby = self.get_lobby(lobby_id)
+                if lobby is None or lobby.is_full():
+                    stale_lobby_ids.append(lobby_id)
+                    continue
                 available_arena = lobby.get_available_arena(user_id)
+                if available_arena is None:
+                    continue
                 logger.info(
                     "Available arena: %s in lobby %s", available_arena, lobby.id
                 )
-                if available_arena:
-                    return {
-                        "lobby_id": lobby.id,
-                        "arena": available_arena.to_dict(),
-                    }
-        return None
+                return {
+                    "lobby_id": lobby.id,
+                    "arena": available_arena.to_dict(),
+                }
+            return None
+        finally:
+            for lobby_id in stale_lobby_ids:
+                self.lobby_index.discard_free_lobby(is_tournament, lobby_id)
@@ -0,0 +1,147 @@
+import random
+import time
+from functools import partial
+from typing import Any, Callable
+
+from back_game.game_arena.arena import Arena
+from back_game.game_arena.bot import Bot
+from back_game.game_arena.game import Game
+from back_game.game_settings.game_constants import (
+    MAX_PLAYER,
+    PHYSICS_STEP,
+    SIMULATION_MAX_TICKS,
+    SIMULATION_SCRIPT,
+)
+from back_game.monitor.bot_driver import BotDriver
+from transcendence_django.dict_keys import (
+    AI_OPPONENTS_LOCAL,
+    AI_OPPONENTS_ONLINE,
+    HUMAN_OPPONENTS_LOCAL,
+    HUMAN_OPPONENTS_ONLINE,
+    IS_REMOTE,
+    NB_PLAYERS,
+    OPTIONS,
+    SCORES,
+    WINNER,
+)
+
+AI_INPUTS = "ai"
+SCRIPTED_INPUTS = "scripted"
+
+TICKS = "ticks"
+IS_OVER = "is_over"
+
+
+class ScriptedBot(Bot):
+    """
+    Plays a fixed list of inputs in a loop, one per reaction, whatever
+    the ball does. Each bot starts at a random point of the script.
+    """
+
+    def __init__(self, user_id: int, script: list[int], rng: random.Random):
+        super().__init__(user_id, rng)
+        self.script: list[int] = script
+        self.next_input: int = rng.randrange(len(script))
+
+    def get_direction(self, game: Game, is_losing: bool) -> int:
+        direction = self.script[self.next_input]
+        self.next_input = (self.next_input + 1) % len(self.script)
+        return direction
+
+
+class MatchSimulator:
+    """
+    Plays full matches between bots without the websocket stack nor the
+    real-time pacing: each tick advances the arena by one physics step,
+    then the bots play, as on the game server tick. The seed of a match
+    makes its serves and its bots reproducible, whatever process plays it.
+    """
+
+    def __init__(
+        self,
+        ball_speed: int,
+        paddle_size: int,
+        inputs: str = AI_INPUTS,
+        max_ticks: int = SIMULATION_MAX_TICKS,
+    ):
+        if inputs not in (AI_INPUTS, SCRIPTED_INPUTS):
+            raise ValueError(f"Unknown inputs {inputs}")
+        self.players_specs: dict[str, Any] = {
+            NB_PLAYERS: MAX_PLAYER,
+            IS_REMOTE: "local",
+            OPTIONS: {
+                "ball_speed": ball_speed,
+                "paddle_size": paddle_size,
+                "is_private": True,
+                HUMAN_OPPONENTS_LOCAL: 0,
+                HUMAN_OPPONENTS_ONLINE: 0,
+                AI_OPPONENTS_LOCAL: MAX_PLAYER,
+                AI_OPPONENTS_ONLINE: 0,
+            },
+        }
+        self.inputs: str = inputs
+        self.max_ticks: int = max_ticks
+        self.bot_driver: BotDriver = BotDriver()
+
+    def play(self, seed: int) -> dict[str, Any]:
+        rng = random.Random(seed)
+        arena = Arena(self.players_specs, seed)
+        bot_factory = self.__get_bot_factory(rng)
+        for _ in range(MAX_PLAYER):
+            self.bot_driver.add_bot(arena, bot_factory)
+        arena.prepare_game()
+        arena.launch_game()
+        ticks = 0
+        while ticks < self.max_ticks and not arena.can_be_over():
+            arena.update_game(PHYSICS_STEP)
+            self.bot_driver.play([arena], PHYSICS_STEP)
+            ticks += 1
+        self.bot_driver.remove_arena(arena.id)
+        is_over = arena.can_be_over()
+        if is_over:
+            arena.conclude_game()
+        winner = arena.get_winner()
+        return {
+            TICKS: ticks,
+            SCORES: arena.player_manager.get_scores(),
+            WINNER: arena.game.paddles[winner.player_name].slot if winner else None,
+            IS_OVER: is_over,
+        }
+
+    def __get_bot_factory(self, rng: random.Random) -> Callable[[int], Bot]:
+        if self.inputs == SCRIPTED_INPUTS:
+            return partial(ScriptedBot, script=SIMULATION_SCRIPT, rng=rng)
+        return partial(Bot, rng=rng)
+
+
+def simulate_matches(
+    seeds: list[int],
+    ball_speed: int,
+    paddle_size: int,
+    inputs: str = AI_INPUTS,
+    max_ticks: int = SIMULATION_MAX_TICKS,
+) -> dict[str, Any]:
+    """
+    Plays a match per seed and returns the totals, with the time it took.
+    Used as the task of the simulation workers.
+    """
+    simulator = MatchSimulator(ball_speed, paddle_size, inputs, max_ticks)
+    wins: dict[int, int] = {}
+    ticks = points = unfinished = 0
+    start = time.perf_counter()
+    for seed in seeds:
+        result = simulator.play(seed)
+        ticks += result[TICKS]
+        points += sum(result[SCORES])
+        if not result[IS_OVER]:
+            unfinished += 1
+        elif result[WINNER] is not None:
+            wins[result[WINNER]] = wins.get(result[WINNER], 0) + 1
+    return {
+        "matches": len(seeds),
+        "ticks": ticks,
+        "points": points,
+        "unfinished": unfinished,
+        "wins": wins,
+        "seconds": time.perf_counter() - start,
+    }
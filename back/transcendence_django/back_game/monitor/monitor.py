@@ -3,6 +3,8 @@ from typing import Any, Callable, Coroutine, Optional
 
 from back_game.game_arena.arena import Arena
 from back_game.monitor.lobby_manager import LobbyManager
+from back_game.monitor.tick_scheduler import get_tick_scheduler
+from back_game.monitor.traffic_meter import get_traffic_meter
 from django.apps import apps
 from django.conf import settings
 
@@ -16,6 +18,8 @@ class Monitor:
         if not apps.ready:
             apps.populate(settings.INSTALLED_APPS)
         self.lobby_manager = LobbyManager()
+        self.tick_scheduler = get_tick_scheduler()
+        self.traffic_meter = get_traffic_meter()
 
     async def create_new_lobby(
         self, user_id: int, players_specs: dict[str, int]
@@ -79,8 +83,8 @@ class Monitor:
     async def join_arena(
         self, user_id: int, player_name: str, lobby_id: str, arena_id: str
     ):
-        found_arena: Arena | None = self.lobby_manager.get_arena_from_user_id(user_id)
-        if found_arena and found_arena.id != arena_id:
+        found_arena_id = self.lobby_manager.get_arena_id_from_user_id(user_id)
+        if found_arena_id is not None and found_arena_id != arena_id:
             raise ValueError("User already in another arena")
         arena: Arena = self.get_arena(lobby_id, arena_id)
         arena.enter_arena(user_id, player_name)
@@ -110,6 +114,16 @@ class Monitor:
         arena: Arena = self.get_arena(lobby_id, arena_id)
         return arena.move_paddle(player_name, direction)
 
+    def set_paddle_input(
+        self,
+        lobby_id: str,
+        arena_id: str,
+        player_name: str,
+        direction: int,
+    ):
+        arena: Arena = self.get_arena(lobby_id, arena_id)
+        arena.set_paddle_input(player_name, direction)
+
     def leave_arena(self, user_id: int, lobby_id: str, arena_id: str | None):
         if arena_id is not None:
             self.lobby_manager.leave_arena(user_id, lobby_id, arena_id)
@@ -121,6 +135,15 @@ class Monitor:
             user_id, lobby_id, arena_id
         )
 
+    def get_tick_stats(self) -> dict[str, Any]:
+        return self.tick_scheduler.get_stats()
+
+    def get_traffic_stats(self) -> dict[str, Any]:
+        return self.traffic_meter.get_stats()
+
+    def get_playing_status_stats(self) -> dict[str, Any]:
+        return self.lobby_manager.playing_status_batcher.get_stats()
+
     @classmethod
     def get_instance(cls):
         if cls.MONITOR_INSTANCE is None:
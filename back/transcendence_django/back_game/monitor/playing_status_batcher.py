@@ -0,0 +1,66 @@
+import asyncio
+import logging
+from typing import Any
+
+from back_game.game_settings.game_constants import (
+    PLAYING_STATUS_BATCH_SIZE,
+    PLAYING_STATUS_FLUSH_DELAY,
+    USER_SERVICE_URL,
+)
+from back_game.monitor.service_client import ServiceClient, ServiceError
+from transcendence_django.dict_keys import IS_PLAYING, USER_ID
+
+logger = logging.getLogger(__name__)
+
+
+class PlayingStatusBatcher:
+    """
+    Holds the playing status changes of the users for a short delay and
+    sends the latest one of each user to the user service, many users per
+    call. A user joining and leaving within the delay costs one update.
+    """
+
+    def __init__(self, service_client: ServiceClient):
+        self.service_client = service_client
+        self.pending: dict[int, bool] = {}
+        self.task: asyncio.Task[None] | None = None
+        self.requested_updates: int = 0
+        self.sent_updates: int = 0
+        self.calls: int = 0
+
+    def update(self, user_id: int, is_playing: bool):
+        self.pending[user_id] = is_playing
+        self.requested_updates += 1
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.__run())
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "requested_updates": self.requested_updates,
+            "pending_updates": len(self.pending),
+            "sent_updates": self.sent_updates,
+            "calls": self.calls,
+        }
+
+    async def __run(self):
+        while self.pending:
+            await asyncio.sleep(PLAYING_STATUS_FLUSH_DELAY)
+            pending, self.pending = self.pending, {}
+            user_ids = list(pending)
+            for start in range(0, len(user_ids), PLAYING_STATUS_BATCH_SIZE):
+                batch = user_ids[start : start + PLAYING_STATUS_BATCH_SIZE]
+                await self.__send({user_id: pending[user_id] for user_id in batch})
+
+    async def __send(self, statuses: dict[int, bool]):
+        params: list[tuple[str, Any]] = []
+        for user_id, is_playing in statuses.items():
+            params.append((USER_ID, user_id))
+            params.append((IS_PLAYING, int(is_playing)))
+        self.calls += 1
+        try:
+            await self.service_client.get_json(
+                USER_SERVICE_URL, "/user/update_playing_status/", params=params
+            )
+            self.sent_updates += len(statuses)
+        except ServiceError as e:
+            logger.error("Playing status of %s users not updated: %s", len(statuses), e)
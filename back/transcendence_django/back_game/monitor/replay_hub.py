@@ -0,0 +1,283 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any
+
+from asgiref.sync import sync_to_async
+from back_game.app_settings.update_encoder import dumps
+from back_game.game_arena.arena import Arena
+from back_game.game_arena.replay_engine import ReplayCursor, ReplayEngine
+from back_game.game_arena.replay_log import ReplayLog, ReplayRecorder
+from back_game.game_settings.game_constants import (
+    PHYSICS_STEP,
+    REPLAY_CACHED_CHUNKS,
+    REPLAY_CHUNK_FRAMES,
+    REPLAY_FRAME_STEPS,
+)
+from back_game.monitor.replay_store import get_replay_store
+from transcendence_django.dict_keys import (
+    BALL,
+    DURATION,
+    GAME_UPDATE,
+    ID,
+    IS_LIVE,
+    NB_PLAYERS,
+    OPTIONS,
+    PADDLES,
+    PLAYERS,
+    POSITION,
+    REPLAY,
+    SCORES,
+    TIME,
+    TYPE,
+    UPDATE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayStream:
+    """
+    The frames of one replayed game, shared by all its viewers. A single
+    cursor decodes them a chunk at a time, off the event loop, restarting
+    from the closest keyframe when a viewer seeks, and each chunk is
+    encoded once and cached. A live stream follows the log of a game
+    still played, read again only when a chunk needs its new steps.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        log: ReplayLog,
+        arena: Arena | None = None,
+        recorder: ReplayRecorder | None = None,
+    ):
+        self.name: str = name
+        self.arena: Arena | None = arena
+        self.recorder: ReplayRecorder | None = recorder
+        self.viewers: int = 0
+        self.chunks: OrderedDict[int, list[str]] = OrderedDict()
+        self.decoded_chunks: int = 0
+        # Held while a chunk is decoded or the log replaced
+        self.decode_lock = asyncio.Lock()
+        self.available_steps: int = arena.step_count if arena is not None else 0
+        self.log_steps: int = self.available_steps
+        self.log: ReplayLog = log
+        self.engine: ReplayEngine = ReplayEngine(log)
+        self.cursor: ReplayCursor | None = None
+        self.end_step: int | None = log.get_end_step()
+
+    def is_live(self) -> bool:
+        return self.recorder is not None
+
+    def get_frame_count(self) -> int | None:
+        """
+        Returns the number of frames of the game, None while it is played.
+        """
+        if self.end_step is None:
+            return None
+        # The last one shows the end, the final point included
+        return -(-self.end_step // REPLAY_FRAME_STEPS) + 1
+
+    async def get_frame(self, index: int) -> str | None:
+        """
+        Returns the encoded frame, or None if the game did not reach it.
+        """
+        chunk_index, frame = divmod(index, REPLAY_CHUNK_FRAMES)
+        chunk = self.chunks.get(chunk_index)
+        if chunk is None:
+            async with self.decode_lock:
+                # Decoded meanwhile for another viewer
+                chunk = self.chunks.get(chunk_index)
+                if chunk is None:
+                    chunk = await self.__decode_chunk(chunk_index)
+            if chunk is None:
+                return None
+        else:
+            self.chunks.move_to_end(chunk_index)
+        return chunk[frame] if frame < len(chunk) else None
+
+    async def refresh(self):
+        """
+        Catches up with the steps of a live game, or with its end.
+        """
+        recorder, arena = self.recorder, self.arena
+        if recorder is None or arena is None:
+            return
+        if recorder.is_finished or arena.replay is not recorder:
+            async with self.decode_lock:
+                self.recorder = self.arena = None
+                if recorder.is_finished:
+                    self.__set_log(ReplayLog(bytes(recorder.buffer)))
+                else:
+                    # Dropped unfinished: the game ends where its log does
+                    self.__read_live_log(recorder)
+                    self.end_step = self.available_steps
+        elif arena.step_count > self.available_steps:
+            self.available_steps = arena.step_count
+
+    def get_info(self) -> dict[str, Any]:
+        log = self.log
+        return {
+            ID: self.name,
+            NB_PLAYERS: log.nb_players,
+            PLAYERS: [name for _, name in sorted(log.player_names.items())],
+            OPTIONS: {"ball_speed": log.ball_speed, "paddle_size": log.paddle_size},
+            DURATION: (
+                self.end_step * PHYSICS_STEP if self.end_step is not None else None
+            ),
+            IS_LIVE: self.is_live(),
+        }
+
+    def __set_log(self, log: ReplayLog):
+        self.log = log
+        self.engine = ReplayEngine(log)
+        self.cursor = None  # Reads the events of the previous log
+        self.end_step = log.get_end_step()
+
+    def __read_live_log(self, recorder: ReplayRecorder):
+        if self.log_steps < self.available_steps:
+            self.log_steps = self.available_steps
+            self.__set_log(recorder.get_log())
+
+    async def __decode_chunk(self, chunk_index: int) -> list[str] | None:
+        first_frame = chunk_index * REPLAY_CHUNK_FRAMES
+        last_frame = first_frame + REPLAY_CHUNK_FRAMES - 1
+        frame_count = self.get_frame_count()
+        if frame_count is not None:
+            last_frame = min(last_frame, frame_count - 1)
+            if last_frame < first_frame:
+                return None
+        elif last_frame * REPLAY_FRAME_STEPS > self.available_steps:
+            return None  # Steps still to be logged
+        if self.recorder is not None:
+            self.__read_live_log(self.recorder)
+        last_step = self.end_step if self.end_step is not None else self.available_steps
+        chunk = await sync_to_async(self.__decode_frames, thread_sensitive=False)(
+            first_frame, last_frame, last_step
+        )
+        self.chunks[chunk_index] = chunk
+        if len(self.chunks) > REPLAY_CACHED_CHUNKS:
+            self.chunks.popitem(last=False)
+        self.decoded_chunks += 1
+        return chunk
+
+    def __decode_frames(
+        self, first_frame: int, last_frame: int, last_step: int
+    ) -> list[str]:
+        first_step = first_frame * REPLAY_FRAME_STEPS
+        cursor = self.cursor
+        if (
+            cursor is None
+            or cursor.step > first_step
+            or self.log.get_keyframe(first_step)[0] > cursor.step
+        ):
+            cursor = self.cursor = self.engine.seek(first_step)
+        return [
+            self.__encode_frame(cursor, min(frame * REPLAY_FRAME_STEPS, last_step))
+            for frame in range(first_frame, last_frame + 1)
+        ]
+
+    def __encode_frame(self, cursor: ReplayCursor, step: int) -> str:
+        cursor.step_to(step)
+        game = cursor.game
+        paddles = sorted(game.paddles.values(), key=lambda paddle: paddle.slot)
+        return dumps(
+            {
+                TYPE: GAME_UPDATE,
+                UPDATE: {
+                    REPLAY: self.name,
+                    TIME: cursor.step * PHYSICS_STEP,
+                    BALL: {POSITION: game.ball.position.to_dict()},
+                    PADDLES: [paddle.get_dict_update() for paddle in paddles],
+                    SCORES: [cursor.scores.get(paddle.slot, 0) for paddle in paddles],
+                },
+            }
+        )
+
+
+class ReplayHub:
+    """
+    Opens one replay stream per game, whatever the number of its viewers,
+    and forgets it when the last one leaves. A game is named after its
+    stored replay, whether it is played, just over or stored.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.streams: dict[str, ReplayStream] = {}
+        self.loads: dict[str, asyncio.Future[ReplayStream]] = {}
+
+    async def open(self, name: str) -> ReplayStream:
+        """
+        Opens a stored replay. Raises a KeyError if it cannot be read.
+        """
+        stream = self.streams.get(name)
+        if stream is None:
+            load = self.loads.get(name)
+            if load is None:
+                load = asyncio.ensure_future(self.__load(name))
+                self.loads[name] = load
+            try:
+                # Other viewers may be waiting for the same load
+                loaded = await asyncio.shield(load)
+            finally:
+                self.loads.pop(name, None)
+            # Opened live meanwhile, or by the other viewers
+            stream = self.streams.setdefault(name, loaded)
+        stream.viewers += 1
+        return stream
+
+    def open_live(self, arena: Arena) -> ReplayStream:
+        """
+        Opens the replay of the game of the arena, played or just over.
+        Raises a KeyError if it did not start.
+        """
+        name = arena.get_replay_name()
+        stream = self.streams.get(name)
+        if stream is None:
+            if arena.replay is not None:
+                stream = ReplayStream(name, arena.replay.get_log(), arena, arena.replay)
+            elif arena.replay_data is not None:
+                stream = ReplayStream(name, ReplayLog(arena.replay_data))
+            else:
+                raise KeyError(f"No game played in arena {arena.id}")
+            self.streams[name] = stream
+        stream.viewers += 1
+        return stream
+
+    def close(self, stream: ReplayStream):
+        stream.viewers -= 1
+        if stream.viewers <= 0 and self.streams.get(stream.name) is stream:
+            del self.streams[stream.name]
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "replay_streams": len(self.streams),
+            "replay_viewers": sum(stream.viewers for stream in self.streams.values()),
+            "decoded_chunks": sum(
+                stream.decoded_chunks for stream in self.streams.values()
+            ),
+        }
+
+    async def __load(self, name: str) -> ReplayStream:
+        try:
+            data = await sync_to_async(get_replay_store().load, thread_sensitive=False)(
+                name
+            )
+            log = ReplayLog(data)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Replay %s not loaded: %s", name, e)
+            raise KeyError(name) from e
+        return ReplayStream(name, log)
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_replay_hub() -> ReplayHub:
+    return ReplayHub.get_instance()
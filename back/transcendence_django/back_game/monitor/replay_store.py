@@ -0,0 +1,60 @@
+# pylint: disable=no-name-in-module
+import io
+import logging
+
+import urllib3
+from django.conf import settings
+from minio import Minio
+from minio.error import MinioException
+
+logger = logging.getLogger(__name__)
+
+# Raised by the store when MinIO is unreachable, misconfigured or refuses a call
+REPLAY_STORE_ERRORS = (MinioException, urllib3.exceptions.HTTPError, ValueError)
+
+
+class ReplayStore:
+    """
+    Keeps the replay logs of the finished games in their MinIO bucket.
+    Calls are blocking: run them off the event loop.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.client = Minio(
+            settings.MINIO_STORAGE_ENDPOINT,
+            access_key=settings.MINIO_ROOT_USER,
+            secret_key=settings.MINIO_ROOT_PASSWORD,
+            secure=settings.MINIO_STORAGE_USE_HTTPS,
+        )
+        self.client._http = urllib3.PoolManager(cert_reqs="CERT_NONE")
+        self.bucket_name: str = settings.MINIO_STORAGE_REPLAY_BUCKET_NAME
+
+    def save(self, name: str, data: bytes):
+        self.client.put_object(
+            self.bucket_name,
+            name,
+            io.BytesIO(data),
+            length=len(data),
+            content_type="application/octet-stream",
+        )
+        logger.info("Replay %s saved: %s bytes", name, len(data))
+
+    def load(self, name: str) -> bytes:
+        response = self.client.get_object(self.bucket_name, name)
+        try:
+            return response.read()
+        finally:
+            response.close()
+            response.release_conn()
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_replay_store() -> ReplayStore:
+    return ReplayStore.get_instance()
@@ -0,0 +1,163 @@
+import asyncio
+import logging
+import ssl
+import time
+from http import HTTPStatus
+from typing import Any
+
+import aiohttp
+from back_game.game_settings.game_constants import (
+    SERVICE_CERT_FILE,
+    SERVICE_FAILURE_THRESHOLD,
+    SERVICE_KEEPALIVE_TIMEOUT,
+    SERVICE_KEY_FILE,
+    SERVICE_POOL_SIZE,
+    SERVICE_REQUEST_TIMEOUT,
+    SERVICE_RESET_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling a service that failed several times in a row, so that
+    callers fail fast instead of waiting for timeouts. Once the reset
+    timeout is over, one call is let through; the circuit closes again if
+    it succeeds.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.failures: int = 0
+        self.opened_at: float | None = None
+        self.trial_running: bool = False
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.trial_running:
+            return False
+        if time.monotonic() - self.opened_at < SERVICE_RESET_TIMEOUT:
+            return False
+        self.trial_running = True
+        return True
+
+    def record_success(self):
+        if self.opened_at is not None:
+            logger.info("Circuit of %s closed", self.name)
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.trial_running = False
+        if self.opened_at is not None or self.failures >= SERVICE_FAILURE_THRESHOLD:
+            if self.opened_at is None:
+                logger.warning(
+                    "Circuit of %s opened after %s failures", self.name, self.failures
+                )
+            self.opened_at = time.monotonic()
+
+
+class ServiceClient:
+    """
+    Client of the internal services called by the game server. One
+    aiohttp session, created on the event loop it is first used from,
+    keeps a pool of keep-alive connections per service, so calls do not
+    pay a TLS handshake each. Every service has its own circuit breaker.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.session: aiohttp.ClientSession | None = None
+        self.session_loop: asyncio.AbstractEventLoop | None = None
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    async def get_json(
+        self,
+        base_url: str,
+        path: str,
+        params: Any = None,
+        json: Any = None,
+    ) -> Any:
+        """
+        Returns the decoded JSON response of a GET to the service. Raises a
+        ServiceError if the service is unavailable or does not answer OK.
+        Only transport errors and server errors count against the circuit.
+        """
+        breaker = self.breakers.get(base_url)
+        if breaker is None:
+            breaker = self.breakers[base_url] = CircuitBreaker(base_url)
+        if not breaker.allow():
+            raise ServiceError(f"{base_url} is unavailable")
+        try:
+            async with self.__get_session().get(
+                f"{base_url}{path}", params=params, json=json
+            ) as response:
+                status = response.status
+                content = None
+                if status == HTTPStatus.OK:
+                    content = await response.json(content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            breaker.record_failure()
+            raise ServiceError(f"{base_url}{path} failed: {e!r}") from e
+        except asyncio.CancelledError:
+            breaker.trial_running = False
+            raise
+        if status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if status != HTTPStatus.OK:
+            raise ServiceError(f"{base_url}{path} answered {status}")
+        return content
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            self.session_loop = loop
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=SERVICE_POOL_SIZE,
+                    keepalive_timeout=SERVICE_KEEPALIVE_TIMEOUT,
+                    ssl=self.__create_ssl_context(),
+                ),
+                timeout=aiohttp.ClientTimeout(total=SERVICE_REQUEST_TIMEOUT),
+            )
+        return self.session
+
+    @staticmethod
+    def __create_ssl_context() -> ssl.SSLContext:
+        # The services share a self-signed certificate
+        ssl_context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+        try:
+            ssl_context.load_cert_chain(
+                certfile=SERVICE_CERT_FILE, keyfile=SERVICE_KEY_FILE
+            )
+        except OSError as e:
+            logger.warning("No client certificate for the services: %s", e)
+        return ssl_context
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_service_client() -> ServiceClient:
+    return ServiceClient.get_instance()
@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+from back_game.app_settings.snapshot_encoder import SnapshotEncoder
+from back_game.game_arena.arena import Arena
+from back_game.game_arena.game import Game
+from back_game.game_physics.physics_engine import PhysicsStepError, get_physics_engine
+from back_game.game_settings.game_constants import (
+    MAX_CATCH_UP_TICKS,
+    PHYSICS_STEP,
+    RUN_LOOP_INTERVAL,
+    TICK_STATS_WINDOW,
+    GameStatus,
+)
+from back_game.monitor.bot_driver import get_bot_driver
+
+logger = logging.getLogger(__name__)
+
+
+class TickStats:
+
+    def __init__(self, tick_interval: float, window: int = TICK_STATS_WINDOW):
+        self.tick_interval: float = tick_interval
+        self.durations: deque[float] = deque(maxlen=window)
+        self.tick_count: int = 0
+        self.overrun_count: int = 0
+        self.skipped_ticks: int = 0
+        self.arena_count: int = 0
+
+    def record(self, duration: float, arena_count: int):
+        self.durations.append(duration)
+        self.tick_count += 1
+        self.arena_count = arena_count
+        if duration > self.tick_interval:
+            self.overrun_count += 1
+
+    def to_dict(self) -> dict[str, Any]:
+        durations = sorted(self.durations)
+        mean = sum(durations) / len(durations) if durations else 0
+        p99 = durations[int(len(durations) * 0.99) - 1] if durations else 0
+        return {
+            "tick_interval_ms": self.tick_interval * 1000,
+            "tick_count": self.tick_count,
+            "arena_count": self.arena_count,
+            "last_ms": self.durations[-1] * 1000 if self.durations else 0,
+            "mean_ms": mean * 1000,
+            "p99_ms": p99 * 1000,
+            "max_ms": durations[-1] * 1000 if durations else 0,
+            "load": mean / self.tick_interval,
+            "overrun_count": self.overrun_count,
+            "skipped_ticks": self.skipped_ticks,
+        }
+
+
+class TickScheduler:
+    """
+    Advances every started arena in one batch per fixed-timestep tick.
+    Physics steps of all arenas go through the physics engine together,
+    then the bots of the game server play.
+    Arena state changes are not polled here: arenas notify their lobby.
+    Late ticks are caught up back-to-back, up to MAX_CATCH_UP_TICKS;
+    beyond that they are skipped so that the loop does not spiral.
+    An arena that fails is ended alone, and the loop is restarted if it
+    ever crashes.
+    """
+
+    INSTANCE = None
+
+    def __init__(
+        self,
+        tick_interval: float = RUN_LOOP_INTERVAL,
+        max_catch_up_ticks: int = MAX_CATCH_UP_TICKS,
+    ):
+        self.tick_interval: float = tick_interval
+        self.max_catch_up_ticks: int = max_catch_up_ticks
+        self.arenas: dict[str, Arena] = {}
+        self.stats: TickStats = TickStats(tick_interval)
+        self.physics_engine = get_physics_engine()
+        self.bot_driver = get_bot_driver()
+        self.task: asyncio.Task[None] | None = None
+        self.last_tick_time: float = time.monotonic()
+
+    def add_arena(self, arena: Arena):
+        self.arenas[arena.id] = arena
+        self.__start()
+
+    def remove_arena(self, arena_id: str):
+        self.arenas.pop(arena_id, None)
+        self.bot_driver.remove_arena(arena_id)
+        SnapshotEncoder.release_arena(arena_id)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**self.stats.to_dict(), **self.bot_driver.get_stats()}
+
+    async def run(self):
+        next_tick = time.monotonic()
+        self.last_tick_time = next_tick
+        while self.arenas:
+            delay = next_tick - time.monotonic()
+            await asyncio.sleep(max(delay, 0))
+            await self.tick()
+            next_tick += self.tick_interval
+            late_ticks = int((time.monotonic() - next_tick) / self.tick_interval)
+            if late_ticks > self.max_catch_up_ticks:
+                skipped = late_ticks - self.max_catch_up_ticks
+                self.stats.skipped_ticks += skipped
+                next_tick += skipped * self.tick_interval
+                logger.warning("Tick scheduler is late: %s ticks skipped", skipped)
+
+    async def tick(self):
+        start = time.perf_counter()
+        now = time.monotonic()
+        elapsed, self.last_tick_time = now - self.last_tick_time, now
+        running_arenas: list[Arena] = []
+        for arena in list(self.arenas.values()):
+            try:
+                status = arena.get_status()
+                if status == GameStatus.DEAD:
+                    self.remove_arena(arena.id)
+                    continue
+                if status == GameStatus.STARTED and arena.advance_clock(elapsed):
+                    running_arenas.append(arena)
+            except Exception as e:  # pylint: disable=broad-except
+                self.__drop_arena(arena, e)
+        self.__step_physics(running_arenas)
+        updates = []
+        for arena in running_arenas:
+            if arena.id not in self.arenas:
+                continue  # Dropped
+            try:
+                self.bot_driver.play([arena], elapsed)
+                update = arena.collect_update()
+            except Exception as e:  # pylint: disable=broad-except
+                self.__drop_arena(arena, e)
+                continue
+            if update is not None:
+                updates.append(arena.send_update(update))
+        results = await asyncio.gather(*updates, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Arena update failed: %s", result)
+        self.stats.record(time.perf_counter() - start, len(self.arenas))
+
+    def __step_physics(self, arenas: list[Arena]):
+        arenas = [arena for arena in arenas if arena.needs_step()]
+        while arenas:
+            self.__step_arenas(arenas)
+            arenas = [
+                arena
+                for arena in arenas
+                if arena.id in self.arenas and arena.needs_step()
+            ]
+
+    def __step_arenas(self, arenas: list[Arena]):
+        """
+        Steps every arena exactly once, their games in one batch. An arena
+        failing at any stage is dropped alone, the others are not stepped
+        again.
+        """
+        moved_arenas: list[Arena] = []
+        for arena in arenas:
+            try:
+                arena.move_paddles()
+            except Exception as e:  # pylint: disable=broad-except
+                self.__drop_arena(arena, e)
+                continue
+            moved_arenas.append(arena)
+        collided_slots, failures = self.__step_games(
+            [arena.game for arena in moved_arenas]
+        )
+        for row, arena in enumerate(moved_arenas):
+            if row in failures:
+                self.__drop_arena(arena, failures[row])
+                continue
+            try:
+                arena.apply_step(collided_slots[row])
+            except Exception as e:  # pylint: disable=broad-except
+                self.__drop_arena(arena, e)
+
+    def __step_games(
+        self, games: list[Game]
+    ) -> tuple[list[int | None], dict[int, Exception]]:
+        """
+        Returns the collided slots of the games and the errors of the
+        games that could not be stepped, by row.
+        """
+        try:
+            return self.physics_engine.step(games, PHYSICS_STEP), {}
+        except PhysicsStepError as e:
+            return e.collided_slots, e.failures
+        except Exception as e:  # pylint: disable=broad-except
+            if len(games) == 1:
+                return [None], {0: e}
+        # No game was stepped: each one is stepped alone
+        collided_slots: list[int | None] = []
+        failures: dict[int, Exception] = {}
+        for row, game in enumerate(games):
+            (collided_slot,), game_failures = self.__step_games([game])
+            collided_slots.append(collided_slot)
+            if game_failures:
+                failures[row] = game_failures[0]
+        return collided_slots, failures
+
+    def __drop_arena(self, arena: Arena, error: Exception):
+        """
+        Takes a failing arena off the ticks and ends its game, so that its
+        lobby closes it. The other arenas keep playing.
+        """
+        logger.error("Arena %s failed: %s", arena.id, error, exc_info=error)
+        self.remove_arena(arena.id)
+        try:
+            arena.set_status(GameStatus.OVER)
+        except Exception as e:  # pylint: disable=broad-except
+            logger.error("Arena %s could not be ended: %s", arena.id, e)
+
+    def __start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+            self.task.add_done_callback(self.__on_task_done)
+
+    def __on_task_done(self, task: asyncio.Task[None]):
+        if task.cancelled() or task.exception() is None:
+            return
+        error = task.exception()
+        logger.error("Tick scheduler crashed: %s", error, exc_info=error)
+        if self.arenas:
+            self.__start()
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_tick_scheduler() -> TickScheduler:
+    return TickScheduler.get_instance()
@@ -0,0 +1,80 @@
+import logging
+import time
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+JSON_ENCODING = "json"
+BINARY_ENCODING = "binary"
+
+
+class EncodingTraffic:
+
+    def __init__(self):
+        self.bytes_sent: int = 0
+        self.frames_sent: int = 0
+        self.clients: set[str] = set()
+
+    def to_dict(self, elapsed: float) -> dict[str, Any]:
+        nb_clients = len(self.clients)
+        bytes_per_second = self.bytes_sent / elapsed if elapsed else 0
+        return {
+            "bytes_sent": self.bytes_sent,
+            "frames_sent": self.frames_sent,
+            "clients": nb_clients,
+            "bytes_per_frame": (
+                self.bytes_sent / self.frames_sent if self.frames_sent else 0
+            ),
+            "bytes_per_second": bytes_per_second,
+            "bytes_per_second_per_client": (
+                bytes_per_second / nb_clients if nb_clients else 0
+            ),
+        }
+
+
+class TrafficMeter:
+    """
+    Counts the game update bytes sent to websocket clients, per arena and
+    per encoding, so that the JSON and binary protocols can be compared.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.start_times: dict[str, float] = {}
+        self.traffic: dict[str, dict[str, EncodingTraffic]] = {}
+
+    def record(self, arena_id: str, encoding: str, client: str, nb_bytes: int):
+        if arena_id not in self.traffic:
+            self.start_times[arena_id] = time.monotonic()
+            self.traffic[arena_id] = {}
+        if encoding not in self.traffic[arena_id]:
+            self.traffic[arena_id][encoding] = EncodingTraffic()
+        encoding_traffic = self.traffic[arena_id][encoding]
+        encoding_traffic.bytes_sent += nb_bytes
+        encoding_traffic.frames_sent += 1
+        encoding_traffic.clients.add(client)
+
+    def remove_arena(self, arena_id: str):
+        self.start_times.pop(arena_id, None)
+        self.traffic.pop(arena_id, None)
+
+    def get_stats(self) -> dict[str, Any]:
+        now = time.monotonic()
+        return {
+            arena_id: {
+                encoding: encoding_traffic.to_dict(now - self.start_times[arena_id])
+                for encoding, encoding_traffic in arena_traffic.items()
+            }
+            for arena_id, arena_traffic in self.traffic.items()
+        }
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_traffic_meter() -> TrafficMeter:
+    return TrafficMeter.get_instance()
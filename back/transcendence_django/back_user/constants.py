@@ -27,3 +27,9 @@ FILTERS = [
     LOCAL,
     ONLINE,
 ]
+
+HISTORY_PAGE_SIZE = 4
+MAX_HISTORY_PAGE_SIZE = 100
+
+LEADERBOARD_PAGE_SIZE = 10
+MAX_LEADERBOARD_PAGE_SIZE = 100
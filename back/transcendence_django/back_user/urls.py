@@ -4,14 +4,19 @@ from .views import (
     UpdateUsernameView,
     UserDataView,
     get_game_summaries,
+    get_leaderboard_page,
+    get_leaderboard_rank,
     get_username,
     is_user_playing,
+    presence_write_stats,
     update_avatar,
     update_playing_status,
 )
 
 urlpatterns = [
     path("get_game_summaries/", get_game_summaries, name="get_game_summaries"),
+    path("leaderboard/", get_leaderboard_page, name="leaderboard"),
+    path("leaderboard_rank/", get_leaderboard_rank, name="leaderboard_rank"),
     path("get_username/", get_username, name="get_username"),
     path("user_data/", UserDataView.as_view(), name="user_data"),
     path("user_data/<int:pk>/", UserDataView.as_view(), name="user_data"),
@@ -19,4 +24,5 @@ urlpatterns = [
     path("update_avatar/", update_avatar, name="update_avatar"),
     path("is_user_playing/", is_user_playing, name="is_user_playing"),
     path("update_playing_status/", update_playing_status, name="update_playing_status"),
+    path("presence_write_stats/", presence_write_stats, name="presence_write_stats"),
 ]
@@ -1,24 +1,47 @@
+import base64
+import binascii
 import json
 import logging
+from datetime import datetime
 from http import HTTPStatus
 from json import JSONDecodeError
 from typing import Any, Dict
 
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
+from redis.exceptions import RedisError
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from shared_models.avatar_uploader import AvatarUploader
-from shared_models.models import CustomUser, Profile
+from shared_models.leaderboard import get_leaderboard
+from shared_models.models import (
+    CustomUser,
+    GameSummary,
+    HistoryEntry,
+    Profile,
+    UserStats,
+)
+from shared_models.presence_writes import get_presence_write_buffer
 from transcendence_django.dict_keys import USER_ID, IS_PLAYING
 
-from .constants import ALL, DEFAULT_COLORS, DEFAULT_SETTINGS, FILTERS, ONLINE
+from .constants import (
+    ALL,
+    DEFAULT_COLORS,
+    DEFAULT_SETTINGS,
+    FILTERS,
+    HISTORY_PAGE_SIZE,
+    LEADERBOARD_PAGE_SIZE,
+    MAX_HISTORY_PAGE_SIZE,
+    MAX_LEADERBOARD_PAGE_SIZE,
+    ONLINE,
+)
 
 # pylint: disable=no-member
 
@@ -70,13 +93,14 @@ class UserDataView(APIView):
             )
             user.profile = profile
             user.save()
+        stats = UserStats.get_for_user(user)
         user_data = {
             "id": user_id,
             "username": user.username,
             "email": user.email,
-            "game_counter": user.game_counter,
-            "win_dict": user.win_loss_tie,
-            "time_played": user.time_played,
+            "game_counter": stats.get_game_counter(),
+            "win_dict": stats.get_win_loss_tie(),
+            "time_played": stats.get_time_played(),
             "color_config": profile.color_config,
             "game_settings": profile.game_settings,
         }
@@ -117,28 +141,61 @@ class UserDataView(APIView):
         return Response({"status": "success"}, status=HTTPStatus.OK)
 
 
-def get_history(
-    user_id: int, start_index: int, end_index: int, filter_by: str
-) -> dict[str, Any]:
-    user = CustomUser.objects.get(pk=user_id)
-    summaries = user.game_summaries.values()
-    if filter_by != ALL:
-        remote_filter = filter_by == ONLINE
-        summaries = summaries.filter(is_remote=remote_filter)
+def encode_history_cursor(end_time: datetime, summary_id: int) -> str:
+    position = [end_time.isoformat(), summary_id]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
 
-    history_size = summaries.count()
-    has_more = end_index < history_size
 
-    # Adjust end_index if it exceeds history_size
-    end_index = min(end_index, history_size)
-
-    # Calculate the correct indices for slicing without reversing
-    actual_start_index = history_size - end_index
-    actual_end_index = history_size - start_index
+def decode_history_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        end_time, summary_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(end_time), int(summary_id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+        raise ValueError("Invalid 'cursor'.") from e
 
-    sliced_summaries = list(summaries[actual_start_index:actual_end_index][::-1])
 
-    return {"has_more": has_more, "summaries": sliced_summaries}
+def get_history(
+    user_id: int, cursor: str | None, limit: int, filter_by: str
+) -> dict[str, Any]:
+    """
+    Returns a page of the user's history, newest first, starting after the
+    cursor returned with the previous page. Pages are seeked on
+    (end_time, id) in the history entries of the user, so every page is one
+    range of their index and costs the same.
+    """
+    if not CustomUser.objects.filter(pk=user_id).exists():
+        raise CustomUser.DoesNotExist
+    entries = HistoryEntry.objects.filter(user_id=user_id)
+    if filter_by != ALL:
+        entries = entries.filter(is_remote=filter_by == ONLINE)
+    if cursor is not None:
+        end_time, summary_id = decode_history_cursor(cursor)
+        # The bound on end_time alone is what the index scan starts from
+        same_time = Q(end_time=end_time, game_summary_id__lt=summary_id)
+        entries = entries.filter(end_time__lte=end_time).filter(
+            Q(end_time__lt=end_time) | same_time
+        )
+    # The cursor comes from the entries: the end_time of a summary may change
+    rows = list(
+        entries.order_by("-end_time", "-game_summary_id").values_list(
+            "end_time", "game_summary_id"
+        )[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    summaries = {
+        summary["id"]: summary
+        for summary in GameSummary.objects.filter(
+            id__in=[summary_id for _, summary_id in rows]
+        ).values()
+    }
+    # Skips the summaries deleted since the entries were read
+    page = [summaries[summary_id] for _, summary_id in rows if summary_id in summaries]
+    return {
+        "has_more": has_more,
+        "summaries": page,
+        "next_cursor": encode_history_cursor(*rows[-1]) if has_more else None,
+    }
 
 
 @require_http_methods(["POST"])
@@ -147,20 +204,22 @@ def get_game_summaries(request) -> JsonResponse:
     try:
         data = json.loads(request.body.decode("utf-8"))
         user_id = data.get(USER_ID)
-        start_index = data.get("start_index", 0)
-        end_index = data.get("end_index", -1)
+        cursor = data.get("cursor")
+        limit = data.get("limit", HISTORY_PAGE_SIZE)
         filter_by = data.get("filter")
 
-        if not isinstance(start_index, int) or not isinstance(end_index, int):
-            raise TypeError("'start_index' and 'end_index' must be integers.")
-        if start_index < 0 or end_index < 0 or start_index >= end_index:
+        if cursor is not None and not isinstance(cursor, str):
+            raise TypeError("'cursor' must be a string.")
+        if not isinstance(limit, int):
+            raise TypeError("'limit' must be an integer.")
+        if not 0 < limit <= MAX_HISTORY_PAGE_SIZE:
             raise ValueError(
-                "Ensure 'start_index' is non-negative and less than 'end_index'."
+                f"Ensure 'limit' is between 1 and {MAX_HISTORY_PAGE_SIZE}."
             )
         if filter_by not in FILTERS:
             raise ValueError("Invalid 'filter'. Must be one of " + str(FILTERS) + ".")
 
-        history = get_history(user_id, start_index, end_index, filter_by)
+        history = get_history(user_id, cursor, limit, filter_by)
         return JsonResponse(history, safe=False)
     except CustomUser.DoesNotExist:
         return JsonResponse(
@@ -172,6 +231,55 @@ def get_game_summaries(request) -> JsonResponse:
         )
 
 
+@require_http_methods(["GET"])
+@csrf_protect
+def get_leaderboard_page(request) -> JsonResponse:
+    try:
+        limit = int(request.GET.get("limit", LEADERBOARD_PAGE_SIZE))
+        offset = int(request.GET.get("offset", 0))
+        if not 0 < limit <= MAX_LEADERBOARD_PAGE_SIZE:
+            raise ValueError(
+                f"Ensure 'limit' is between 1 and {MAX_LEADERBOARD_PAGE_SIZE}."
+            )
+        if offset < 0:
+            raise ValueError("'offset' must not be negative.")
+        players = get_leaderboard().get_top(limit, offset)
+        return JsonResponse({"players": players}, status=HTTPStatus.OK)
+    except ValueError as e:
+        return JsonResponse(
+            {"error": "Invalid request data: " + str(e)}, status=HTTPStatus.BAD_REQUEST
+        )
+    except RedisError as e:
+        logger.error("Leaderboard unavailable: %s", e)
+        return JsonResponse(
+            {"error": "Leaderboard unavailable."},
+            status=HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+
+
+@require_http_methods(["GET"])
+@csrf_protect
+def get_leaderboard_rank(request) -> JsonResponse:
+    try:
+        user_id = int(request.GET.get(USER_ID, ""))
+        rank = get_leaderboard().get_rank(user_id)
+        if rank is None:
+            return JsonResponse(
+                {"error": "User is not ranked."}, status=HTTPStatus.NOT_FOUND
+            )
+        return JsonResponse(rank, status=HTTPStatus.OK)
+    except ValueError as e:
+        return JsonResponse(
+            {"error": "Invalid request data: " + str(e)}, status=HTTPStatus.BAD_REQUEST
+        )
+    except RedisError as e:
+        logger.error("Leaderboard unavailable: %s", e)
+        return JsonResponse(
+            {"error": "Leaderboard unavailable."},
+            status=HTTPStatus.SERVICE_UNAVAILABLE,
+        )
+
+
 @method_decorator(csrf_protect, name="dispatch")
 @method_decorator(login_required, name="dispatch")
 class UpdateUsernameView(APIView):
@@ -269,22 +377,31 @@ def get_username(request) -> JsonResponse:
 
 @require_http_methods(["GET"])
 def update_playing_status(request) -> JsonResponse:
+    """
+    Takes the playing status of one or more users, as repeated user_id and
+    is_playing parameters. The statuses are written in the background;
+    unknown users are ignored.
+    """
     try:
-        user_id = request.GET.get(USER_ID)
-        is_playing = request.GET.get(IS_PLAYING)
+        user_ids = request.GET.getlist(USER_ID)
+        statuses = request.GET.getlist(IS_PLAYING)
 
-        if not user_id or not is_playing:
+        if not user_ids or len(user_ids) != len(statuses):
             return JsonResponse(
                 {"error": "user_id or is_playing parameter is missing"},
                 status=HTTPStatus.BAD_REQUEST
             )
 
-        user = CustomUser.objects.get(pk=user_id)
-        user.is_playing = bool(int(is_playing))
-        logger.info("New playing status: " + str(is_playing))
-        user.save()
+        presence_write_buffer = get_presence_write_buffer()
+        for user_id, is_playing in zip(user_ids, statuses):
+            presence_write_buffer.set_playing(int(user_id), bool(int(is_playing)))
         return JsonResponse({"message": "playing status updated"}, status=status.HTTP_200_OK)
-    except CustomUser.DoesNotExist:
+    except ValueError as e:
         return JsonResponse(
-            {"error": "User does not exist."}, status=HTTPStatus.NOT_FOUND
+            {"error": "Invalid request data: " + str(e)}, status=HTTPStatus.BAD_REQUEST
         )
+
+
+@require_http_methods(["GET"])
+def presence_write_stats(_request) -> JsonResponse:
+    return JsonResponse(get_presence_write_buffer().get_stats(), status=HTTPStatus.OK)
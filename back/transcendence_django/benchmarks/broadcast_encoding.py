@@ -0,0 +1,177 @@
+"""
+Benchmark of the encoding of tick updates broadcast to the consumers of
+one lobby, for JSON and binary snapshot clients.
+
+Compares encoding the update in every consumer, as done before updates
+carried their shared encoding, with encoding it once per broadcast, with
+json and with orjson. Reports the encoding time per broadcast and the
+latency from send to the last consumer socket write. Deliveries go
+through the in-process fan-out, so the in-memory channel layer is swapped
+in for the consumers' own subscriptions.
+
+Usage, from back/transcendence_django:
+    python -m benchmarks.broadcast_encoding [nb_updates]
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import django
+from django.conf import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transcendence_django.settings")
+django.setup()
+settings.CHANNEL_LAYERS = {
+    "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+}
+
+# pylint: disable=wrong-import-position
+from back_game.app_settings import update_encoder  # noqa: E402
+from back_game.app_settings.local_groups import get_local_groups  # noqa: E402
+from back_game.app_settings.routing import websocket_urlpatterns  # noqa: E402
+from back_game.app_settings.snapshot_encoder import (  # noqa: E402
+    BINARY_SUBPROTOCOL,
+    SnapshotEncoder,
+)
+from back_game.monitor.monitor import get_monitor  # noqa: E402
+from channels.routing import URLRouter  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+from transcendence_django.dict_keys import (  # noqa: E402
+    AI_OPPONENTS_LOCAL,
+    AI_OPPONENTS_ONLINE,
+    ARENA_ID,
+    BALL,
+    ENCODED_UPDATE,
+    HUMAN_OPPONENTS_LOCAL,
+    HUMAN_OPPONENTS_ONLINE,
+    IS_REMOTE,
+    NB_PLAYERS,
+    OPTIONS,
+    PADDLE,
+    POSITION,
+    SLOT,
+    STATUS,
+    TYPE,
+    UPDATE,
+)
+
+SUBSCRIBER_COUNTS = (2, 4, 8)
+ENCODERS = (update_encoder.JSON_ENCODER, update_encoder.ORJSON_ENCODER)
+
+
+def get_players_specs(nb_players: int) -> dict:
+    return {
+        NB_PLAYERS: nb_players,
+        IS_REMOTE: "online",
+        OPTIONS: {
+            "paddle_size": 2,
+            "ball_speed": 2,
+            "is_private": False,
+            HUMAN_OPPONENTS_LOCAL: 0,
+            HUMAN_OPPONENTS_ONLINE: nb_players,
+            AI_OPPONENTS_LOCAL: 0,
+            AI_OPPONENTS_ONLINE: 0,
+        },
+    }
+
+
+def get_update(index: int) -> dict:
+    update = {
+        ARENA_ID: "1",
+        BALL: {POSITION: {"x": index % 1000, "y": 400.5}},
+        STATUS: 3,
+    }
+    if index % 4 == 0:
+        update[PADDLE] = {SLOT: 1, POSITION: {"x": 50, "y": index % 800}}
+    return update
+
+
+def encode_per_consumer(update: dict, encoders: list) -> None:
+    for encoder in encoders:
+        message = update
+        if encoder is not None:
+            _, message = encoder.encode(update)
+        if message:
+            update_encoder.dumps({TYPE: "game_update", UPDATE: message})
+
+
+def encode_shared(update: dict, encoders: list) -> None:
+    encoded_update = update_encoder.EncodedUpdate(update)
+    for encoder in encoders:
+        message = update
+        if encoder is not None:
+            _, message = encoder.encode(update, encoded_update.snapshot_cache)
+        if message:
+            encoded_update.get_text(message)
+
+
+def time_encoding(encode, nb_subscribers: int, binary: bool, nb_updates: int):
+    encoders = [SnapshotEncoder() if binary else None for _ in range(nb_subscribers)]
+    start = time.perf_counter_ns()
+    for index in range(nb_updates):
+        encode(get_update(index), encoders)
+    return (time.perf_counter_ns() - start) / nb_updates / 1000
+
+
+async def time_delivery(
+    communicators, group: str, shared: bool, nb_updates: int
+) -> float:
+    latencies = []
+    for index in range(nb_updates):
+        update = get_update(index)
+        message = {TYPE: "game_update", UPDATE: update}
+        if shared:
+            message[ENCODED_UPDATE] = update_encoder.EncodedUpdate(update)
+        start = time.perf_counter_ns()
+        await get_local_groups().group_send(group, message)
+        for communicator in communicators:
+            await communicator.receive_output(1)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+    return statistics.median(latencies)
+
+
+async def run(nb_subscribers: int, binary: bool, nb_updates: int):
+    application = URLRouter(websocket_urlpatterns)
+    lobby = await get_monitor().lobby_manager.create_new_lobby(
+        -nb_subscribers - 100 * binary, get_players_specs(2)
+    )
+    group = f"game_{lobby.id}"
+    subprotocols = [BINARY_SUBPROTOCOL] if binary else None
+    communicators = [
+        WebsocketCommunicator(
+            application, f"/ws/game/classic/{lobby.id}/", subprotocols=subprotocols
+        )
+        for _ in range(nb_subscribers)
+    ]
+    for communicator in communicators:
+        await communicator.connect()
+
+    client = "binary" if binary else "json"
+    for encoder_name in ENCODERS:
+        update_encoder.dumps = update_encoder.get_json_dumps(encoder_name)
+        for shared, encode in ((False, encode_per_consumer), (True, encode_shared)):
+            encoding = time_encoding(encode, nb_subscribers, binary, nb_updates)
+            await time_delivery(communicators, group, shared, 20)
+            delivery = await time_delivery(communicators, group, shared, nb_updates)
+            path = "once per arena" if shared else "per consumer"
+            print(
+                f"{nb_subscribers} {client:6} subscribers, {encoder_name:6} "
+                f"{path:14}: encoding {encoding:6.1f} us, "
+                f"delivery median {delivery:7.1f} us"
+            )
+    for communicator in communicators:
+        await communicator.disconnect()
+
+
+async def main():
+    nb_updates = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for nb_subscribers in SUBSCRIBER_COUNTS:
+        for binary in (False, True):
+            await run(nb_subscribers, binary, nb_updates)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
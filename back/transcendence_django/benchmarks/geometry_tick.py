@@ -0,0 +1,113 @@
+"""
+Micro-benchmark of the per-object physics step.
+
+Reports the time per tick, the geometry objects created per tick and the
+peak of transient heap memory within a tick, as seen by tracemalloc.
+
+Usage, from back/transcendence_django:
+    python -m benchmarks.geometry_tick [nb_games] [nb_ticks]
+"""
+
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transcendence_django.settings")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from back_game.game_arena.game import Game  # noqa: E402
+from back_game.game_geometry.edges import Edges  # noqa: E402
+from back_game.game_geometry.position import Position  # noqa: E402
+from back_game.game_settings.game_constants import PHYSICS_STEP  # noqa: E402
+from transcendence_django.dict_keys import NB_PLAYERS, OPTIONS  # noqa: E402
+
+GAME_OPTIONS = {"paddle_size": 2, "ball_speed": 2, "is_private": False}
+
+
+class AllocationCounter:
+    """
+    Counts the geometry objects created, by wrapping their constructors.
+    """
+
+    def __init__(self, *classes):
+        self.count = 0
+        self.originals = {cls: cls.__init__ for cls in classes}
+
+    def __enter__(self):
+        for cls, original in self.originals.items():
+            cls.__init__ = self.__wrap(original)
+        return self
+
+    def __exit__(self, *exc):
+        for cls, original in self.originals.items():
+            cls.__init__ = original
+
+    def __wrap(self, original):
+        def init(instance, *args, **kwargs):
+            self.count += 1
+            original(instance, *args, **kwargs)
+
+        return init
+
+
+def create_games(nb_games: int) -> list[Game]:
+    random.seed(0)
+    return [Game({NB_PLAYERS: 2, OPTIONS: dict(GAME_OPTIONS)}) for _ in range(nb_games)]
+
+
+def track_ball(game: Game):
+    for paddle in game.paddles.values():
+        paddle.rate = min(max((game.ball.position.y - 50) / 700, 0), 1)
+        paddle.move(0)
+
+
+def run_ticks(games: list[Game], nb_ticks: int):
+    for tick in range(nb_ticks):
+        for game in games:
+            if tick % 8 == 0:
+                track_ball(game)
+            try:
+                game.update(PHYSICS_STEP)
+            except ValueError:
+                pass
+
+
+def main():
+    nb_games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    nb_ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    games = create_games(nb_games)
+    run_ticks(games, 100)
+    start = time.perf_counter_ns()
+    run_ticks(games, nb_ticks)
+    elapsed = time.perf_counter_ns() - start
+
+    games = create_games(nb_games)
+    with AllocationCounter(Position, Edges) as counter:
+        run_ticks(games, nb_ticks)
+
+    games = create_games(nb_games)
+    run_ticks(games, 100)
+    tracemalloc.start()
+    peak = 0
+    for _ in range(nb_ticks // 10):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        run_ticks(games, 1)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+    tracemalloc.stop()
+
+    game_ticks = nb_games * nb_ticks
+    print(f"games: {nb_games}, ticks: {nb_ticks}")
+    print(f"ns per game tick:              {elapsed / game_ticks:.0f}")
+    print(f"geometry objects per game tick: {counter.count / game_ticks:.3f}")
+    print(f"peak transient bytes per tick:  {peak}")
+
+
+if __name__ == "__main__":
+    main()
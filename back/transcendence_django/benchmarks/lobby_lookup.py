@@ -0,0 +1,110 @@
+"""
+Benchmark of the user and matchmaking lookups of the LobbyManager with
+many live lobbies, against a scan of all the lobbies.
+
+Every lobby but the newest holds two users, so matchmaking only finds a
+free slot in the newest one. The full lobbies are dropped from the free
+slot index by the first matchmaking lookup, which is reported apart.
+
+Usage, from back/transcendence_django:
+    python -m benchmarks.lobby_lookup [nb_lobbies] [nb_lookups]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transcendence_django.settings")
+django.setup()
+
+# pylint: disable=wrong-import-position
+from back_game.monitor.lobby.classic_lobby import ClassicLobby  # noqa: E402
+from back_game.monitor.lobby_manager import LobbyManager  # noqa: E402
+from transcendence_django.dict_keys import (  # noqa: E402
+    AI_OPPONENTS_LOCAL,
+    AI_OPPONENTS_ONLINE,
+    HUMAN_OPPONENTS_LOCAL,
+    HUMAN_OPPONENTS_ONLINE,
+    IS_REMOTE,
+    NB_PLAYERS,
+    OPTIONS,
+)
+
+PLAYERS_SPECS = {
+    NB_PLAYERS: 2,
+    IS_REMOTE: "online",
+    OPTIONS: {
+        "paddle_size": 2,
+        "ball_speed": 2,
+        "is_private": False,
+        HUMAN_OPPONENTS_LOCAL: 0,
+        HUMAN_OPPONENTS_ONLINE: 2,
+        AI_OPPONENTS_LOCAL: 0,
+        AI_OPPONENTS_ONLINE: 0,
+    },
+}
+
+
+def scan_lobby_from_user_id(manager: LobbyManager, user_id: int):
+    for lobby in manager.lobbies.values():
+        if user_id in lobby.users:
+            return lobby
+    return None
+
+
+def scan_available_lobby(manager: LobbyManager, user_id: int):
+    for lobby in manager.lobbies.values():
+        if not lobby.is_tournament():
+            available_arena = lobby.get_available_arena(user_id)
+            if available_arena:
+                return {"lobby_id": lobby.id, "arena": available_arena.to_dict()}
+    return None
+
+
+async def create_lobbies(manager: LobbyManager, nb_lobbies: int):
+    for index in range(nb_lobbies):
+        lobby = ClassicLobby(PLAYERS_SPECS)
+        manager.lobbies[lobby.id] = lobby
+        arena_id = next(iter(lobby.arenas))
+        nb_users = 1 if index == nb_lobbies - 1 else 2
+        for user in range(nb_users):
+            await lobby.add_user_into_arena(index * 2 + user, arena_id)
+
+
+def time_lookup(lookup, nb_lookups: int) -> tuple[float, float]:
+    start = time.perf_counter_ns()
+    lookup(0)
+    first = (time.perf_counter_ns() - start) / 1000
+    start = time.perf_counter_ns()
+    for index in range(nb_lookups):
+        lookup(index)
+    return first, (time.perf_counter_ns() - start) / nb_lookups / 1000
+
+
+async def main():
+    nb_lobbies = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    nb_lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    manager = LobbyManager()
+    await create_lobbies(manager, nb_lobbies)
+    last_user = nb_lobbies * 2 - 2
+    new_user = nb_lobbies * 2
+
+    lookups = {
+        "user -> lobby, scan": lambda _: scan_lobby_from_user_id(manager, last_user),
+        "user -> lobby, index": lambda _: manager.get_lobby_from_user_id(last_user),
+        "matchmaking, scan": lambda _: scan_available_lobby(manager, new_user),
+        "matchmaking, index": lambda _: manager.join_already_created_lobby(
+            new_user, True
+        ),
+    }
+    print(f"lobbies: {nb_lobbies}")
+    for name, lookup in lookups.items():
+        first, average = time_lookup(lookup, nb_lookups)
+        print(f"{name:20}: first {first:9.2f} us, then {average:9.2f} us")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
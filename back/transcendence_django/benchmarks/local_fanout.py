@@ -0,0 +1,164 @@
+"""
+Benchmark of tick update delivery to the consumers of one lobby, through
+the channel layer and through the in-process fan-out.
+
+Reports the latency from send to the last consumer socket write, and the
+channel layer operations done per update: one group_send on the sender
+side and one receive per member on the consumer side.
+
+Usage, from back/transcendence_django:
+    python -m benchmarks.local_fanout [memory|settings] [nb_updates]
+"memory" (default) swaps in the in-memory channel layer, "settings" uses
+the configured one, i.e. Redis inside the docker stack.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import django
+from django.conf import settings
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "transcendence_django.settings")
+django.setup()
+if (sys.argv[1] if len(sys.argv) > 1 else "memory") == "memory":
+    settings.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+
+# pylint: disable=wrong-import-position
+from back_game.app_settings.local_groups import get_local_groups  # noqa: E402
+from back_game.app_settings.routing import websocket_urlpatterns  # noqa: E402
+from back_game.monitor.monitor import get_monitor  # noqa: E402
+from channels.layers import get_channel_layer  # noqa: E402
+from channels.routing import URLRouter  # noqa: E402
+from channels.testing import WebsocketCommunicator  # noqa: E402
+from transcendence_django.dict_keys import (  # noqa: E402
+    AI_OPPONENTS_LOCAL,
+    AI_OPPONENTS_ONLINE,
+    ARENA_ID,
+    BALL,
+    HUMAN_OPPONENTS_LOCAL,
+    HUMAN_OPPONENTS_ONLINE,
+    IS_REMOTE,
+    NB_PLAYERS,
+    OPTIONS,
+    POSITION,
+    STATUS,
+    TYPE,
+    UPDATE,
+)
+
+SUBSCRIBER_COUNTS = (2, 4, 8)
+
+
+def get_players_specs(nb_players: int) -> dict:
+    return {
+        NB_PLAYERS: nb_players,
+        IS_REMOTE: "online",
+        OPTIONS: {
+            "paddle_size": 2,
+            "ball_speed": 2,
+            "is_private": False,
+            HUMAN_OPPONENTS_LOCAL: 0,
+            HUMAN_OPPONENTS_ONLINE: nb_players,
+            AI_OPPONENTS_LOCAL: 0,
+            AI_OPPONENTS_ONLINE: 0,
+        },
+    }
+
+
+class LayerCounter:
+    """
+    Counts the channel layer group_send and receive calls.
+    """
+
+    def __init__(self, layer):
+        self.layer = layer
+        self.group_sends = 0
+        self.receives = 0
+        self.group_send = layer.group_send
+        self.receive = layer.receive
+        layer.group_send = self.__count_group_send
+        layer.receive = self.__count_receive
+
+    async def __count_group_send(self, *args, **kwargs):
+        self.group_sends += 1
+        return await self.group_send(*args, **kwargs)
+
+    async def __count_receive(self, *args, **kwargs):
+        self.receives += 1
+        return await self.receive(*args, **kwargs)
+
+    def reset(self):
+        self.group_sends = 0
+        self.receives = 0
+
+
+async def measure(send, communicators, group: str, nb_updates: int) -> list[float]:
+    latencies = []
+    for index in range(nb_updates):
+        update = {
+            TYPE: "game_update",
+            UPDATE: {
+                ARENA_ID: "1",
+                BALL: {POSITION: {"x": index % 1000, "y": 400}},
+                STATUS: 3,
+            },
+        }
+        start = time.perf_counter_ns()
+        await send(group, update)
+        for communicator in communicators:
+            await communicator.receive_output(1)
+        latencies.append((time.perf_counter_ns() - start) / 1000)
+    return latencies
+
+
+async def run(nb_subscribers: int, nb_updates: int, counter: LayerCounter):
+    application = URLRouter(websocket_urlpatterns)
+    lobby = await get_monitor().lobby_manager.create_new_lobby(
+        -nb_subscribers, get_players_specs(2)
+    )
+    group = f"game_{lobby.id}"
+    communicators = [
+        WebsocketCommunicator(application, f"/ws/game/classic/{lobby.id}/")
+        for _ in range(nb_subscribers)
+    ]
+    for communicator in communicators:
+        await communicator.connect()
+
+    results = {}
+    for path, send in (
+        ("channel layer", counter.layer.group_send),
+        ("local fan-out", get_local_groups().group_send),
+    ):
+        await measure(send, communicators, group, 20)
+        counter.reset()
+        latencies = await measure(send, communicators, group, nb_updates)
+        results[path] = (
+            statistics.median(latencies),
+            sorted(latencies)[int(len(latencies) * 0.99) - 1],
+            (counter.group_sends + counter.receives) / nb_updates,
+        )
+    for communicator in communicators:
+        await communicator.disconnect()
+
+    for path, (median, p99, layer_ops) in results.items():
+        print(
+            f"{nb_subscribers} subscribers, {path:13}: "
+            f"median {median:7.1f} us, p99 {p99:7.1f} us, "
+            f"layer ops per update {layer_ops:.1f}"
+        )
+
+
+async def main():
+    nb_updates = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    counter = LayerCounter(get_channel_layer())
+    for nb_subscribers in SUBSCRIBER_COUNTS:
+        await run(nb_subscribers, nb_updates, counter)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
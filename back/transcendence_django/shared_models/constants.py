@@ -4,4 +4,26 @@ DEFAULT_TIME_PLAYED = {LOCAL: 0, REMOTE: 0, TOTAL: 0}
 DEFAULT_GAME_COUNTER = {LOCAL: 0, REMOTE: 0, TOTAL: 0}
 DEFAULT_WIN_LOSS_TIE = {WIN: 0, LOSS: 0, TIE: 0, TOTAL: 0}
 
-TIME_OUT_ONLINE=5
\ No newline at end of file
+FRIENDS_PRESENCE_KEY = "friends_presence:{}"
+FRIENDS_PRESENCE_TTL = 10  # seconds
+
+# Presence
+PRESENCE_KEY = "presence:{}"
+PRESENCE_DEADLINES_KEY = "presence:deadlines"
+PRESENCE_GROUP = "presence_{}"
+PRESENCE_TTL = 60  # seconds without heartbeat before a connection expires
+PRESENCE_SWEEP_INTERVAL = 15  # seconds
+PRESENCE_SWEEP_BATCH_SIZE = 100
+PRESENCE_WRITE_WINDOW = 1  # seconds the playing and last seen writes are held
+PRESENCE_WRITE_BATCH_SIZE = 500
+
+# Leaderboard
+INITIAL_RATING = 1500.0
+RATING_K_FACTOR = 32
+RATING_SCALE = 400
+LEADERBOARD_KEY = "leaderboard:ratings"
+LEADERBOARD_USERNAMES_KEY = "leaderboard:usernames"
+# Ratings replayed by the last reconciliation, up to the summary id
+LEADERBOARD_RECONCILED_KEY = "leaderboard:reconciled"
+LEADERBOARD_RECONCILED_ID_KEY = "leaderboard:reconciled_id"
+LEADERBOARD_BATCH_SIZE = 1000
@@ -0,0 +1,349 @@
+import logging
+from itertools import combinations, groupby
+from typing import Any, Iterable, Iterator
+
+from django.db import transaction
+from django.db.models import QuerySet
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from shared_models.constants import (
+    INITIAL_RATING,
+    LEADERBOARD_BATCH_SIZE,
+    LEADERBOARD_KEY,
+    LEADERBOARD_RECONCILED_ID_KEY,
+    LEADERBOARD_RECONCILED_KEY,
+    LEADERBOARD_USERNAMES_KEY,
+    RATING_K_FACTOR,
+    RATING_SCALE,
+)
+from shared_models.models import CustomUser, GameSummary, UserStats
+from transcendence_django.dict_keys import USER_ID
+
+logger = logging.getLogger(__name__)
+
+# pylint: disable=no-member
+
+
+def get_expected_score(rating: float, opponent_rating: float) -> float:
+    return 1 / (1 + 10 ** ((opponent_rating - rating) / RATING_SCALE))
+
+
+def get_score(user_id: int, opponent_id: int, winner_user_id: Any) -> float:
+    if winner_user_id is not None:
+        if str(winner_user_id) == str(user_id):
+            return 1.0
+        if str(winner_user_id) == str(opponent_id):
+            return 0.0
+    return 0.5
+
+
+def rate_game(ratings: dict[int, float], user_ids: list[int], winner_user_id: Any):
+    """
+    Updates the Elo ratings of the players of one game, rated as a match
+    between every pair of them against their ratings before the game.
+    """
+    deltas = dict.fromkeys(user_ids, 0.0)
+    for user_id, opponent_id in combinations(user_ids, 2):
+        expected = get_expected_score(ratings[user_id], ratings[opponent_id])
+        score = get_score(user_id, opponent_id, winner_user_id)
+        delta = RATING_K_FACTOR * (score - expected)
+        deltas[user_id] += delta
+        deltas[opponent_id] -= delta
+    for user_id, delta in deltas.items():
+        ratings[user_id] += delta
+
+
+def group_games(
+    links: Iterable[tuple[int, int, Any]],
+) -> Iterator[tuple[int, list[int], Any]]:
+    """
+    Groups the (summary id, user id, winner) links ordered by summary id
+    into the summary id, the user ids and the winner of each game.
+    """
+    for summary_id, game_links in groupby(links, key=lambda link: link[0]):
+        game_links = list(game_links)
+        yield summary_id, [user_id for _, user_id, _ in game_links], game_links[0][2]
+
+
+def replay_games(
+    ratings: dict[int, float], games: Iterable[tuple[int, list[int], Any]]
+) -> int | None:
+    """
+    Rates the games in order on top of the ratings, the new players
+    starting at INITIAL_RATING. Returns the summary id of the last game.
+    """
+    last_summary_id = None
+    for last_summary_id, user_ids, winner_user_id in games:
+        if len(user_ids) < 2:
+            continue
+        for user_id in user_ids:
+            ratings.setdefault(user_id, INITIAL_RATING)
+        rate_game(ratings, user_ids, winner_user_id)
+    return last_summary_id
+
+
+class Leaderboard:
+    """
+    Ratings of the players of online games. UserStats.rating is the source
+    of truth, updated in the transaction writing the games; a Redis sorted
+    set mirrors it once committed and serves every read. Whatever the
+    sorted set missed is restored by the periodic reconciliation, which
+    replays the games written since the last one from the database.
+    """
+
+    INSTANCE = None
+
+    def rate_games(self, user_summaries: list[tuple[list[int], GameSummary]]):
+        """
+        Rates the online games played by more than one user, in order. Must
+        run in the transaction writing them, after their users' stats exist.
+        """
+        games = [
+            (user_ids, game_summary)
+            for user_ids, game_summary in user_summaries
+            if game_summary.is_remote and len(user_ids) > 1
+        ]
+        if not games:
+            return
+        stats: dict[int, UserStats] = {
+            user_stats.user_id: user_stats
+            for user_stats in UserStats.objects.select_for_update(of=("self",))
+            .select_related("user")
+            .only("user_id", "rating", "user__username")
+            .filter(
+                user_id__in={user_id for user_ids, _ in games for user_id in user_ids}
+            )
+        }
+        ratings = {user_id: user_stats.rating for user_id, user_stats in stats.items()}
+        for user_ids, game_summary in games:
+            user_ids = [user_id for user_id in user_ids if user_id in ratings]
+            if len(user_ids) > 1:
+                rate_game(ratings, user_ids, game_summary.winner_user_id)
+        for user_id, user_stats in stats.items():
+            user_stats.rating = ratings[user_id]
+        UserStats.objects.bulk_update(stats.values(), ["rating"])
+        entries = {
+            user_id: (user_stats.user.username, user_stats.rating)
+            for user_id, user_stats in stats.items()
+        }
+        transaction.on_commit(lambda: self.publish(entries))
+
+    def publish(self, entries: dict[int, tuple[str, float]]):
+        try:
+            pipeline = get_redis_connection("default").pipeline()
+            pipeline.zadd(
+                LEADERBOARD_KEY,
+                {user_id: rating for user_id, (_, rating) in entries.items()},
+            )
+            pipeline.hset(
+                LEADERBOARD_USERNAMES_KEY,
+                mapping={
+                    user_id: username for user_id, (username, _) in entries.items()
+                },
+            )
+            pipeline.execute()
+        except RedisError as e:
+            logger.warning(
+                "Leaderboard update of %s players left to the reconciliation: %s",
+                len(entries),
+                e,
+            )
+
+    def get_top(self, limit: int, offset: int = 0) -> list[dict[str, Any]]:
+        redis = get_redis_connection("default")
+        entries = redis.zrevrange(
+            LEADERBOARD_KEY, offset, offset + limit - 1, withscores=True
+        )
+        if not entries:
+            return []
+        usernames = redis.hmget(
+            LEADERBOARD_USERNAMES_KEY, [user_id for user_id, _ in entries]
+        )
+        return [
+            {
+                "rank": offset + index + 1,
+                USER_ID: int(user_id),
+                "username": username.decode() if username is not None else None,
+                "rating": round(rating),
+            }
+            for index, ((user_id, rating), username) in enumerate(
+                zip(entries, usernames)
+            )
+        ]
+
+    def get_rank(self, user_id: int) -> dict[str, Any] | None:
+        pipeline = get_redis_connection("default").pipeline(transaction=False)
+        pipeline.zrevrank(LEADERBOARD_KEY, user_id)
+        pipeline.zscore(LEADERBOARD_KEY, user_id)
+        pipeline.zcard(LEADERBOARD_KEY)
+        rank, rating, nb_players = pipeline.execute()
+        if rank is None:
+            return None
+        return {
+            "rank": rank + 1,
+            USER_ID: user_id,
+            "rating": round(rating),
+            "players": nb_players,
+        }
+
+    def rename_player(self, user_id: int, username: str):
+        try:
+            redis = get_redis_connection("default")
+            if redis.hexists(LEADERBOARD_USERNAMES_KEY, user_id):
+                redis.hset(LEADERBOARD_USERNAMES_KEY, user_id, username)
+        except RedisError as e:
+            logger.warning("Leaderboard rename of user %s failed: %s", user_id, e)
+
+    def remove_player(self, user_id: int):
+        try:
+            pipeline = get_redis_connection("default").pipeline()
+            pipeline.zrem(LEADERBOARD_KEY, user_id)
+            pipeline.hdel(LEADERBOARD_USERNAMES_KEY, user_id)
+            pipeline.execute()
+        except RedisError as e:
+            logger.warning("Leaderboard removal of user %s failed: %s", user_id, e)
+
+    def is_built(self) -> bool:
+        return bool(get_redis_connection("default").exists(LEADERBOARD_KEY))
+
+    def reconcile(self, full: bool = False) -> int:
+        """
+        Replays the online games written since the last reconciliation, in
+        the order they were written, on top of the ratings it left. Saves
+        the ratings that drifted and mirrors them in the sorted set.
+        Without a previous reconciliation, or if full, every game is
+        replayed and the sorted set rebuilt. Returns the number of players
+        rated. The game server does not rate games while it runs.
+        """
+        redis = get_redis_connection("default")
+        reconciled_id = None if full else redis.get(LEADERBOARD_RECONCILED_ID_KEY)
+        if reconciled_id is None or not self.is_built():
+            return self.__reconcile_all()
+        games = list(group_games(self.__get_links(int(reconciled_id))))
+        if not games:
+            return 0
+        user_ids = list({user_id for _, user_ids, _ in games for user_id in user_ids})
+        ratings = {
+            user_id: float(rating)
+            for user_id, rating in zip(
+                user_ids, redis.hmget(LEADERBOARD_RECONCILED_KEY, user_ids)
+            )
+            if rating is not None
+        }
+        last_summary_id = replay_games(ratings, games)
+        usernames = self.__save_drifted(
+            ratings, UserStats.objects.filter(user_id__in=ratings)
+        )
+        ratings = {user_id: ratings[user_id] for user_id in usernames}
+        pipeline = redis.pipeline()
+        if ratings:
+            pipeline.zadd(LEADERBOARD_KEY, ratings)
+            pipeline.hset(LEADERBOARD_USERNAMES_KEY, mapping=usernames)
+            pipeline.hset(LEADERBOARD_RECONCILED_KEY, mapping=ratings)
+        pipeline.set(LEADERBOARD_RECONCILED_ID_KEY, last_summary_id)
+        pipeline.execute()
+        return len(usernames)
+
+    def __reconcile_all(self) -> int:
+        ratings: dict[int, float] = {}
+        last_summary_id = replay_games(
+            ratings,
+            group_games(
+                self.__get_links(0).iterator(chunk_size=LEADERBOARD_BATCH_SIZE)
+            ),
+        )
+        # Every player, to reset those with no online game left
+        usernames = self.__save_drifted(ratings, UserStats.objects.all())
+        self.__rebuild(
+            {user_id: ratings[user_id] for user_id in usernames},
+            usernames,
+            last_summary_id or 0,
+        )
+        return len(usernames)
+
+    @staticmethod
+    def __get_links(after_summary_id: int):
+        through = CustomUser.game_summaries.through
+        return (
+            through.objects.filter(
+                gamesummary__is_remote=True, gamesummary_id__gt=after_summary_id
+            )
+            .order_by("gamesummary_id", "customuser_id")
+            .values_list(
+                "gamesummary_id", "customuser_id", "gamesummary__winner_user_id"
+            )
+        )
+
+    @staticmethod
+    def __save_drifted(
+        ratings: dict[int, float], stats: QuerySet[UserStats]
+    ) -> dict[int, str]:
+        """
+        Saves the replayed ratings of the stats that drifted, INITIAL_RATING
+        for the players not replayed, and returns the usernames of the
+        replayed players.
+        """
+        drifted: list[UserStats] = []
+        usernames: dict[int, str] = {}
+        for user_stats in (
+            stats.select_related("user")
+            .only("user_id", "rating", "user__username")
+            .iterator(chunk_size=LEADERBOARD_BATCH_SIZE)
+        ):
+            rating = ratings.get(user_stats.user_id, INITIAL_RATING)
+            if user_stats.rating != rating:
+                user_stats.rating = rating
+                drifted.append(user_stats)
+            if user_stats.user_id in ratings:
+                usernames[user_stats.user_id] = user_stats.user.username
+        UserStats.objects.bulk_update(
+            drifted, ["rating"], batch_size=LEADERBOARD_BATCH_SIZE
+        )
+        if drifted:
+            logger.info("Reconciled the rating of %s players", len(drifted))
+        return usernames
+
+    @staticmethod
+    def __rebuild(
+        ratings: dict[int, float], usernames: dict[int, str], last_summary_id: int
+    ):
+        redis = get_redis_connection("default")
+        ratings_key = f"{LEADERBOARD_KEY}:rebuild"
+        usernames_key = f"{LEADERBOARD_USERNAMES_KEY}:rebuild"
+        reconciled_key = f"{LEADERBOARD_RECONCILED_KEY}:rebuild"
+        redis.delete(ratings_key, usernames_key, reconciled_key)
+        user_ids = list(ratings)
+        for start in range(0, len(user_ids), LEADERBOARD_BATCH_SIZE):
+            batch = user_ids[start : start + LEADERBOARD_BATCH_SIZE]
+            pipeline = redis.pipeline(transaction=False)
+            pipeline.zadd(ratings_key, {user_id: ratings[user_id] for user_id in batch})
+            pipeline.hset(
+                usernames_key,
+                mapping={user_id: usernames[user_id] for user_id in batch},
+            )
+            pipeline.hset(
+                reconciled_key,
+                mapping={user_id: ratings[user_id] for user_id in batch},
+            )
+            pipeline.execute()
+        pipeline = redis.pipeline()
+        if user_ids:
+            pipeline.rename(ratings_key, LEADERBOARD_KEY)
+            pipeline.rename(usernames_key, LEADERBOARD_USERNAMES_KEY)
+            pipeline.rename(reconciled_key, LEADERBOARD_RECONCILED_KEY)
+        else:
+            pipeline.delete(
+                LEADERBOARD_KEY, LEADERBOARD_USERNAMES_KEY, LEADERBOARD_RECONCILED_KEY
+            )
+        pipeline.set(LEADERBOARD_RECONCILED_ID_KEY, last_summary_id)
+        pipeline.execute()
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_leaderboard() -> Leaderboard:
+    return Leaderboard.get_instance()
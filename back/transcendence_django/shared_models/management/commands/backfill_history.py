@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from shared_models.models import CustomUser, HistoryEntry
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Creates the history entries of the games written before they existed."
+
+    def handle(self, *args, **options):
+        # pylint: disable=no-member
+        # Written in one transaction, and with the links since then: any
+        # entry means the history is complete
+        if HistoryEntry.objects.exists():
+            self.stdout.write("History already backfilled")
+            return
+        through = CustomUser.game_summaries.through
+        links = through.objects.values_list(
+            "customuser_id",
+            "gamesummary_id",
+            "gamesummary__end_time",
+            "gamesummary__is_remote",
+        )
+        created = 0
+        batch: list[HistoryEntry] = []
+        with transaction.atomic():
+            for user_id, summary_id, end_time, is_remote in links.iterator(
+                chunk_size=BATCH_SIZE
+            ):
+                batch.append(
+                    HistoryEntry(
+                        user_id=user_id,
+                        game_summary_id=summary_id,
+                        end_time=end_time,
+                        is_remote=is_remote,
+                    )
+                )
+                if len(batch) == BATCH_SIZE:
+                    created += self.__create(batch)
+            created += self.__create(batch)
+        self.stdout.write(f"Backfilled {created} history entries")
+
+    @staticmethod
+    def __create(batch: list[HistoryEntry]) -> int:
+        # pylint: disable=no-member
+        # Entries of games written by a server started meanwhile are kept
+        HistoryEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        count = len(batch)
+        batch.clear()
+        return count
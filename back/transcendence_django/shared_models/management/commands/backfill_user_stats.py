@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from shared_models.models import CustomUser, UserStats
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = "Creates the stats of the users who have none from their legacy counters."
+
+    def handle(self, *args, **options):
+        # pylint: disable=no-member
+        # Written in one transaction, before any game wrote stats: any stats
+        # mean the legacy counters were all moved
+        if UserStats.objects.exists():
+            self.stdout.write("User stats already backfilled")
+            return
+        users = CustomUser.objects.filter(stats__isnull=True).only(
+            "id", "time_played", "game_counter", "win_loss_tie"
+        )
+        created = 0
+        batch: list[UserStats] = []
+        with transaction.atomic():
+            for user in users.iterator(chunk_size=BATCH_SIZE):
+                batch.append(UserStats.from_legacy_counters(user))
+                if len(batch) == BATCH_SIZE:
+                    created += self.__create(batch)
+            created += self.__create(batch)
+        self.stdout.write(f"Backfilled the stats of {created} users")
+
+    @staticmethod
+    def __create(batch: list[UserStats]) -> int:
+        # pylint: disable=no-member
+        UserStats.objects.bulk_create(batch, ignore_conflicts=True)
+        count = len(batch)
+        batch.clear()
+        return count
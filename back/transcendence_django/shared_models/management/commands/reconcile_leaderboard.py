@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from redis.exceptions import RedisError
+from shared_models.leaderboard import get_leaderboard
+
+
+class Command(BaseCommand):
+    help = "Recomputes the ratings from the online games and rebuilds the leaderboard."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuilds it even if it is in Redis.",
+        )
+
+    def handle(self, *args, **options):
+        leaderboard = get_leaderboard()
+        try:
+            # The game server reconciles it periodically
+            if not options["force"] and leaderboard.is_built():
+                self.stdout.write("Leaderboard already built")
+                return
+            nb_players = leaderboard.reconcile(full=True)
+        except RedisError as e:
+            self.stderr.write(f"Leaderboard not rebuilt: {e}")
+            return
+        self.stdout.write(f"Rebuilt the leaderboard of {nb_players} players")
@@ -1,9 +1,8 @@
 import logging
 from datetime import datetime, timedelta
-from typing import Any, List, TypeVar
+from typing import Any, Iterable, List, TypeVar
 
 import requests
-from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import login, logout
 from django.contrib.auth.models import (
@@ -12,25 +11,40 @@ from django.contrib.auth.models import (
     PermissionsMixin,
 )
 from django.contrib.postgres.fields import ArrayField
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Q
+from django.db.models import BooleanField, Case, F, Max, Value, When
 from django.utils import timezone
+from redis.exceptions import RedisError
 from shared_models.constants import (
     DEFAULT_GAME_COUNTER,
     DEFAULT_TIME_PLAYED,
     DEFAULT_WIN_LOSS_TIE,
-    TIME_OUT_ONLINE,
+    FRIENDS_PRESENCE_KEY,
+    FRIENDS_PRESENCE_TTL,
+    INITIAL_RATING,
 )
-from sortedm2m.fields import SortedManyToManyField
+from shared_models.presence import get_presence_store, notify_users
+from shared_models.presence_writes import get_presence_write_buffer
+from sortedm2m.fields import SORT_VALUE_FIELD_NAME, SortedManyToManyField
 from transcendence_django.dict_keys import (
     ACCESS_TOKEN_KEY,
     EXPIRES_IN_KEY,
+    FRIENDS_REQUESTS_KEY,
+    FRIENDS_UPDATE,
     LOCAL,
     LOSS,
+    OFFLINE_KEY,
+    ONLINE_KEY,
+    PLAYING_KEY,
+    PRESENCE,
+    PRESENCE_UPDATE,
     REFRESH_TOKEN_KEY,
     REMOTE,
     TIE,
     TOTAL,
+    TYPE,
+    USERNAME,
     WIN,
 )
 
@@ -46,6 +60,7 @@ class GameSummary(models.Model):
     start_time = models.DateTimeField(null=True)  # type: ignore
     end_time = models.DateTimeField(auto_now=True)  # type: ignore
     is_remote = models.BooleanField(default=False)  # type: ignore
+    replay = models.CharField(max_length=64, blank=True, default="")  # type: ignore
 
 
 class Profile(models.Model):
@@ -101,6 +116,47 @@ class OauthToken(models.Model):
         return self.access_token
 
 
+def get_stat_increments(user_id: int, game_summary: GameSummary) -> dict[str, int]:
+    """
+    Returns what the game adds to the UserStats counters of the user.
+    """
+    start_time = game_summary.start_time or datetime.min
+    end_time = game_summary.end_time or datetime.max
+    game_duration: int = int((end_time - start_time).total_seconds())
+    if not game_summary.is_remote:
+        return {"local_time_played": game_duration, "local_games": 1}
+    if str(game_summary.winner_user_id) == str(user_id):
+        result = "wins"
+    elif game_summary.winner_user_id is None:
+        result = "ties"
+    else:
+        result = "losses"
+    return {"remote_time_played": game_duration, "remote_games": 1, result: 1}
+
+
+def invalidate_friends_presence(*user_ids: int):
+    """
+    Drops the cached friends presence of the users.
+    """
+    cache.delete_many([FRIENDS_PRESENCE_KEY.format(user_id) for user_id in user_ids])
+
+
+def notify_friendship_change(*user_ids: int):
+    """
+    Tells the users their friends or friend requests changed.
+    """
+    invalidate_friends_presence(*user_ids)
+    notify_users(user_ids, {TYPE: FRIENDS_UPDATE})
+
+
+def get_online_user_ids(user_ids: Iterable[int]) -> set[int]:
+    try:
+        return get_presence_store().get_online(user_ids)
+    except RedisError as e:
+        logger.warning("Presence unavailable: %s", e)
+        return set()
+
+
 CustomUserType = TypeVar("CustomUserType", bound="CustomUser")
 
 
@@ -118,6 +174,68 @@ class CustomUserManager(BaseUserManager[CustomUserType]):
         user.save(using=self._db)
         return user
 
+    def add_game_summaries(self, user_summaries: list[tuple[int, GameSummary]]):
+        """
+        Appends the summaries to the game summaries and the history of their
+        users and adds them to the users' stats: one insert of the links, one
+        of the history entries and one update of the counters for the whole
+        batch. Unknown users are skipped.
+        """
+        user_ids = set(
+            self.filter(
+                pk__in={user_id for user_id, _ in user_summaries}
+            ).values_list("pk", flat=True)
+        )
+        user_summaries = [
+            (user_id, game_summary)
+            for user_id, game_summary in user_summaries
+            if user_id in user_ids
+        ]
+        if not user_summaries:
+            return
+        through = self.model.game_summaries.through
+        sort_values: dict[int, int] = dict(
+            through.objects.filter(customuser_id__in=user_ids)
+            .values_list("customuser_id")
+            .annotate(Max(SORT_VALUE_FIELD_NAME))
+        )
+        links = []
+        entries = []
+        increments: dict[int, dict[str, int]] = {}
+        for user_id, game_summary in user_summaries:
+            sort_values[user_id] = sort_values.get(user_id, 0) + 1
+            links.append(
+                through(
+                    customuser_id=user_id,
+                    gamesummary_id=game_summary.id,
+                    **{SORT_VALUE_FIELD_NAME: sort_values[user_id]},
+                )
+            )
+            entries.append(HistoryEntry.from_summary(user_id, game_summary))
+            user_increments = increments.setdefault(user_id, {})
+            for field, amount in get_stat_increments(user_id, game_summary).items():
+                user_increments[field] = user_increments.get(field, 0) + amount
+        through.objects.bulk_create(links)
+        HistoryEntry.objects.bulk_create(entries)
+        UserStats.objects.bulk_create(
+            [UserStats(user_id=user_id) for user_id in increments],
+            ignore_conflicts=True,
+        )
+        UserStats.objects.filter(user_id__in=increments).update(
+            **{
+                field: Case(
+                    *(
+                        When(user_id=user_id, then=F(field) + counters[field])
+                        for user_id, counters in increments.items()
+                        if field in counters
+                    ),
+                    default=F(field),
+                )
+                for field in UserStats.COUNTER_FIELDS
+                if any(field in counters for counters in increments.values())
+            }
+        )
+
 
 class FriendshipManager:
 
@@ -140,18 +258,21 @@ class FriendshipManager:
             return f"{receiver.username} is now your friend!"
 
         FriendRequest.objects.create(from_user=sender, to_user=receiver)
+        notify_friendship_change(receiver.id)
         return "Friend request sent!"
 
     @staticmethod
     def add_friend(friend1, friend2):
         if friend1 != friend2:
             friend1.friends.add(friend2)
+            notify_friendship_change(friend1.id, friend2.id)
 
     @staticmethod
     def remove_friend(user, friend) -> bool:
         if friend not in user.friends.all():
             return False
         user.friends.remove(friend)
+        notify_friendship_change(user.id, friend.id)
         return True
 
     @staticmethod
@@ -199,6 +320,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         OauthToken, on_delete=models.CASCADE, null=True, blank=True
     )  # type: ignore
     game_summaries = SortedManyToManyField(GameSummary, blank=True)
+    # Legacy counters, only read by the backfill_user_stats command
     time_played = models.JSONField(default=DEFAULT_TIME_PLAYED)
     win_loss_tie = models.JSONField(default=DEFAULT_WIN_LOSS_TIE)
     game_counter = models.JSONField(default=DEFAULT_GAME_COUNTER)
@@ -223,10 +345,18 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         avatar_uploader.update_avatar_filename(self.username, new_username)
         self.username = new_username
         self.save()
+        # pylint: disable-next=import-outside-toplevel
+        from shared_models.leaderboard import get_leaderboard
+
+        get_leaderboard().rename_player(self.id, new_username)
 
     def update_last_seen(self):
         self.last_seen = timezone.now()
-        self.save()
+        get_presence_write_buffer().touch(self.id, self.last_seen)
+
+    def set_playing_status(self, is_playing: bool):
+        self.is_playing = is_playing
+        get_presence_write_buffer().set_playing(self.id, is_playing)
 
     def store_tokens(self, token_data):
         if self.oauth_token is None:
@@ -237,6 +367,7 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     def logout_user(self, request):
         self.__clear_tokens()
+        get_presence_write_buffer().discard_last_seen(self.id)
         self.last_seen = None
         self.save()
         logout(request)
@@ -253,7 +384,12 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         # pylint: disable=no-member
         FriendRequest.objects.filter(to_user=self).delete()
         # pylint: disable=no-member
+        notify_friendship_change(*self.friends.values_list("id", flat=True))
         self.friends.clear()
+        # pylint: disable-next=import-outside-toplevel
+        from shared_models.leaderboard import get_leaderboard
+
+        get_leaderboard().remove_player(self.id)
         self.delete()
 
     def send_friend_request(self, to_user) -> str:
@@ -268,67 +404,62 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
     def decline_friendship_request(self, friend) -> bool:
         return FriendshipManager.decline_friendship(friend, self)
 
-    def get_friend_requests(self):
+    def get_friends_presence(self) -> dict[str, list[str]]:
+        """
+        Returns the usernames of the users asking to be friends and of the
+        friends by presence, cached for a few seconds. One query fetches all
+        of them on a miss.
+        """
+        key = FRIENDS_PRESENCE_KEY.format(self.id)
+        presence = cache.get(key)
+        if presence is None:
+            presence = self.__query_friends_presence()
+            cache.set(key, presence, timeout=FRIENDS_PRESENCE_TTL)
+        return presence
+
+    def get_presence(self) -> str:
+        if self.id not in get_online_user_ids([self.id]):
+            return OFFLINE_KEY
+        return PLAYING_KEY if self.is_playing else ONLINE_KEY
+
+    def notify_friends(self, presence: str):
+        """
+        Pushes the presence of the user to the friends connected.
+        """
         # pylint: disable=no-member
-        return FriendRequest.objects.filter(to_user=self).values_list(
-            "from_user__username", flat=True
+        friend_ids = list(self.friends.values_list("id", flat=True))
+        invalidate_friends_presence(*friend_ids)
+        notify_users(
+            friend_ids,
+            {TYPE: PRESENCE_UPDATE, USERNAME: self.username, PRESENCE: presence},
         )
 
-    def get_playing_friends(self):
+    def __query_friends_presence(self) -> dict[str, list[str]]:
         # pylint: disable=no-member
-        return self.friends.filter(last_seen__isnull=False, is_playing=True).values_list(
-            "username", flat=True
-        )
-
-    def get_online_friends(self):
+        friends = self.friends.values_list("id", "username", "is_playing")
+        # The senders of the requests are the rows without a playing status
         # pylint: disable=no-member
-        timeout = timezone.now() - timedelta(minutes=TIME_OUT_ONLINE)
-        return self.friends.filter(last_seen__isnull=False, last_seen__gte=timeout, is_playing=False).values_list(
-            "username", flat=True
+        requests_from = FriendRequest.objects.filter(to_user=self).values_list(
+            "from_user_id", "from_user__username", Value(None, BooleanField())
         )
-
-    def get_offline_friends(self):
-        # pylint: disable=no-member
-        timeout = timezone.now() - timedelta(minutes=TIME_OUT_ONLINE)
-        return self.friends.filter(
-            Q(last_seen__isnull=True) | Q(last_seen__lt=timeout),
-            is_playing=False
-        ).values_list("username", flat=True)
-
-    async def save_game_summary(self, game_summary: GameSummary) -> None:
-        await sync_to_async(self.game_summaries.add)(game_summary)
-        self.__update_time_played(game_summary)
-        self.__update_count(game_summary)
-        if game_summary.is_remote:
-            self.__update_win_dict(game_summary)
-        await sync_to_async(self.save)()
-
-    def __update_win_dict(self, game_summary) -> None:
-        if str(game_summary.winner_user_id) == str(self.id):
-            key = WIN
-        elif game_summary.winner_user_id is None:
-            key = TIE
-        else:
-            key = LOSS
-        self.win_loss_tie[key] += 1
-        self.win_loss_tie[TOTAL] += 1
-
-    def __update_time_played(self, game_summary) -> None:
-        start_time = game_summary.start_time or datetime.min
-        end_time = game_summary.end_time or datetime.max
-        game_duration: int = int((end_time - start_time).total_seconds())
-        if game_summary.is_remote:
-            self.time_played[REMOTE] += game_duration
-        else:
-            self.time_played[LOCAL] += game_duration
-        self.time_played[TOTAL] += game_duration
-
-    def __update_count(self, game_summary) -> None:
-        if game_summary.is_remote:
-            self.game_counter[REMOTE] += 1
-        else:
-            self.game_counter[LOCAL] += 1
-        self.game_counter[TOTAL] += 1
+        rows = list(friends.union(requests_from, all=True))
+        online_ids = get_online_user_ids(
+            user_id for user_id, _, is_playing in rows if is_playing is not None
+        )
+        presence: dict[str, list[str]] = {
+            FRIENDS_REQUESTS_KEY: [],
+            PLAYING_KEY: [],
+            ONLINE_KEY: [],
+            OFFLINE_KEY: [],
+        }
+        for user_id, username, is_playing in rows:
+            if is_playing is None:
+                presence[FRIENDS_REQUESTS_KEY].append(username)
+            elif user_id not in online_ids:
+                presence[OFFLINE_KEY].append(username)
+            else:
+                presence[PLAYING_KEY if is_playing else ONLINE_KEY].append(username)
+        return presence
 
     def __clear_tokens(self):
         if self.oauth_token is not None:
@@ -336,6 +467,121 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
         self.save()
 
 
+class UserStats(models.Model):
+    """
+    Game counters of a user, incremented in SQL when their games end.
+    """
+
+    COUNTER_FIELDS = (
+        "local_time_played",
+        "remote_time_played",
+        "local_games",
+        "remote_games",
+        "wins",
+        "losses",
+        "ties",
+    )
+
+    user = models.OneToOneField(
+        CustomUser, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )  # type: ignore
+    local_time_played = models.BigIntegerField(default=0)  # type: ignore
+    remote_time_played = models.BigIntegerField(default=0)  # type: ignore
+    local_games = models.IntegerField(default=0)  # type: ignore
+    remote_games = models.IntegerField(default=0)  # type: ignore
+    wins = models.IntegerField(default=0)  # type: ignore
+    losses = models.IntegerField(default=0)  # type: ignore
+    ties = models.IntegerField(default=0)  # type: ignore
+    # Elo rating from the online games, mirrored by the leaderboard
+    rating = models.FloatField(default=INITIAL_RATING)  # type: ignore
+
+    class Meta:
+        indexes = [models.Index(fields=["-wins"], name="user_stats_wins_idx")]
+
+    @classmethod
+    def get_for_user(cls, user: CustomUser) -> "UserStats":
+        # pylint: disable=no-member
+        return cls.objects.get_or_create(user=user)[0]
+
+    @classmethod
+    def from_legacy_counters(cls, user: CustomUser) -> "UserStats":
+        return cls(
+            user=user,
+            local_time_played=user.time_played.get(LOCAL, 0),
+            remote_time_played=user.time_played.get(REMOTE, 0),
+            local_games=user.game_counter.get(LOCAL, 0),
+            remote_games=user.game_counter.get(REMOTE, 0),
+            wins=user.win_loss_tie.get(WIN, 0),
+            losses=user.win_loss_tie.get(LOSS, 0),
+            ties=user.win_loss_tie.get(TIE, 0),
+        )
+
+    def get_time_played(self) -> dict[str, int]:
+        return {
+            LOCAL: self.local_time_played,
+            REMOTE: self.remote_time_played,
+            TOTAL: self.local_time_played + self.remote_time_played,
+        }
+
+    def get_game_counter(self) -> dict[str, int]:
+        return {
+            LOCAL: self.local_games,
+            REMOTE: self.remote_games,
+            TOTAL: self.local_games + self.remote_games,
+        }
+
+    def get_win_loss_tie(self) -> dict[str, int]:
+        return {
+            WIN: self.wins,
+            LOSS: self.losses,
+            TIE: self.ties,
+            TOTAL: self.wins + self.losses + self.ties,
+        }
+
+
+class HistoryEntry(models.Model):
+    """
+    A game summary in the history of one of its players, with the columns
+    the history is paged on so that a page is read from the user's index.
+    """
+
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="history_entries"
+    )  # type: ignore
+    game_summary = models.ForeignKey(
+        GameSummary, on_delete=models.CASCADE, related_name="history_entries"
+    )  # type: ignore
+    end_time = models.DateTimeField()  # type: ignore
+    is_remote = models.BooleanField(default=False)  # type: ignore
+
+    class Meta:
+        # Keyset pagination of each user's history, newest first
+        indexes = [
+            models.Index(
+                fields=["user", "-end_time", "-game_summary"],
+                name="history_user_end_time_idx",
+            ),
+            models.Index(
+                fields=["user", "is_remote", "-end_time", "-game_summary"],
+                name="history_user_remote_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "game_summary"], name="history_user_summary_unique"
+            )
+        ]
+
+    @classmethod
+    def from_summary(cls, user_id: int, game_summary: GameSummary) -> "HistoryEntry":
+        return cls(
+            user_id=user_id,
+            game_summary_id=game_summary.id,
+            end_time=game_summary.end_time,
+            is_remote=game_summary.is_remote,
+        )
+
+
 class FriendRequest(models.Model):
     from_user = models.ForeignKey(
         CustomUser, related_name="friend_requests_sent", on_delete=models.CASCADE
@@ -350,6 +596,7 @@ class FriendRequest(models.Model):
 
     def decline(self):
         self.delete()
+        notify_friendship_change(self.to_user_id)
 
     class Meta:
         unique_together = ("from_user", "to_user")
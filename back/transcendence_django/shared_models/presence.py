@@ -0,0 +1,154 @@
+import logging
+import time
+from typing import Any, Iterable
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django_redis import get_redis_connection
+from redis.exceptions import RedisError
+from shared_models.constants import (
+    PRESENCE_DEADLINES_KEY,
+    PRESENCE_GROUP,
+    PRESENCE_KEY,
+    PRESENCE_SWEEP_BATCH_SIZE,
+    PRESENCE_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+# KEYS: connections of the user, deadlines of the users
+# ARGV: channel name, now, deadline, ttl, user id
+# Returns 1 if the user had no live connection before.
+CONNECT_SCRIPT = """
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", ARGV[2])
+local was_online = redis.call("ZCARD", KEYS[1]) > 0
+redis.call("ZADD", KEYS[1], ARGV[3], ARGV[1])
+redis.call("EXPIRE", KEYS[1], ARGV[4])
+redis.call("ZADD", KEYS[2], "GT", ARGV[3], ARGV[5])
+if was_online then
+    return 0
+end
+return 1
+"""
+
+# KEYS: connections of the user, deadlines of the users
+# ARGV: channel name, now, user id
+# Returns 1 if the user went offline and nobody announced it yet.
+DISCONNECT_SCRIPT = """
+redis.call("ZREM", KEYS[1], ARGV[1])
+redis.call("ZREMRANGEBYSCORE", KEYS[1], "-inf", ARGV[2])
+if redis.call("ZCARD", KEYS[1]) > 0 then
+    return 0
+end
+return redis.call("ZREM", KEYS[2], ARGV[3])
+"""
+
+# KEYS: deadlines of the users
+# ARGV: now, batch size
+# Returns the users whose connections all expired, claimed for announcing.
+SWEEP_SCRIPT = """
+local expired = redis.call(
+    "ZRANGEBYSCORE", KEYS[1], "-inf", ARGV[1], "LIMIT", 0, ARGV[2]
+)
+if #expired > 0 then
+    redis.call("ZREM", KEYS[1], unpack(expired))
+end
+return expired
+"""
+
+
+def get_presence_group(user_id: int) -> str:
+    return PRESENCE_GROUP.format(user_id)
+
+
+class PresenceStore:
+    """
+    Who is online, kept in Redis by the presence websockets. Every
+    connection of a user is a member of the user's sorted set, scored
+    with the time it expires at unless a heartbeat pushes it back. A user
+    is online while one of them is live.
+    The latest deadline of every online user is also kept in one sorted
+    set, from which the sweepers claim the users whose connections all
+    expired without closing, so that each offline transition is announced
+    once.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.redis = get_redis_connection("default")
+        self.connect_script = self.redis.register_script(CONNECT_SCRIPT)
+        self.disconnect_script = self.redis.register_script(DISCONNECT_SCRIPT)
+        self.sweep_script = self.redis.register_script(SWEEP_SCRIPT)
+
+    def connect(self, user_id: int, channel_name: str) -> bool:
+        """
+        Adds or refreshes a connection. Returns True if the user was offline.
+        """
+        now = time.time()
+        return bool(
+            self.connect_script(
+                keys=[PRESENCE_KEY.format(user_id), PRESENCE_DEADLINES_KEY],
+                args=[channel_name, now, now + PRESENCE_TTL, PRESENCE_TTL, user_id],
+            )
+        )
+
+    def disconnect(self, user_id: int, channel_name: str) -> bool:
+        """
+        Removes a connection. Returns True if the user went offline.
+        """
+        return bool(
+            self.disconnect_script(
+                keys=[PRESENCE_KEY.format(user_id), PRESENCE_DEADLINES_KEY],
+                args=[channel_name, time.time(), user_id],
+            )
+        )
+
+    def pop_expired(self) -> list[int]:
+        expired = self.sweep_script(
+            keys=[PRESENCE_DEADLINES_KEY],
+            args=[time.time(), PRESENCE_SWEEP_BATCH_SIZE],
+        )
+        return [int(user_id) for user_id in expired]
+
+    def get_online(self, user_ids: Iterable[int]) -> set[int]:
+        user_ids = list(user_ids)
+        if not user_ids:
+            return set()
+        now = time.time()
+        pipeline = self.redis.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipeline.zcount(PRESENCE_KEY.format(user_id), now, "+inf")
+        return {
+            user_id
+            for user_id, live_connections in zip(user_ids, pipeline.execute())
+            if live_connections
+        }
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_presence_store() -> PresenceStore:
+    return PresenceStore.get_instance()
+
+
+async def send_to_users(user_ids: Iterable[int], message: dict[str, Any]):
+    channel_layer = get_channel_layer()
+    for user_id in user_ids:
+        await channel_layer.group_send(get_presence_group(user_id), message)
+
+
+def notify_users(user_ids: Iterable[int], message: dict[str, Any]):
+    """
+    Pushes the message to the presence websockets of the users, from sync
+    code. Users who are not connected miss it and get the state when they
+    connect.
+    """
+    try:
+        async_to_sync(send_to_users)(user_ids, message)
+    except RedisError as e:
+        logger.warning("Presence message %s not sent: %s", message, e)
@@ -0,0 +1,140 @@
+import atexit
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+from django.apps import apps
+from django.db import DatabaseError, close_old_connections
+from shared_models.constants import PRESENCE_WRITE_BATCH_SIZE, PRESENCE_WRITE_WINDOW
+
+logger = logging.getLogger(__name__)
+
+
+class PresenceWriteBuffer:
+    """
+    Coalesces the playing status and last seen writes of the users over a
+    short window: only the latest value of each user is written, each kind
+    with one bulk update of that column. Playing statuses that did not
+    change are not written, the ones that did are pushed to the friends.
+    A background thread flushes the buffer; what is left is flushed at
+    exit.
+    """
+
+    INSTANCE = None
+
+    def __init__(self):
+        self.custom_user_model = apps.get_model("shared_models", "CustomUser")
+        self.lock = threading.Lock()
+        self.playing: dict[int, bool] = {}
+        self.last_seen: dict[int, datetime] = {}
+        self.requested_writes: int = 0
+        self.row_writes: int = 0
+        self.flushes: int = 0
+        self.thread: threading.Thread | None = None
+        atexit.register(self.flush)
+
+    def set_playing(self, user_id: int, is_playing: bool):
+        with self.lock:
+            self.playing[user_id] = is_playing
+            self.requested_writes += 1
+            self.__start()
+
+    def touch(self, user_id: int, last_seen: datetime):
+        with self.lock:
+            self.last_seen[user_id] = last_seen
+            self.requested_writes += 1
+            self.__start()
+
+    def discard_last_seen(self, user_id: int):
+        with self.lock:
+            self.last_seen.pop(user_id, None)
+
+    def flush(self):
+        with self.lock:
+            playing, self.playing = self.playing, {}
+            last_seen, self.last_seen = self.last_seen, {}
+        if not playing and not last_seen:
+            return
+        try:
+            self.__write_playing(playing)
+            self.__write_last_seen(last_seen)
+            self.flushes += 1
+        except DatabaseError as e:
+            logger.warning("Presence writes postponed: %s", e)
+            with self.lock:
+                # Values recorded since the failure are newer
+                for user_id, is_playing in playing.items():
+                    self.playing.setdefault(user_id, is_playing)
+                for user_id, timestamp in last_seen.items():
+                    self.last_seen.setdefault(user_id, timestamp)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self.lock:
+            pending_writes = len(self.playing) + len(self.last_seen)
+        return {
+            "requested_writes": self.requested_writes,
+            "pending_writes": pending_writes,
+            "row_writes": self.row_writes,
+            "writes_saved": self.requested_writes - pending_writes - self.row_writes,
+            "flushes": self.flushes,
+        }
+
+    def __write_playing(self, playing: dict[int, bool]):
+        if not playing:
+            return
+        changed = [
+            user
+            for user in self.custom_user_model.objects.filter(id__in=playing).only(
+                "id", "username", "is_playing"
+            )
+            if user.is_playing != playing[user.id]
+        ]
+        for user in changed:
+            user.is_playing = playing[user.id]
+        self.custom_user_model.objects.bulk_update(
+            changed, ["is_playing"], batch_size=PRESENCE_WRITE_BATCH_SIZE
+        )
+        self.row_writes += len(changed)
+        for user in changed:
+            user.notify_friends(user.get_presence())
+
+    def __write_last_seen(self, last_seen: dict[int, datetime]):
+        if not last_seen:
+            return
+        self.custom_user_model.objects.bulk_update(
+            [
+                self.custom_user_model(id=user_id, last_seen=timestamp)
+                for user_id, timestamp in last_seen.items()
+            ],
+            ["last_seen"],
+            batch_size=PRESENCE_WRITE_BATCH_SIZE,
+        )
+        self.row_writes += len(last_seen)
+
+    def __start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self.__run, name="presence-writes", daemon=True
+            )
+            self.thread.start()
+
+    def __run(self):
+        while True:
+            time.sleep(PRESENCE_WRITE_WINDOW)
+            try:
+                self.flush()
+            except Exception:  # pylint: disable=broad-exception-caught
+                logger.exception("Presence writes flush failed")
+            close_old_connections()
+
+    @classmethod
+    def get_instance(cls):
+        if cls.INSTANCE is None:
+            cls.INSTANCE = cls()
+        return cls.INSTANCE
+
+
+def get_presence_write_buffer() -> PresenceWriteBuffer:
+    return PresenceWriteBuffer.get_instance()
@@ -0,0 +1,36 @@
+from typing import Any, Callable
+
+import pytest
+from back_game.game_arena.arena import Arena
+from back_game.monitor.bot_driver import BotDriver
+from back_game.monitor.match_simulator import MatchSimulator
+from transcendence_django.dict_keys import OPTIONS
+
+
+async def ignore_update(_update: dict[str, Any]):
+    pass
+
+
+@pytest.fixture(name="create_arena")
+def fixture_create_arena() -> Callable[..., Arena]:
+    """
+    Makes arenas of a started match between two bots, entered through the
+    given bot driver, with the given game options.
+    """
+
+    def create_arena(
+        seed: int = 1, bot_driver: BotDriver | None = None, **options: Any
+    ) -> Arena:
+        players_specs = MatchSimulator(2, 2).players_specs
+        players_specs[OPTIONS].update(options)
+        arena = Arena(players_specs, seed)
+        if bot_driver is None:
+            bot_driver = BotDriver()
+        for _ in range(2):
+            bot_driver.add_bot(arena)
+        arena.prepare_game()
+        arena.launch_game()
+        arena.game_update_callback = ignore_update
+        return arena
+
+    return create_arena
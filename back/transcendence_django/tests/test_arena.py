@@ -0,0 +1,31 @@
+from typing import Callable
+
+import pytest
+from back_game.game_arena.arena import Arena
+from back_game.game_settings.game_constants import (
+    DEFAULT_BROADCAST_RATE,
+    MAX_BROADCAST_RATE,
+    MIN_BROADCAST_RATE,
+)
+
+
+@pytest.mark.parametrize(
+    "broadcast_rate, expected_rate",
+    [
+        (30, 30),
+        (12.5, 12),
+        (1, MIN_BROADCAST_RATE),
+        (10_000, MAX_BROADCAST_RATE),
+        ("fast", DEFAULT_BROADCAST_RATE),
+        ("30", DEFAULT_BROADCAST_RATE),
+        (None, DEFAULT_BROADCAST_RATE),
+        (True, DEFAULT_BROADCAST_RATE),
+        (float("nan"), DEFAULT_BROADCAST_RATE),
+        (float("inf"), DEFAULT_BROADCAST_RATE),
+    ],
+)
+def test_broadcast_rate(
+    create_arena: Callable[..., Arena], broadcast_rate, expected_rate: int
+):
+    arena = create_arena(broadcast_rate=broadcast_rate)
+    assert arena.broadcast_interval == pytest.approx(1 / expected_rate)
@@ -0,0 +1,51 @@
+import pytest
+from back_game.game_arena.arena import Arena
+from back_game.monitor.bot_driver import BotDriver
+from back_game.monitor.match_simulator import MatchSimulator
+
+
+def create_arena() -> Arena:
+    return Arena(MatchSimulator(2, 2).players_specs, 1)
+
+
+def test_bots_get_decreasing_negative_ids():
+    bot_driver = BotDriver()
+    first_arena, second_arena = create_arena(), create_arena()
+    bot_ids = [
+        bot_driver.add_bot(arena).user_id
+        for arena in (first_arena, first_arena, second_arena)
+    ]
+    assert bot_ids == [-1, -2, -3]
+    assert bot_driver.get_stats() == {"bot_count": 3, "bot_arena_count": 2}
+
+
+def test_bot_is_not_added_to_a_full_arena():
+    bot_driver = BotDriver()
+    arena = create_arena()
+    for _ in range(2):
+        bot_driver.add_bot(arena)
+    with pytest.raises(ValueError):
+        bot_driver.add_bot(arena)
+    assert len(bot_driver.bots[arena.id]) == 2
+    # The id of the bot that did not enter is not given again
+    assert bot_driver.add_bot(create_arena()).user_id == -4
+
+
+def test_bots_of_removed_arena_stop_playing():
+    bot_driver = BotDriver()
+    arena = create_arena()
+    for _ in range(2):
+        bot_driver.add_bot(arena)
+    arena.prepare_game()
+    arena.launch_game()
+    inputs: list[tuple[str, int]] = []
+    arena.set_paddle_input = lambda name, direction: inputs.append(  # type: ignore
+        (name, direction)
+    )
+    bot_driver.play([arena], arena.broadcast_interval)
+    assert sorted(name for name, _ in inputs) == ["bot-1", "bot-2"]
+    bot_driver.remove_arena(arena.id)
+    inputs.clear()
+    bot_driver.play([arena], arena.broadcast_interval)
+    assert not inputs
+    assert bot_driver.get_stats() == {"bot_count": 0, "bot_arena_count": 0}
@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import pytest
+
+try:
+    from back_aipi.bot_registry import BotRegistry
+except FileNotFoundError:
+    # The AIPI client loads the certificate of the server when imported
+    pytest.skip("No server certificate", allow_module_level=True)
+
+
+class FakeBot:
+    def __init__(self, bot_id: int, error: Exception | None = None):
+        self.id = bot_id
+        self.error = error
+        self.done = asyncio.Event()
+
+    async def run(self):
+        await self.done.wait()
+        if self.error is not None:
+            raise self.error
+
+
+def wait_for(condition) -> bool:
+    deadline = time.monotonic() + 1
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def finish(registry: BotRegistry, bot: FakeBot):
+    registry.loop.call_soon_threadsafe(bot.done.set)
+
+
+def test_bot_runs_until_done():
+    registry = BotRegistry()
+    bot = FakeBot(1)
+    registry.add(bot)  # type: ignore[arg-type]
+    assert registry.has_bot(1)
+    assert registry.get_stats()["running_bots"] == 1
+    finish(registry, bot)
+    assert wait_for(lambda: not registry.has_bot(1))
+    assert registry.get_stats() == {
+        "running_bots": 0,
+        "finished_bots": 1,
+        "failed_bots": 0,
+    }
+
+
+def test_running_bot_is_not_added_twice():
+    registry = BotRegistry()
+    bot = FakeBot(1)
+    registry.add(bot)  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        registry.add(FakeBot(1))  # type: ignore[arg-type]
+    finish(registry, bot)
+    assert wait_for(lambda: not registry.has_bot(1))
+    # Its id is free again once it is done
+    registry.add(FakeBot(1))  # type: ignore[arg-type]
+    assert registry.has_bot(1)
+
+
+def test_failed_bot_is_forgotten():
+    registry = BotRegistry()
+    bot = FakeBot(1, RuntimeError("Connection lost"))
+    registry.add(bot)  # type: ignore[arg-type]
+    finish(registry, bot)
+    assert wait_for(lambda: not registry.has_bot(1))
+    assert registry.get_stats() == {
+        "running_bots": 0,
+        "finished_bots": 0,
+        "failed_bots": 1,
+    }
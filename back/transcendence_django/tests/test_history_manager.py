@@ -0,0 +1,121 @@
+import asyncio
+import atexit
+import threading
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+from back_game.monitor.history_manager import HistoryManager
+from transcendence_django.dict_keys import (
+    ARENA_ID,
+    IS_BOT,
+    IS_REMOTE,
+    PLAYERS,
+    START_TIME,
+    USER_ID,
+    WINNER,
+)
+
+
+def create_history_manager(written: list[int]) -> HistoryManager:
+    history_manager = HistoryManager()
+
+    def write_batch(summaries: list[dict[str, Any]]):
+        written.extend(summary["id"] for summary in summaries)
+
+    history_manager.write_batch = write_batch  # type: ignore[method-assign]
+    return history_manager
+
+
+def test_flush_during_a_write_does_not_write_it_again():
+    written: list[int] = []
+    history_manager = create_history_manager(written)
+    write_batch = history_manager.write_batch
+    writing, written_out = threading.Event(), threading.Event()
+
+    def slow_write_batch(summaries: list[dict[str, Any]]):
+        if not writing.is_set():
+            writing.set()
+            written_out.wait(1)
+        write_batch(summaries)
+
+    history_manager.write_batch = slow_write_batch  # type: ignore[method-assign]
+    batch = [{"id": 1}, {"id": 2}]
+    history_manager.in_flight = batch
+    history_manager.queue.put_nowait({"id": 3})
+    writer = threading.Thread(target=history_manager.write_in_flight, args=(batch,))
+    writer.start()
+    writing.wait(1)
+    flush = threading.Thread(target=history_manager.flush)
+    flush.start()
+    flush.join(0.05)
+    assert flush.is_alive()
+    written_out.set()
+    writer.join()
+    flush.join()
+    assert written == [1, 2, 3]
+
+
+def test_batch_taken_by_the_flush_is_not_written_again():
+    written: list[int] = []
+    history_manager = create_history_manager(written)
+    batch = [{"id": 1}, {"id": 2}]
+    history_manager.in_flight = batch
+    history_manager.flush()
+    history_manager.write_in_flight(batch)
+    assert written == [1, 2]
+    assert not history_manager.in_flight
+
+
+def test_batch_written_by_the_loop_is_not_flushed_again():
+    written: list[int] = []
+    history_manager = create_history_manager(written)
+    batch = [{"id": 1}, {"id": 2}]
+    history_manager.in_flight = batch
+    history_manager.write_in_flight(batch)
+    history_manager.flush()
+    assert written == [1, 2]
+
+
+def create_summary(arena_id: str, **fields: Any) -> dict[str, Any]:
+    player = {USER_ID: 1, IS_BOT: False}
+    return {
+        ARENA_ID: arena_id,
+        WINNER: player,
+        PLAYERS: [player, {USER_ID: 2, IS_BOT: False}],
+        IS_REMOTE: True,
+        START_TIME: datetime.now(timezone.utc),
+        **fields,
+    }
+
+
+@pytest.mark.asyncio
+async def test_invalid_summary_is_dropped_alone():
+    history_manager = create_history_manager([])
+    # Not written by the tasks
+    loop = asyncio.get_running_loop()
+    history_manager.task = loop.create_future()  # type: ignore[assignment]
+    history_manager.reconcile_task = loop.create_future()  # type: ignore[assignment]
+    summaries = [
+        create_summary("1"),
+        create_summary("2", **{PLAYERS: None}),
+        create_summary("3", **{WINNER: "player"}),
+        {ARENA_ID: "4"},
+        create_summary("5"),
+    ]
+    for summary in summaries:
+        await history_manager.save_game_summary(summary)
+    queued = [history_manager.queue.get_nowait()[ARENA_ID] for _ in range(2)]
+    assert queued == ["1", "5"]
+    assert history_manager.queue.empty()
+
+
+def test_exit_flush_is_registered_for_the_shared_instance_only(monkeypatch):
+    registered: list[Any] = []
+    monkeypatch.setattr(atexit, "register", registered.append)
+    monkeypatch.setattr(HistoryManager, "INSTANCE", None)
+    HistoryManager()
+    assert not registered
+    history_manager = HistoryManager.get_instance()
+    assert HistoryManager.get_instance() is history_manager
+    assert registered == [history_manager.flush]
@@ -0,0 +1,104 @@
+import pytest
+from shared_models.constants import INITIAL_RATING, RATING_K_FACTOR
+from shared_models.leaderboard import (
+    get_expected_score,
+    group_games,
+    rate_game,
+    replay_games,
+)
+
+LINKS = [
+    (1, 1, 1),
+    (1, 2, 1),
+    (2, 2, None),
+    (2, 3, None),
+    (3, 1, "3"),
+    (3, 3, "3"),
+    (4, 4, 4),
+    (5, 1, 4),
+    (5, 2, 4),
+    (5, 3, 4),
+    (5, 4, 4),
+]
+
+
+@pytest.mark.parametrize("rating, opponent_rating", [(1500, 1500), (1200, 1800)])
+def test_expected_scores_are_symmetric(rating: float, opponent_rating: float):
+    expected = get_expected_score(rating, opponent_rating)
+    assert expected + get_expected_score(opponent_rating, rating) == pytest.approx(1)
+    assert get_expected_score(1900, 1500) == pytest.approx(10 / 11)
+    assert get_expected_score(1500, 1500) == 0.5
+
+
+def test_two_player_win():
+    ratings = {1: INITIAL_RATING, 2: INITIAL_RATING}
+    rate_game(ratings, [1, 2], 2)
+    assert ratings == {
+        1: INITIAL_RATING - RATING_K_FACTOR / 2,
+        2: INITIAL_RATING + RATING_K_FACTOR / 2,
+    }
+
+
+def test_two_player_tie():
+    ratings = {1: INITIAL_RATING, 2: INITIAL_RATING}
+    rate_game(ratings, [1, 2], None)
+    assert ratings == {1: INITIAL_RATING, 2: INITIAL_RATING}
+    ratings = {1: 1400.0, 2: 1600.0}
+    rate_game(ratings, [1, 2], None)
+    assert ratings[1] > 1400 and ratings[2] < 1600
+    assert ratings[1] + ratings[2] == pytest.approx(3000)
+
+
+def test_four_player_win():
+    ratings = dict.fromkeys([1, 2, 3, 4], INITIAL_RATING)
+    # Winners of the JSON summaries may be strings
+    rate_game(ratings, [1, 2, 3, 4], "3")
+    assert ratings[3] == INITIAL_RATING + 3 * RATING_K_FACTOR / 2
+    for user_id in (1, 2, 4):
+        # Lost to the winner, tied with the others
+        assert ratings[user_id] == INITIAL_RATING - RATING_K_FACTOR / 2
+    assert sum(ratings.values()) == pytest.approx(4 * INITIAL_RATING)
+
+
+def test_four_player_tie():
+    ratings = {1: 1400.0, 2: 1500.0, 3: 1500.0, 4: 1600.0}
+    rate_game(ratings, [1, 2, 3, 4], None)
+    assert ratings[1] > 1400 and ratings[4] < 1600
+    assert ratings[2] == ratings[3]
+    assert sum(ratings.values()) == pytest.approx(6000)
+
+
+def test_games_are_replayed_in_the_order_they_were_written():
+    games = list(group_games(LINKS))
+    assert games == [
+        (1, [1, 2], 1),
+        (2, [2, 3], None),
+        (3, [1, 3], "3"),
+        (4, [4], 4),
+        (5, [1, 2, 3, 4], 4),
+    ]
+    ratings: dict[int, float] = {}
+    assert replay_games(ratings, games) == 5
+    expected = dict.fromkeys([1, 2, 3, 4], INITIAL_RATING)
+    for _, user_ids, winner_user_id in games:
+        if len(user_ids) > 1:
+            rate_game(expected, user_ids, winner_user_id)
+    assert ratings == expected
+    reversed_ratings: dict[int, float] = {}
+    replay_games(reversed_ratings, reversed(games))
+    assert reversed_ratings != ratings
+
+
+def test_replay_goes_on_from_the_last_reconciled_game():
+    ratings: dict[int, float] = {}
+    replay_games(ratings, group_games(LINKS))
+    # Reconciled up to the game 2, then from there
+    reconciled: dict[int, float] = {}
+    reconciled_id = replay_games(
+        reconciled, group_games(link for link in LINKS if link[0] <= 2)
+    )
+    assert reconciled_id == 2
+    new_links = [link for link in LINKS if link[0] > reconciled_id]
+    assert replay_games(reconciled, group_games(new_links)) == 5
+    assert reconciled == pytest.approx(ratings)
+    assert replay_games(reconciled, group_games([])) is None
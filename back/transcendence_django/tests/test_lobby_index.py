@@ -0,0 +1,84 @@
+import pytest
+from back_game.monitor.lobby.classic_lobby import ClassicLobby
+from back_game.monitor.lobby_index import LobbyIndex, get_lobby_index
+from back_game.monitor.lobby_manager import LobbyManager
+from back_game.monitor.match_simulator import MatchSimulator
+from back_game.monitor.tick_scheduler import get_tick_scheduler
+from transcendence_django.dict_keys import (
+    AI_OPPONENTS_LOCAL,
+    HUMAN_OPPONENTS_ONLINE,
+    IS_REMOTE,
+    OPTIONS,
+)
+
+
+@pytest.fixture(name="lobby_index")
+def fixture_lobby_index():
+    LobbyIndex.INSTANCE = None
+    yield get_lobby_index()
+    LobbyIndex.INSTANCE = None
+
+
+def get_online_specs():
+    players_specs = MatchSimulator(2, 2).players_specs
+    players_specs[IS_REMOTE] = "online"
+    players_specs[OPTIONS].update(
+        {"is_private": False, AI_OPPONENTS_LOCAL: 0, HUMAN_OPPONENTS_ONLINE: 1}
+    )
+    return players_specs
+
+
+def test_user_locations(lobby_index: LobbyIndex):
+    lobby_index.set_user(1, "lobby_a", None)
+    assert lobby_index.get_lobby_id(1) == "lobby_a"
+    assert lobby_index.get_arena_id(1) is None
+    lobby_index.set_user(1, "lobby_a", "arena_a")
+    assert lobby_index.get_arena_id(1) == "arena_a"
+    lobby_index.remove_user(1, "lobby_b")
+    assert lobby_index.get_lobby_id(1) == "lobby_a"
+    lobby_index.remove_user(1, "lobby_a")
+    assert lobby_index.get_lobby_id(1) is None
+    assert lobby_index.get_arena_id(1) is None
+
+
+def test_free_lobbies_by_mode_and_age(lobby_index: LobbyIndex):
+    for lobby_id in ("lobby_a", "lobby_b", "lobby_c"):
+        lobby_index.add_free_lobby(False, lobby_id)
+    lobby_index.add_free_lobby(True, "tournament_a")
+    lobby_index.add_free_lobby(False, "lobby_a")
+    assert list(lobby_index.get_free_lobby_ids(False)) == [
+        "lobby_a",
+        "lobby_b",
+        "lobby_c",
+    ]
+    assert list(lobby_index.get_free_lobby_ids(True)) == ["tournament_a"]
+    lobby_index.discard_free_lobby(False, "lobby_a")
+    lobby_index.discard_free_lobby(False, "unknown")
+    assert list(lobby_index.get_free_lobby_ids(False)) == ["lobby_b", "lobby_c"]
+
+
+@pytest.mark.asyncio
+async def test_only_full_lobbies_leave_the_free_lobbies(lobby_index: LobbyIndex):
+    lobby_manager = LobbyManager()
+    lobby = ClassicLobby(get_online_specs())
+    lobby_manager.lobbies[lobby.id] = lobby
+    get_available_lobby = getattr(lobby_manager, "_LobbyManager__get_available_lobby")
+    try:
+        arena = next(iter(lobby.arenas.values()))
+        arena.game.is_private = True
+        assert get_available_lobby(1) is None
+        assert list(lobby_index.get_free_lobby_ids(False)) == [lobby.id]
+        arena.game.is_private = False
+        assert get_available_lobby(1)["lobby_id"] == lobby.id
+        lobby.users = {1: arena, 2: arena}
+        assert get_available_lobby(3) is None
+        assert not list(lobby_index.get_free_lobby_ids(False))
+        del lobby_manager.lobbies[lobby.id]
+        lobby_index.add_free_lobby(False, lobby.id)
+        assert get_available_lobby(3) is None
+        assert not list(lobby_index.get_free_lobby_ids(False))
+    finally:
+        lobby.detach_arenas()
+        task = get_tick_scheduler().task
+        if task is not None:
+            await task
@@ -0,0 +1,75 @@
+from typing import Callable
+
+import pytest
+from back_game.app_settings.game_logic_interface import GameLogicInterface
+from back_game.app_settings.lobby_error import LobbyError
+from back_game.game_arena.arena import Arena
+from back_game.game_settings.game_constants import INVALID_INPUT, PHYSICS_STEP
+
+PLAYER_NAME = "bot-1"
+
+
+def step(arena: Arena, count: int):
+    for _ in range(count):
+        arena.game.moved_paddles.clear()
+        arena.move_paddles()
+
+
+@pytest.mark.parametrize("direction", [-1, 1])
+def test_held_input_moves_paddle_every_step(
+    create_arena: Callable[..., Arena], direction: int
+):
+    arena = create_arena()
+    paddle = arena.game.paddles[PLAYER_NAME]
+    arena.set_paddle_input(PLAYER_NAME, direction)
+    rates = [paddle.rate]
+    for _ in range(3):
+        step(arena, 1)
+        assert paddle.slot in arena.game.moved_paddles
+        rates.append(paddle.rate)
+    moves = [after - before for before, after in zip(rates, rates[1:])]
+    assert all(move * direction > 0 for move in moves)
+    assert moves == pytest.approx([moves[0]] * 3)
+
+
+def test_released_input_stops_paddle(create_arena: Callable[..., Arena]):
+    arena = create_arena()
+    paddle = arena.game.paddles[PLAYER_NAME]
+    arena.set_paddle_input(PLAYER_NAME, 1)
+    step(arena, 2)
+    arena.set_paddle_input(PLAYER_NAME, 0)
+    rate = paddle.rate
+    step(arena, 2)
+    assert paddle.rate == rate
+    assert paddle.slot not in arena.game.moved_paddles
+
+
+def test_held_input_stops_at_the_end_of_the_axis(
+    create_arena: Callable[..., Arena],
+):
+    arena = create_arena()
+    paddle = arena.game.paddles[PLAYER_NAME]
+    arena.set_paddle_input(PLAYER_NAME, 1)
+    step(arena, int(10 / PHYSICS_STEP))
+    rate = paddle.rate
+    step(arena, 1)
+    assert 0 <= paddle.rate <= 1
+    assert paddle.rate == rate
+    # Not broadcast again while it cannot move
+    assert paddle.slot not in arena.game.moved_paddles
+
+
+@pytest.mark.parametrize("direction", [2, -2, "1", None])
+def test_invalid_input_is_a_lobby_error(
+    monkeypatch: pytest.MonkeyPatch, create_arena: Callable[..., Arena], direction
+):
+    arena = create_arena()
+    game = GameLogicInterface()
+    monkeypatch.setattr(game.monitor, "get_arena", lambda *_: arena)
+    game.lobby = arena  # type: ignore[assignment]
+    game.arena_id = arena.id
+    game.has_joined = True
+    with pytest.raises(LobbyError) as error:
+        game.set_paddle_input(PLAYER_NAME, direction)
+    assert error.value.code == INVALID_INPUT
+    assert arena.game.paddles[PLAYER_NAME].input == 0
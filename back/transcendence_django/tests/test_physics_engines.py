@@ -0,0 +1,89 @@
+import random
+
+import pytest
+from back_game.game_arena.game import Game
+from back_game.game_entities.ball_speed_randomizer import BallSpeedRandomizer
+from back_game.game_physics.physics_engine import ObjectPhysicsEngine
+from back_game.game_settings.game_constants import LEFT_SLOT, PHYSICS_STEP, RIGHT_SLOT
+from transcendence_django.dict_keys import NB_PLAYERS, OPTIONS
+
+np = pytest.importorskip("numpy")
+
+# pylint: disable-next=wrong-import-position
+from back_game.game_physics.numpy_engine import NumpyPhysicsEngine  # noqa: E402
+
+NB_STEPS = 1000
+
+
+def create_games(seed: int) -> list[Game]:
+    BallSpeedRandomizer.seed(seed)
+    games = []
+    for nb_players in (2, 3, 4):
+        for paddle_size in range(5):
+            for ball_speed in range(5):
+                games.append(
+                    Game(
+                        {
+                            NB_PLAYERS: nb_players,
+                            OPTIONS: {
+                                "paddle_size": paddle_size,
+                                "ball_speed": ball_speed,
+                                "is_private": False,
+                            },
+                        }
+                    )
+                )
+    return games
+
+
+def move_paddles(games: list[Game], rng: random.Random):
+    for game in games:
+        ball = game.ball
+        for paddle in game.paddles.values():
+            if rng.random() < 0.3:
+                continue
+            position = paddle.get_position()
+            if paddle.slot in (LEFT_SLOT, RIGHT_SLOT):
+                direction = 1 if ball.position.y > position.y else -1
+            else:
+                direction = 1 if ball.position.x > position.x else -1
+            paddle.move(direction)
+
+
+def get_state(game: Game) -> tuple:
+    ball = game.ball
+    return (
+        ball.position.x,
+        ball.position.y,
+        ball.speed.x,
+        ball.speed.y,
+        ball.speed.absolute_velocity,
+        ball.speed_rate,
+        ball.player_turn,
+    )
+
+
+def run(engine, seed: int) -> list[tuple]:
+    games = create_games(seed)
+    rng = random.Random(seed)
+    history = []
+    for _ in range(NB_STEPS):
+        move_paddles(games, rng)
+        collided_slots = engine.step(games, PHYSICS_STEP)
+        history.append((collided_slots, [get_state(game) for game in games]))
+    return history
+
+
+@pytest.mark.parametrize("seed", [0, 42, 2024])
+def test_numpy_engine_matches_object_engine(seed):
+    expected = run(ObjectPhysicsEngine(), seed)
+    actual = run(NumpyPhysicsEngine(capacity=4, max_paddles=2), seed)
+    for step, (expected_step, actual_step) in enumerate(zip(expected, actual)):
+        assert actual_step == expected_step, f"Engines diverged at step {step}"
+
+
+def test_engines_score_and_bounce():
+    history = run(ObjectPhysicsEngine(), 7)
+    collided_slots = {slot for slots, _ in history for slot in slots}
+    assert {1, 2} <= collided_slots
+    assert len({state for _, states in history for state in states}) > NB_STEPS
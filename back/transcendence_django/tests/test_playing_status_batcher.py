@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any
+
+import pytest
+from back_game.game_settings.game_constants import PLAYING_STATUS_BATCH_SIZE
+from back_game.monitor import playing_status_batcher
+from back_game.monitor.playing_status_batcher import PlayingStatusBatcher
+from back_game.monitor.service_client import ServiceError
+from transcendence_django.dict_keys import IS_PLAYING, USER_ID
+
+
+class FakeServiceClient:
+    def __init__(self, error: Exception | None = None):
+        self.calls: list[dict[int, int]] = []
+        self.error = error
+
+    async def get_json(self, _url: str, _path: str, params: list[tuple[str, Any]]):
+        user_ids = [value for key, value in params if key == USER_ID]
+        statuses = [value for key, value in params if key == IS_PLAYING]
+        self.calls.append(dict(zip(user_ids, statuses)))
+        if self.error is not None:
+            raise self.error
+        return {}
+
+
+@pytest.fixture(autouse=True)
+def no_flush_delay(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(playing_status_batcher, "PLAYING_STATUS_FLUSH_DELAY", 0)
+
+
+async def flush(batcher: PlayingStatusBatcher):
+    assert batcher.task is not None
+    await asyncio.wait_for(batcher.task, 1)
+
+
+@pytest.mark.asyncio
+async def test_latest_status_of_each_user_is_sent_once():
+    client = FakeServiceClient()
+    batcher = PlayingStatusBatcher(client)  # type: ignore[arg-type]
+    batcher.update(1, True)
+    batcher.update(2, True)
+    batcher.update(1, False)
+    await flush(batcher)
+    assert client.calls == [{1: 0, 2: 1}]
+    assert batcher.get_stats() == {
+        "requested_updates": 3,
+        "pending_updates": 0,
+        "sent_updates": 2,
+        "calls": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_statuses_are_sent_in_batches():
+    client = FakeServiceClient()
+    batcher = PlayingStatusBatcher(client)  # type: ignore[arg-type]
+    nb_users = PLAYING_STATUS_BATCH_SIZE * 2 + 1
+    for user_id in range(nb_users):
+        batcher.update(user_id, True)
+    await flush(batcher)
+    assert [len(call) for call in client.calls] == [
+        PLAYING_STATUS_BATCH_SIZE,
+        PLAYING_STATUS_BATCH_SIZE,
+        1,
+    ]
+    assert batcher.sent_updates == nb_users
+
+
+@pytest.mark.asyncio
+async def test_failed_call_does_not_stop_the_batcher():
+    client = FakeServiceClient(ServiceError("User service unavailable"))
+    batcher = PlayingStatusBatcher(client)  # type: ignore[arg-type]
+    batcher.update(1, True)
+    await flush(batcher)
+    assert batcher.sent_updates == 0
+    client.error = None
+    batcher.update(1, False)
+    await flush(batcher)
+    assert client.calls[-1] == {1: 0}
+    assert batcher.sent_updates == 1
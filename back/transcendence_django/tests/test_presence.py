@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import fakeredis
+import pytest
+from back_friends import consumers
+from back_friends.consumers import PresenceConsumer
+from channels.testing import WebsocketCommunicator
+from shared_models import presence
+from shared_models.constants import PRESENCE_TTL
+from shared_models.presence import PresenceStore
+from transcendence_django.dict_keys import HEARTBEAT, TYPE
+
+
+class Clock:
+
+    def __init__(self):
+        self.now: float = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeUser:
+    is_authenticated = True
+
+    def __init__(self, user_id: int):
+        self.id = user_id
+
+    def get_friends_presence(self) -> list[dict[str, Any]]:
+        return []
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(presence, "time", SimpleNamespace(time=clock))
+    return clock
+
+
+@pytest.fixture(name="store")
+def fixture_store(monkeypatch, clock: Clock) -> PresenceStore:
+    redis = fakeredis.FakeRedis()
+    monkeypatch.setattr(presence, "get_redis_connection", lambda _alias: redis)
+    monkeypatch.setattr(PresenceStore, "INSTANCE", None)
+    return presence.get_presence_store()
+
+
+@pytest.fixture(name="announced")
+def fixture_announced(monkeypatch, settings, store: PresenceStore) -> Iterator[list]:
+    settings.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+    announced: list[int] = []
+    monkeypatch.setattr(consumers, "announce_presence", announced.append)
+    monkeypatch.setattr(consumers, "PRESENCE_SWEEP_INTERVAL", 0.01)
+    monkeypatch.setattr(PresenceConsumer, "sweeper", None)
+    yield announced
+    if PresenceConsumer.sweeper is not None:
+        PresenceConsumer.sweeper.cancel()
+
+
+def test_user_is_online_while_a_connection_is(store: PresenceStore):
+    assert store.connect(1, "first")
+    assert not store.connect(1, "second")
+    assert not store.disconnect(1, "first")
+    assert store.get_online([1, 2]) == {1}
+    assert store.disconnect(1, "second")
+    assert store.get_online([1, 2]) == set()
+    assert store.pop_expired() == []
+
+
+def test_expired_connections_are_swept_once(store: PresenceStore, clock: Clock):
+    store.connect(1, "first")
+    store.connect(2, "first")
+    clock.now += PRESENCE_TTL / 2
+    # Heartbeat of the second user
+    store.connect(2, "first")
+    clock.now += PRESENCE_TTL / 2 + 1
+    assert store.get_online([1, 2]) == {2}
+    assert store.pop_expired() == [1]
+    assert store.pop_expired() == []
+    # Announced by the sweep already
+    assert not store.disconnect(1, "first")
+    clock.now += PRESENCE_TTL
+    assert store.pop_expired() == [2]
+
+
+async def connect(user_id: int) -> WebsocketCommunicator:
+    communicator = WebsocketCommunicator(PresenceConsumer.as_asgi(), "/ws/presence/")
+    communicator.scope["user"] = FakeUser(user_id)
+    connected, _ = await communicator.connect()
+    assert connected
+    await communicator.receive_json_from()  # Snapshot of the friends
+    return communicator
+
+
+@pytest.mark.asyncio
+async def test_last_connection_closing_announces_the_user(announced: list[int]):
+    first, second = await connect(1), await connect(1)
+    await first.send_json_to({TYPE: HEARTBEAT})
+    assert announced == [1]
+    await first.disconnect()
+    assert announced == [1]
+    await second.disconnect()
+    assert announced == [1, 1]
+
+
+@pytest.mark.asyncio
+async def test_sweeper_announces_the_expired_users(
+    announced: list[int], store: PresenceStore, clock: Clock
+):
+    communicator = await connect(1)
+    assert announced == [1]
+    clock.now += PRESENCE_TTL + 1
+    for _ in range(100):
+        if len(announced) == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert announced == [1, 1]
+    assert store.get_online([1]) == set()
+    # Already announced offline by the sweeper
+    await communicator.disconnect()
+    assert announced == [1, 1]
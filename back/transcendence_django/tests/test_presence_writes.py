@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+
+import pytest
+from django.db import DatabaseError
+from shared_models.presence_writes import PresenceWriteBuffer
+
+
+class FakeQuerySet(list):
+    def only(self, *_fields: str) -> "FakeQuerySet":
+        return self
+
+
+class FakeManager:
+    def __init__(self):
+        self.users: dict[int, "FakeUser"] = {}
+        self.updates: list[tuple[str, dict[int, object]]] = []
+        self.notified: list[tuple[int, str]] = []
+        self.error: Exception | None = None
+
+    def filter(self, id__in: dict[int, bool]) -> FakeQuerySet:
+        # Fresh instances, as read from the database
+        return FakeQuerySet(
+            FakeUser(user_id, self.users[user_id].is_playing)
+            for user_id in id__in
+            if user_id in self.users
+        )
+
+    def bulk_update(self, users: list["FakeUser"], fields: list[str], batch_size: int):
+        if self.error is not None:
+            raise self.error
+        (field,) = fields
+        values = {user.id: getattr(user, field) for user in users}
+        for user_id, value in values.items():
+            setattr(self.users[user_id], field, value)
+        self.updates.append((field, values))
+
+
+class FakeUser:
+    objects = FakeManager()
+
+    def __init__(self, id: int, is_playing: bool = False, last_seen=None):
+        self.id = id
+        self.username = f"user{id}"
+        self.is_playing = is_playing
+        self.last_seen = last_seen
+
+    def get_presence(self) -> str:
+        return "playing" if self.is_playing else "online"
+
+    def notify_friends(self, presence: str):
+        FakeUser.objects.notified.append((self.id, presence))
+
+
+@pytest.fixture(name="buffer")
+def fixture_buffer() -> PresenceWriteBuffer:
+    FakeUser.objects = FakeManager()
+    for user_id in (1, 2, 3):
+        FakeUser.objects.users[user_id] = FakeUser(user_id)
+    buffer = PresenceWriteBuffer()
+    buffer.custom_user_model = FakeUser
+    # Flushed by the tests instead of the background thread
+    buffer.thread = object()  # type: ignore[assignment]
+    return buffer
+
+
+def test_latest_values_are_written_once(buffer: PresenceWriteBuffer):
+    last_seen = datetime.now(timezone.utc)
+    buffer.set_playing(1, True)
+    buffer.set_playing(1, False)
+    buffer.set_playing(1, True)
+    buffer.set_playing(2, False)
+    buffer.touch(3, datetime(2024, 1, 1, tzinfo=timezone.utc))
+    buffer.touch(3, last_seen)
+    buffer.flush()
+    # User 2 was not playing already
+    assert FakeUser.objects.updates == [
+        ("is_playing", {1: True}),
+        ("last_seen", {3: last_seen}),
+    ]
+    assert FakeUser.objects.notified == [(1, "playing")]
+    stats = buffer.get_stats()
+    assert stats["requested_writes"] == 6
+    assert stats["pending_writes"] == 0
+    assert stats["row_writes"] == 2
+    assert stats["writes_saved"] == 4
+    assert stats["flushes"] == 1
+
+
+def test_discarded_last_seen_is_not_written(buffer: PresenceWriteBuffer):
+    buffer.touch(3, datetime.now(timezone.utc))
+    buffer.discard_last_seen(3)
+    buffer.flush()
+    assert not FakeUser.objects.updates
+    assert buffer.get_stats()["flushes"] == 0
+
+
+def test_failed_flush_keeps_newer_values(buffer: PresenceWriteBuffer):
+    buffer.set_playing(1, True)
+    buffer.set_playing(2, True)
+    FakeUser.objects.error = DatabaseError("Database unavailable")
+    buffer.flush()
+    assert buffer.get_stats()["pending_writes"] == 2
+    buffer.set_playing(2, False)
+    FakeUser.objects.error = None
+    buffer.flush()
+    assert FakeUser.objects.updates == [("is_playing", {1: True})]
+    assert FakeUser.objects.notified == [(1, "playing")]
+    assert buffer.get_stats()["pending_writes"] == 0
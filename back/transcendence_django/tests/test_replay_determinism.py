@@ -0,0 +1,85 @@
+import random
+from typing import Any, Callable
+
+import pytest
+from back_game.game_arena.arena import Arena
+from back_game.game_arena.replay_engine import ReplayEngine
+from back_game.game_arena.replay_log import ReplayLog
+from back_game.game_settings.game_constants import (
+    PHYSICS_STEP,
+    REPLAY_KEYFRAME_INTERVAL,
+)
+from back_game.monitor.bot_driver import BotDriver
+
+NB_STEPS = REPLAY_KEYFRAME_INTERVAL * 4
+SAMPLED_STEPS = 50
+
+
+def get_state(game, scores: dict[int, int]) -> dict[str, Any]:
+    ball = game.ball
+    return {
+        "ball": (
+            ball.position.x,
+            ball.position.y,
+            ball.speed.x,
+            ball.speed.y,
+            ball.speed_rate,
+        ),
+        "paddles": {paddle.slot: paddle.rate for paddle in game.paddles.values()},
+        "scores": {slot: score for slot, score in scores.items() if score},
+    }
+
+
+def play_match(
+    create_arena: Callable[..., Arena], seed: int
+) -> tuple[Arena, dict[int, dict[str, Any]]]:
+    """
+    Plays a match between two bots, the first one also moving with the
+    legacy move_paddle now and then, and returns the state of the game
+    at each step, once the inputs of the step are applied.
+    """
+    bot_driver = BotDriver()
+    arena = create_arena(seed, bot_driver)
+    bots = bot_driver.bots[arena.id]
+    rng = random.Random(seed)
+    states: dict[int, dict[str, Any]] = {}
+    scores: dict[int, int] = {}
+    while arena.step_count < NB_STEPS and not arena.can_be_over():
+        bot_driver.play([arena], PHYSICS_STEP)
+        if rng.random() < 0.1:
+            arena.game.reset_paddles_statuses()
+            arena.move_paddle(bots[0].player_name, rng.choice((-1, 1)))
+        states[arena.step_count] = get_state(arena.game, scores)
+        arena.move_paddles()
+        collided_slot = arena.game.update(PHYSICS_STEP)
+        arena.apply_step(collided_slot)
+        if collided_slot is not None:
+            scores[collided_slot] = scores.get(collided_slot, 0) + 1
+    arena.conclude_game()
+    return arena, states
+
+
+@pytest.mark.parametrize("seed", [1, 42, 2024])
+def test_replay_rebuilds_the_played_steps(
+    create_arena: Callable[..., Arena], seed: int
+):
+    arena, states = play_match(create_arena, seed)
+    assert arena.replay_data is not None
+    engine = ReplayEngine(ReplayLog(arena.replay_data))
+    steps = sorted(random.Random(seed).sample(list(states), SAMPLED_STEPS))
+    for step in steps:
+        cursor = engine.seek(step)
+        assert cursor.step == step
+        assert get_state(cursor.game, cursor.scores) == states[step], step
+
+
+def test_replay_is_played_the_same_from_a_keyframe_or_the_start(
+    create_arena: Callable[..., Arena],
+):
+    arena, states = play_match(create_arena, 7)
+    assert arena.replay_data is not None
+    engine = ReplayEngine(ReplayLog(arena.replay_data))
+    cursor = engine.seek(0)
+    for step in range(0, max(states) + 1, REPLAY_KEYFRAME_INTERVAL // 2):
+        cursor.step_to(step)
+        assert get_state(cursor.game, cursor.scores) == states[step], step
@@ -0,0 +1,190 @@
+import asyncio
+import json
+from typing import Callable, Iterator
+
+import pytest
+from back_game.app_settings.replay_consumer import ReplayConsumer
+from back_game.game_arena.arena import Arena
+from back_game.game_arena.replay_log import ReplayLog
+from back_game.game_settings.game_constants import (
+    INVALID_REPLAY,
+    INVALID_REPLAY_MESSAGE,
+    INVALID_REPLAY_SPEED,
+    INVALID_REPLAY_TIME,
+    PHYSICS_STEP,
+    REPLAY_CHUNK_FRAMES,
+    REPLAY_FRAME_RATE,
+    REPLAY_FRAME_STEPS,
+    REPLAY_MAX_SPEED,
+)
+from back_game.monitor.bot_driver import BotDriver
+from back_game.monitor.replay_hub import ReplayHub, ReplayStream, get_replay_hub
+from channels.testing import WebsocketCommunicator
+from transcendence_django.dict_keys import (
+    ERROR,
+    GAME_ERROR,
+    LOBBY_ERROR_CODE,
+    MESSAGE,
+    PAUSE,
+    REPLAY,
+    REPLAY_OVER,
+    SEEK,
+    SPEED,
+    TIME,
+    TYPE,
+    UPDATE,
+)
+
+NB_STEPS = REPLAY_CHUNK_FRAMES * REPLAY_FRAME_STEPS * 2
+
+
+def play_steps(arena: Arena, bot_driver: BotDriver, nb_steps: int):
+    for _ in range(nb_steps):
+        bot_driver.play([arena], PHYSICS_STEP)
+        arena.move_paddles()
+        arena.apply_step(arena.game.update(PHYSICS_STEP))
+
+
+def create_stream(create_arena: Callable[..., Arena], seed: int = 1) -> ReplayStream:
+    bot_driver = BotDriver()
+    arena = create_arena(seed, bot_driver)
+    play_steps(arena, bot_driver, NB_STEPS)
+    arena.conclude_game()
+    assert arena.replay_data is not None
+    return ReplayStream(arena.get_replay_name(), ReplayLog(arena.replay_data))
+
+
+def get_time(frame: str) -> float:
+    return json.loads(frame)[UPDATE][TIME]
+
+
+@pytest.mark.asyncio
+async def test_frames_follow_the_game_to_its_end(create_arena: Callable[..., Arena]):
+    stream = create_stream(create_arena)
+    frame_count = stream.get_frame_count()
+    assert frame_count == NB_STEPS // REPLAY_FRAME_STEPS + 1
+    for index in (0, 1, REPLAY_CHUNK_FRAMES, frame_count - 1):
+        frame = await stream.get_frame(index)
+        assert frame is not None
+        assert get_time(frame) == pytest.approx(index / REPLAY_FRAME_RATE)
+    assert await stream.get_frame(frame_count) is None
+    assert await stream.get_frame(frame_count + REPLAY_CHUNK_FRAMES) is None
+
+
+@pytest.mark.asyncio
+async def test_chunk_is_decoded_once_for_concurrent_viewers(
+    create_arena: Callable[..., Arena],
+):
+    stream = create_stream(create_arena)
+    frames = await asyncio.gather(*(stream.get_frame(index) for index in range(8)))
+    assert all(frame is not None for frame in frames)
+    assert stream.decoded_chunks == 1
+
+
+@pytest.mark.asyncio
+async def test_live_stream_follows_the_game(create_arena: Callable[..., Arena]):
+    bot_driver = BotDriver()
+    arena = create_arena(3, bot_driver)
+    hub = ReplayHub()
+    stream = hub.open_live(arena)
+    assert stream.is_live()
+    assert await stream.get_frame(0) is None
+    log = stream.log
+    await stream.refresh()
+    assert stream.log is log  # Not read again without new steps
+    play_steps(arena, bot_driver, REPLAY_CHUNK_FRAMES * REPLAY_FRAME_STEPS)
+    await stream.refresh()
+    assert stream.log is log  # Read again only by the next decode
+    frame = await stream.get_frame(REPLAY_CHUNK_FRAMES - 1)
+    assert frame is not None
+    assert stream.log is not log
+    assert stream.get_frame_count() is None
+    arena.conclude_game()
+    await stream.refresh()
+    assert not stream.is_live()
+    assert stream.get_frame_count() == REPLAY_CHUNK_FRAMES + 1
+    hub.close(stream)
+    assert not hub.streams
+
+
+@pytest.fixture(name="stream")
+def fixture_stream(
+    settings, create_arena: Callable[..., Arena]
+) -> Iterator[ReplayStream]:
+    settings.CHANNEL_LAYERS = {
+        "default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}
+    }
+    stream = create_stream(create_arena)
+    get_replay_hub().streams[stream.name] = stream
+    yield stream
+    get_replay_hub().streams.pop(stream.name, None)
+
+
+async def connect(stream: ReplayStream) -> WebsocketCommunicator:
+    communicator = WebsocketCommunicator(
+        ReplayConsumer.as_asgi(), f"/ws/game/replay/{stream.name}/"
+    )
+    communicator.scope["url_route"] = {"kwargs": {"replay_name": stream.name}}
+    connected, _ = await communicator.connect()
+    assert connected
+    info = await communicator.receive_json_from()
+    assert info[UPDATE][REPLAY][SPEED] == 1
+    return communicator
+
+
+async def receive_frame(communicator: WebsocketCommunicator) -> dict:
+    update = await communicator.receive_json_from()
+    while TIME not in update[UPDATE]:
+        update = await communicator.receive_json_from()
+    return update
+
+
+@pytest.mark.asyncio
+async def test_viewer_seeks_and_gets_errors(stream: ReplayStream):
+    communicator = await connect(stream)
+    await communicator.send_json_to({TYPE: PAUSE, MESSAGE: {}})
+    await communicator.send_json_to({TYPE: SEEK, MESSAGE: {TIME: 1.0}})
+    update = await receive_frame(communicator)
+    while update[UPDATE][TIME] < 1.0:
+        update = await receive_frame(communicator)
+    assert update[UPDATE][TIME] == pytest.approx(1.0)
+    await communicator.send_json_to({TYPE: PAUSE, MESSAGE: {}})
+    while not await communicator.receive_nothing(0.1):
+        pass
+    for content, message in (
+        ({TYPE: SEEK, MESSAGE: {TIME: -1}}, INVALID_REPLAY_TIME),
+        ({TYPE: SEEK, MESSAGE: {TIME: True}}, INVALID_REPLAY_TIME),
+        ({TYPE: SEEK, MESSAGE: {}}, INVALID_REPLAY_TIME),
+        ({TYPE: SPEED, MESSAGE: {SPEED: REPLAY_MAX_SPEED + 1}}, INVALID_REPLAY_SPEED),
+        ({TYPE: SPEED, MESSAGE: {SPEED: True}}, INVALID_REPLAY_SPEED),
+        ({TYPE: "unknown", MESSAGE: {}}, INVALID_REPLAY_MESSAGE),
+        ({TYPE: SEEK}, INVALID_REPLAY_MESSAGE),
+    ):
+        await communicator.send_json_to(content)
+        error = await communicator.receive_json_from()
+        assert error[TYPE] == GAME_ERROR
+        assert error[ERROR] == {LOBBY_ERROR_CODE: INVALID_REPLAY, MESSAGE: message}
+    await communicator.send_to(text_data="not json")
+    error = await communicator.receive_json_from()
+    assert error[ERROR][MESSAGE] == INVALID_REPLAY_MESSAGE
+    await communicator.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_viewer_sees_the_last_frame_at_any_speed(stream: ReplayStream):
+    communicator = await connect(stream)
+    await communicator.send_json_to({TYPE: SPEED, MESSAGE: {SPEED: REPLAY_MAX_SPEED}})
+    frame_count = stream.get_frame_count()
+    assert frame_count is not None
+    # Past the end, clamped to the last frame
+    await communicator.send_json_to({TYPE: SEEK, MESSAGE: {TIME: 3600}})
+    update = await communicator.receive_json_from()
+    while not update[UPDATE].get(REPLAY_OVER):
+        last_update = update
+        update = await communicator.receive_json_from()
+    assert last_update[UPDATE][TIME] == pytest.approx(
+        (frame_count - 1) / REPLAY_FRAME_RATE
+    )
+    assert stream.viewers == 1
+    await communicator.disconnect()
+    assert stream.name not in get_replay_hub().streams
@@ -0,0 +1,177 @@
+import asyncio
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+import pytest
+from back_game.game_settings.game_constants import (
+    SERVICE_FAILURE_THRESHOLD,
+    SERVICE_RESET_TIMEOUT,
+)
+from back_game.monitor import service_client
+from back_game.monitor.service_client import CircuitBreaker, ServiceClient, ServiceError
+
+BASE_URL = "https://service"
+
+
+class Clock:
+
+    def __init__(self):
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeResponse:
+
+    def __init__(self, status: int, content: Any = None):
+        self.status = status
+        self.content = content
+
+    async def json(self, content_type: str | None = None) -> Any:
+        return self.content
+
+
+class FakeRequest:
+
+    def __init__(self, session: "FakeSession"):
+        self.session = session
+
+    async def __aenter__(self) -> FakeResponse:
+        result = await self.session.results.get()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def __aexit__(self, *_):
+        return False
+
+
+class FakeSession:
+    """
+    Answers each request with the next queued response or error, and
+    waits for it when there is none.
+    """
+
+    def __init__(self):
+        self.results: asyncio.Queue[FakeResponse | Exception] = asyncio.Queue()
+        self.requests: int = 0
+
+    def get(self, _url: str, **_kwargs: Any) -> FakeRequest:
+        self.requests += 1
+        return FakeRequest(self)
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch) -> Clock:
+    clock = Clock()
+    # Not time.monotonic itself, that the event loop reads too
+    monkeypatch.setattr(service_client, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def create_client() -> tuple[ServiceClient, FakeSession]:
+    client = ServiceClient()
+    session = FakeSession()
+    client._ServiceClient__get_session = lambda: session  # type: ignore[attr-defined]
+    return client, session
+
+
+def open_breaker(breaker: CircuitBreaker):
+    for _ in range(SERVICE_FAILURE_THRESHOLD):
+        breaker.record_failure()
+
+
+def test_breaker_opens_at_the_failure_threshold(clock: Clock):
+    breaker = CircuitBreaker(BASE_URL)
+    for _ in range(SERVICE_FAILURE_THRESHOLD - 1):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.opened_at == clock.now
+    assert not breaker.allow()
+
+
+def test_breaker_lets_one_trial_through_after_the_reset_timeout(clock: Clock):
+    breaker = CircuitBreaker(BASE_URL)
+    open_breaker(breaker)
+    clock.now += SERVICE_RESET_TIMEOUT - 0.1
+    assert not breaker.allow()
+    clock.now += 0.1
+    assert breaker.allow()
+    assert breaker.trial_running
+    assert not breaker.allow()
+
+
+def test_breaker_closes_when_the_trial_succeeds(clock: Clock):
+    breaker = CircuitBreaker(BASE_URL)
+    open_breaker(breaker)
+    clock.now += SERVICE_RESET_TIMEOUT
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.opened_at is None
+    assert breaker.failures == 0
+    assert not breaker.trial_running
+    assert breaker.allow()
+
+
+def test_breaker_reopens_when_the_trial_fails(clock: Clock):
+    breaker = CircuitBreaker(BASE_URL)
+    open_breaker(breaker)
+    clock.now += SERVICE_RESET_TIMEOUT
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.opened_at == clock.now
+    assert not breaker.trial_running
+    assert not breaker.allow()
+    clock.now += SERVICE_RESET_TIMEOUT
+    assert breaker.allow()
+
+
+@pytest.mark.asyncio
+async def test_client_rejects_calls_while_open(clock: Clock):
+    client, session = create_client()
+    for _ in range(SERVICE_FAILURE_THRESHOLD):
+        session.results.put_nowait(FakeResponse(HTTPStatus.BAD_GATEWAY))
+        with pytest.raises(ServiceError):
+            await client.get_json(BASE_URL, "/path")
+    with pytest.raises(ServiceError, match="unavailable"):
+        await client.get_json(BASE_URL, "/path")
+    assert session.requests == SERVICE_FAILURE_THRESHOLD
+    # Answered, even not found: the service is up again
+    clock.now += SERVICE_RESET_TIMEOUT
+    session.results.put_nowait(FakeResponse(HTTPStatus.NOT_FOUND))
+    with pytest.raises(ServiceError, match="404"):
+        await client.get_json(BASE_URL, "/path")
+    session.results.put_nowait(FakeResponse(HTTPStatus.OK, {"ok": True}))
+    assert await client.get_json(BASE_URL, "/path") == {"ok": True}
+
+
+@pytest.mark.asyncio
+async def test_client_counts_transport_errors(clock: Clock):
+    client, session = create_client()
+    for _ in range(SERVICE_FAILURE_THRESHOLD):
+        session.results.put_nowait(aiohttp.ClientConnectionError("refused"))
+        with pytest.raises(ServiceError):
+            await client.get_json(BASE_URL, "/path")
+    assert client.breakers[BASE_URL].opened_at == clock.now
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_lets_the_next_one_through(clock: Clock):
+    client, session = create_client()
+    breaker = client.breakers[BASE_URL] = CircuitBreaker(BASE_URL)
+    open_breaker(breaker)
+    clock.now += SERVICE_RESET_TIMEOUT
+    trial = asyncio.create_task(client.get_json(BASE_URL, "/path"))
+    await asyncio.sleep(0)
+    assert breaker.trial_running
+    trial.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await trial
+    assert not breaker.trial_running
+    session.results.put_nowait(FakeResponse(HTTPStatus.OK, []))
+    assert await client.get_json(BASE_URL, "/path") == []
+    assert breaker.opened_at is None
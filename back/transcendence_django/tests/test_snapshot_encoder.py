@@ -0,0 +1,125 @@
+from back_game.app_settings.snapshot_encoder import (
+    ARENA_ID_FIELD,
+    ARENA_ID_VALUE,
+    BALL_FIELD,
+    BALL_SCALE,
+    BALL_VALUE,
+    HEADER,
+    MAX_ARENA_REFS,
+    PADDLE_COUNT_VALUE,
+    PADDLE_VALUE,
+    PADDLES_FIELD,
+    SnapshotEncoder,
+)
+from back_game.monitor.tick_scheduler import get_tick_scheduler
+from transcendence_django.dict_keys import (
+    ARENA_ID,
+    BALL,
+    PADDLES,
+    POSITION,
+    SCORE,
+    SLOT,
+)
+
+ARENA = "42"
+
+
+def create_update(ball: tuple[float, float], *paddles: tuple[int, int, int]):
+    return {
+        ARENA_ID: ARENA,
+        BALL: {POSITION: {"x": ball[0], "y": ball[1]}},
+        PADDLES: [{SLOT: slot, POSITION: {"x": x, "y": y}} for slot, x, y in paddles],
+    }
+
+
+def read_paddles(frame: bytes, offset: int) -> list[tuple[int, int, int]]:
+    (count,) = PADDLE_COUNT_VALUE.unpack_from(frame, offset)
+    offset += PADDLE_COUNT_VALUE.size
+    paddles = [
+        PADDLE_VALUE.unpack_from(frame, offset + index * PADDLE_VALUE.size)
+        for index in range(count)
+    ]
+    assert offset + count * PADDLE_VALUE.size == len(frame)
+    return paddles
+
+
+def test_first_frame_carries_every_paddle():
+    encoder = SnapshotEncoder()
+    frame, remaining = encoder.encode(
+        create_update((600, 400), (1, 10, 400), (2, 1190, 400))
+    )
+    assert frame is not None and remaining == {}
+    arena_ref, field_mask = HEADER.unpack_from(frame)
+    assert arena_ref == 0
+    assert field_mask == ARENA_ID_FIELD | BALL_FIELD | PADDLES_FIELD
+    offset = HEADER.size
+    assert ARENA_ID_VALUE.unpack_from(frame, offset) == (int(ARENA),)
+    offset += ARENA_ID_VALUE.size
+    assert BALL_VALUE.unpack_from(frame, offset) == (600 * BALL_SCALE, 400 * BALL_SCALE)
+    offset += BALL_VALUE.size
+    assert read_paddles(frame, offset) == [(1, 10, 400), (2, 1190, 400)]
+
+
+def test_only_moved_paddles_are_sent():
+    encoder = SnapshotEncoder()
+    encoder.encode(create_update((600, 400), (1, 10, 400), (2, 1190, 400)))
+    frame, _ = encoder.encode(create_update((600, 400), (1, 10, 400), (2, 1190, 380)))
+    assert frame is not None
+    assert HEADER.unpack_from(frame) == (0, PADDLES_FIELD)
+    assert read_paddles(frame, HEADER.size) == [(2, 1190, 380)]
+    frame, _ = encoder.encode(create_update((600, 400), (1, 10, 400), (2, 1190, 380)))
+    assert frame is None
+
+
+def test_shared_cache_encodes_paddles_once():
+    encoders = [SnapshotEncoder(), SnapshotEncoder()]
+    cache: dict = {}
+    update = create_update((600, 400), (1, 10, 400))
+    frames = [encoder.encode(update, cache)[0] for encoder in encoders]
+    assert frames[0] is not None and frames[0] is frames[1]
+
+
+def test_invalid_paddles_stay_in_json():
+    encoder = SnapshotEncoder()
+    update = create_update((600, 400))
+    update[PADDLES] = [{SLOT: 1, POSITION: {"x": 10, "y": 100_000}}]
+    update[SCORE] = 1
+    frame, remaining = encoder.encode(update)
+    assert frame is not None
+    assert HEADER.unpack_from(frame)[1] == ARENA_ID_FIELD | BALL_FIELD
+    assert remaining == {PADDLES: update[PADDLES], SCORE: 1, ARENA_ID: ARENA}
+
+
+def test_ball_keeps_its_sub_pixel_moves():
+    encoder = SnapshotEncoder()
+    encoder.encode(create_update((600.25, 400)))
+    frame, _ = encoder.encode(create_update((600.5, 399.75)))
+    assert frame is not None
+    assert HEADER.unpack_from(frame) == (0, BALL_FIELD)
+    assert BALL_VALUE.unpack_from(frame, HEADER.size) == (
+        600.5 * BALL_SCALE,
+        399.75 * BALL_SCALE,
+    )
+    assert len(frame) == HEADER.size + BALL_VALUE.size
+    frame, _ = encoder.encode(create_update((600.5, 399.75)))
+    assert frame is None
+
+
+def test_removed_arena_frees_its_ref():
+    encoder = SnapshotEncoder()
+    for arena_id in range(MAX_ARENA_REFS):
+        update = create_update((600, 400))
+        update[ARENA_ID] = str(arena_id)
+        assert encoder.encode(update)[0] is not None
+    update = create_update((600, 400))
+    update[ARENA_ID] = str(MAX_ARENA_REFS)
+    assert encoder.encode(update)[0] is None
+    get_tick_scheduler().remove_arena("7")
+    assert "7" not in encoder.arena_refs
+    frame, _ = encoder.encode(update)
+    assert frame is not None
+    assert HEADER.unpack_from(frame) == (7, ARENA_ID_FIELD | BALL_FIELD)
+    assert ARENA_ID_VALUE.unpack_from(frame, HEADER.size) == (MAX_ARENA_REFS,)
+    # Not sent to a freed ref again
+    update[ARENA_ID] = "7"
+    assert encoder.encode(update)[0] is None
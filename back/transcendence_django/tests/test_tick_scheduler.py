@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Callable
+
+import pytest
+from back_game.game_arena.arena import Arena
+from back_game.game_arena.game import Game
+from back_game.game_physics.physics_engine import ObjectPhysicsEngine
+from back_game.game_settings.game_constants import PHYSICS_STEP, GameStatus
+from back_game.monitor.tick_scheduler import TickScheduler
+
+
+def get_state(arena: Arena) -> tuple:
+    ball = arena.game.ball
+    return (
+        ball.position.x,
+        ball.position.y,
+        ball.speed.x,
+        ball.speed.y,
+        tuple(paddle.rate for paddle in arena.game.paddles.values()),
+    )
+
+
+def fail(*_):
+    raise RuntimeError("Arena failure")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("method", ["advance_clock", "move_paddles", "collect_update"])
+async def test_failing_arena_is_ended_alone(
+    create_arena: Callable[..., Arena], method: str
+):
+    scheduler = TickScheduler()
+    arena, failing_arena = create_arena(1), create_arena(2)
+    setattr(failing_arena, method, fail)
+    scheduler.arenas = {arena.id: arena, failing_arena.id: failing_arena}
+    scheduler.last_tick_time = time.monotonic() - 0.1
+    await scheduler.tick()
+    assert failing_arena.id not in scheduler.arenas
+    assert failing_arena.get_status() == GameStatus.OVER
+    assert arena.id in scheduler.arenas
+    assert arena.get_status() == GameStatus.STARTED
+    assert arena.step_count > 0
+
+
+class BatchFailingEngine(ObjectPhysicsEngine):
+    """
+    Fails whole batches holding the failing game, before stepping any.
+    """
+
+    def __init__(self, failing_game: Game):
+        self.failing_game = failing_game
+
+    def step(self, games: list[Game], dt: float) -> list[int | None]:
+        if self.failing_game in games:
+            raise RuntimeError("Batch failure")
+        return super().step(games, dt)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_batch_failure", [False, True])
+async def test_failing_step_does_not_step_the_others_twice(
+    create_arena: Callable[..., Arena], is_batch_failure: bool
+):
+    scheduler = TickScheduler()
+    arenas = [create_arena(seed) for seed in (1, 2, 3)]
+    failing_arena = arenas[1]
+    if is_batch_failure:
+        scheduler.physics_engine = BatchFailingEngine(failing_arena.game)
+    else:
+        # Stepped in the middle of the batch, after the first arena
+        failing_arena.game.update = fail  # type: ignore[method-assign]
+    scheduler.arenas = {arena.id: arena for arena in arenas}
+    scheduler.last_tick_time = time.monotonic() - PHYSICS_STEP * 1.5
+    await scheduler.tick()
+    assert failing_arena.id not in scheduler.arenas
+    assert failing_arena.get_status() == GameStatus.OVER
+    assert failing_arena.step_count == 0
+    for arena, seed in ((arenas[0], 1), (arenas[2], 3)):
+        assert arena.id in scheduler.arenas
+        assert arena.step_count == 1
+        twin_arena = create_arena(seed)
+        twin_arena.move_paddles()
+        twin_arena.apply_step(twin_arena.game.update(PHYSICS_STEP))
+        assert get_state(arena) == get_state(twin_arena)
+
+
+@pytest.mark.asyncio
+async def test_crashed_loop_is_restarted(create_arena: Callable[..., Arena]):
+    scheduler = TickScheduler()
+    arena = create_arena(1)
+    ticks: list[int] = []
+    tick = scheduler.tick
+
+    async def crashing_tick():
+        ticks.append(len(ticks))
+        if len(ticks) == 1:
+            raise RuntimeError("Scheduler failure")
+        await tick()
+
+    scheduler.tick = crashing_tick  # type: ignore[method-assign]
+    scheduler.add_arena(arena)
+    await asyncio.sleep(0.05)
+    assert len(ticks) > 1
+    assert arena.step_count > 0
+    assert scheduler.task is not None and not scheduler.task.done()
+    scheduler.arenas.clear()
+    await scheduler.task
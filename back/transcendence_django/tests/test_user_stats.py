@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from shared_models.models import (
+    CustomUser,
+    GameSummary,
+    UserStats,
+    get_stat_increments,
+)
+from transcendence_django.dict_keys import LOCAL, LOSS, REMOTE, TIE, TOTAL, WIN
+
+START_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def create_summary(is_remote: bool, winner_user_id: int | None) -> GameSummary:
+    return GameSummary(
+        winner_user_id=winner_user_id,
+        players=[],
+        start_time=START_TIME,
+        end_time=START_TIME + timedelta(seconds=90),
+        is_remote=is_remote,
+    )
+
+
+@pytest.mark.parametrize(
+    "is_remote, winner_user_id, expected",
+    [
+        (False, 1, {"local_time_played": 90, "local_games": 1}),
+        (True, 1, {"remote_time_played": 90, "remote_games": 1, "wins": 1}),
+        (True, 2, {"remote_time_played": 90, "remote_games": 1, "losses": 1}),
+        (True, None, {"remote_time_played": 90, "remote_games": 1, "ties": 1}),
+    ],
+)
+def test_stat_increments(
+    is_remote: bool, winner_user_id: int | None, expected: dict[str, int]
+):
+    assert get_stat_increments(1, create_summary(is_remote, winner_user_id)) == expected
+
+
+def test_stats_from_legacy_counters():
+    user = CustomUser(
+        id=1,
+        time_played={LOCAL: 60, REMOTE: 120, TOTAL: 180},
+        game_counter={LOCAL: 2, REMOTE: 3, TOTAL: 5},
+        win_loss_tie={WIN: 1, LOSS: 1, TIE: 1, TOTAL: 3},
+    )
+    stats = UserStats.from_legacy_counters(user)
+    assert stats.get_time_played() == user.time_played
+    assert stats.get_game_counter() == user.game_counter
+    assert stats.get_win_loss_tie() == user.win_loss_tie
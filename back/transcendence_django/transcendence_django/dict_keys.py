@@ -24,13 +24,19 @@ CODE = "code"
 # Game update
 GAME_UPDATE = "game_update"
 UPDATE = "update"
+ENCODED_UPDATE = "encoded_update"
 
 # Game message
 GAME_MESSAGE = "game_message"
 MOVE_PADDLE = "move_paddle"
+PADDLE_INPUT = "paddle_input"
 JOIN = "join"
 LEAVE = "leave"
 GIVE_UP = "give_up"
+RESYNC = "resync"
+SEEK = "seek"
+PAUSE = "pause"
+RESUME = "resume"
 REMATCH = "rematch"
 USER_ID = "user_id"
 ARENA_ID = "arena_id"
@@ -46,6 +52,10 @@ GAME_OVER = "game_over"
 WINNER = "winner"
 START_TIME = "start_time"
 TIME = "time"
+REPLAY = "replay"
+REPLAY_OVER = "replay_over"
+DURATION = "duration"
+IS_LIVE = "is_live"
 
 # Game callbacks
 
@@ -66,6 +76,7 @@ PADDLES = "paddles"
 MAP = "map"
 SCORE = "score"
 KICKED_PLAYERS = "kicked_players"
+BROADCAST_RATE = "broadcast_rate"
 PLAYER1 = "Player1"
 PLAYER2 = "Player2"
 
@@ -123,3 +134,12 @@ ONLINE_KEY = "online"
 PLAYING_KEY = "playing"
 OFFLINE_KEY = "offline"
 FRIENDS_REQUESTS_KEY = "requests"
+
+# Presence keys
+PRESENCE = "presence"
+PRESENCE_UPDATE = "presence_update"
+PRESENCE_SNAPSHOT = "presence_snapshot"
+FRIENDS_UPDATE = "friends_update"
+FRIENDS_INFO = "friends_info"
+HEARTBEAT = "heartbeat"
+USERNAME = "username"
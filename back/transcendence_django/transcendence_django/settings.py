@@ -210,4 +210,11 @@ MINIO_ROOT_USER = os.getenv("MINIO_ROOT_USER")
 MINIO_ROOT_PASSWORD = os.getenv("MINIO_ROOT_PASSWORD")
 MINIO_STORAGE_USE_HTTPS = True
 MINIO_STORAGE_MEDIA_BUCKET_NAME = "avatars"
+MINIO_STORAGE_REPLAY_BUCKET_NAME = "replays"
 DEFAULT_AVATAR_PATH = "default_avatar.jpg"
+
+# Physics engine stepping the arenas: "object" or "numpy"
+GAME_PHYSICS_ENGINE = os.getenv("GAME_PHYSICS_ENGINE", "object")
+
+# Encoder of the JSON game messages: "json" or "orjson"
+GAME_JSON_ENCODER = os.getenv("GAME_JSON_ENCODER", "json")
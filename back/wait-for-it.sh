@@ -9,6 +9,9 @@ python3 manage.py makemigrations shared_models
 python3 manage.py migrate shared_models
 python3 manage.py makemigrations
 python3 manage.py migrate
+python3 manage.py backfill_user_stats
+python3 manage.py backfill_history
+python3 manage.py reconcile_leaderboard
 python3 manage.py showmigrations
 
 echo "command is " "$cmd"
@@ -9,7 +9,7 @@ describe('GameComponent', () => {
   let component: GameComponent;
   let fixture: ComponentFixture<GameComponent>;
   let webSocketService: WebSocketService;
-  let sendPaddleMovementSpy: jasmine.Spy;
+  let sendPaddleInputSpy: jasmine.Spy;
 
   beforeEach(async () => {
       await TestBed.configureTestingModule({
@@ -21,7 +21,7 @@ describe('GameComponent', () => {
       component = fixture.componentInstance;
       fixture.detectChanges();
       webSocketService = TestBed.inject(WebSocketService);
-      sendPaddleMovementSpy = spyOn(webSocketService, 'sendPaddleMovement').and.callThrough();
+      sendPaddleInputSpy = spyOn(webSocketService, 'sendPaddleInput').and.callThrough();
   });
 
 
@@ -53,16 +53,36 @@ describe('GameComponent', () => {
     const event = new KeyboardEvent('keydown', { key: 'w' });
     window.dispatchEvent(event);
     component['gameLoop']();
-    expect(sendPaddleMovementSpy).toHaveBeenCalledWith("Player1", -1);
+    expect(sendPaddleInputSpy).toHaveBeenCalledWith("Player1", -1);
  });
 
  it('should move paddle down on pressed keys', () => {
     const event = new KeyboardEvent('keydown', { key: 's' });
     window.dispatchEvent(event);
     component['gameLoop']();
-    expect(sendPaddleMovementSpy).toHaveBeenCalledWith("Player1", 1);
+    expect(sendPaddleInputSpy).toHaveBeenCalledWith("Player1", 1);
  });
 
+  it('should send the input again when the socket was not open', () => {
+    sendPaddleInputSpy.and.returnValue(false);
+    window.dispatchEvent(new KeyboardEvent('keydown', { key: 'w' }));
+    component['gameLoop']();
+    component['gameLoop']();
+    expect(sendPaddleInputSpy).toHaveBeenCalledTimes(2);
+  });
+
+  it('should send a held input once until the socket reconnects', () => {
+    sendPaddleInputSpy.and.returnValue(true);
+    window.dispatchEvent(new KeyboardEvent('keydown', { key: 'w' }));
+    component['gameLoop']();
+    component['gameLoop']();
+    expect(sendPaddleInputSpy).toHaveBeenCalledTimes(1);
+    webSocketService['_connectionOpened'].next();
+    component['gameLoop']();
+    expect(sendPaddleInputSpy).toHaveBeenCalledTimes(2);
+    expect(sendPaddleInputSpy).toHaveBeenCalledWith("Player1", -1);
+  });
+
   it('should call movePaddle for each paddle in gameLoop', () => {
     spyOn(component as any, 'movePaddle');
     component['gameLoop']();
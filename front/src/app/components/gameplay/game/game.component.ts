@@ -121,6 +121,7 @@ export class GameComponent implements OnInit, AfterViewInit, OnDestroy {
   private lobbyID: string = '';
   private lobbySubscription: Subscription | null = null;
   private activePlayersSubscription: Subscription | null = null;
+  private connectionOpenedSubscription: Subscription | null = null;
   readonly lineThickness: number = LINE_THICKNESS;
   gameWidth: number = GAME_WIDTH;
   gameHeight: number = GAME_HEIGHT;
@@ -144,6 +145,7 @@ export class GameComponent implements OnInit, AfterViewInit, OnDestroy {
     [GIVEN_UP]: this.redirectToHome.bind(this),
   };
   private _pressedKeys = new Set<string>();
+  private _sentInputs = new Map<string, number>();
 
   constructor (
     private userService: UserService,
@@ -163,6 +165,10 @@ export class GameComponent implements OnInit, AfterViewInit, OnDestroy {
   }
 
   async ngOnInit(): Promise<void> {
+    // A new connection starts with no input held
+    this.connectionOpenedSubscription = this.webSocketService.getConnectionOpenedEvent().subscribe(() => {
+      this._sentInputs.clear();
+    });
     this.gameStateService.isRemote$.subscribe(isRemote => {
       this.isRemote = isRemote;
     });
@@ -205,6 +211,8 @@ export class GameComponent implements OnInit, AfterViewInit, OnDestroy {
   }
 
   public setArena(arena: ArenaResponse) {
+    // Sent on join and when the game starts again: held inputs are sent again
+    this._sentInputs.clear();
     this.paddles.forEach((paddle, index) => {
       // console.log("Index = ", index);
       const paddleData = arena.paddles.find(p => p.slot === paddle.id);
@@ -241,6 +249,9 @@ export class GameComponent implements OnInit, AfterViewInit, OnDestroy {
   private async handleGameUpdate(gameState: any) {
     const variableMappingArena : VariableMapping = {
         'paddle': (value: PaddleUpdateResponse) => this.updatePaddle(value),
+        'paddles': (value: Array<PaddleUpdateResponse>) => {
+          value.forEach(paddle => this.updatePaddle(paddle));
+        },
         'ball': (value: BallUpdateResponse) => { this.updateBall(value) },
         'score': (value: ScoreUpdateResponse) => { this.updateScore(value) },
         'start_timer': (value: StartTimerResponse) => { this.updateStartTimer(value) },
@@ -467,12 +478,16 @@ export class GameComponent implements OnInit, AfterViewInit, OnDestroy {
     const isMovingUp = this._pressedKeys.has(binding.upKey);
     const isMovingDown = this._pressedKeys.has(binding.downKey);
 
-    if ((isMovingUp && isMovingDown) || this.bots.includes(playerName)) {
+    if (this.bots.includes(playerName)) {
       return;
     }
-    const direction = isMovingUp ? -1 : isMovingDown ? 1 : 0;
-    if (direction !== 0) {
-      this.webSocketService.sendPaddleMovement(playerName, direction);
+    // The server moves the paddle while an input is held: only changes are sent
+    const direction = isMovingUp === isMovingDown ? 0 : isMovingUp ? -1 : 1;
+    if (direction !== (this._sentInputs.get(playerName) ?? 0)) {
+      // Sent again on the next frame if the socket is not open yet
+      if (this.webSocketService.sendPaddleInput(playerName, direction)) {
+        this._sentInputs.set(playerName, direction);
+      }
     }
   }
 
@@ -494,6 +509,9 @@ export class GameComponent implements OnInit, AfterViewInit, OnDestroy {
     if (this.activePlayersSubscription) {
       this.activePlayersSubscription.unsubscribe();
     }
+    if (this.connectionOpenedSubscription) {
+      this.connectionOpenedSubscription.unsubscribe();
+    }
     this.gameStateService.restrictReset();
     console.log('GameComponent destroyed');
   }
@@ -29,8 +29,7 @@ export class GameSummaryListComponent implements AfterViewInit {
   gameSummaries$: Observable<GameSummaryResponse[]> | undefined;
   public isComplete: boolean = false;
   public isWaiting: boolean = true;
-  private startIndex: number = 0;
-  private endIndex: number = GAME_HISTORY_COUNT_REQUEST - 1;
+  private cursor: string | null = null;
   private allSummaries: GameSummaryResponse[] = [];
   public filterType: 'all' | 'local' | 'online' = 'all';
 
@@ -46,12 +45,11 @@ export class GameSummaryListComponent implements AfterViewInit {
   }
 
   public loadMoreSummaries(): void {
-    this.userService.getSummaries(this.startIndex, this.endIndex + 1, this.filterType).subscribe(summaries => {
+    this.userService.getSummaries(this.cursor, GAME_HISTORY_COUNT_REQUEST, this.filterType).subscribe(summaries => {
       this.allSummaries = [...this.allSummaries, ...summaries.summaries];
       this.gameSummaries$ = of(this.allSummaries);
       if (summaries.has_more) {
-        this.startIndex = this.endIndex + 1;
-        this.endIndex += GAME_HISTORY_COUNT_REQUEST;
+        this.cursor = summaries.next_cursor;
         this.isComplete = false;
       } else {
         this.isComplete = true;
@@ -61,8 +59,7 @@ export class GameSummaryListComponent implements AfterViewInit {
   }
 
   public refreshSummaries(): void {
-    this.startIndex = 0;
-    this.endIndex = GAME_HISTORY_COUNT_REQUEST - 1;
+    this.cursor = null;
     this.allSummaries = [];
     this.loadMoreSummaries();
   }
@@ -15,6 +15,16 @@ export const API_USER = `https://${environment.servIP}:8002/user`;
 export const API_GAME = `https://${environment.servIP}:8001/game`;
 export const API_GAME_SOCKET = `wss://${environment.servIP}:8001`;
 export const API_FRIENDS = `https://${environment.servIP}:8004/friends`;
+export const API_FRIENDS_SOCKET = `wss://${environment.servIP}:8004`;
+
+// Binary game snapshots, negotiated as a websocket subprotocol
+export const USE_BINARY_SNAPSHOTS = true;
+export const BINARY_SNAPSHOT_PROTOCOL = 'pong.snapshot.v2';
+
+// Presence websocket, the server expires connections silent for 60 s
+export const PRESENCE_HEARTBEAT_INTERVAL_MS = 20000;
+export const PRESENCE_RECONNECT_DELAY_MS = 2000;
+export const PRESENCE_MAX_RECONNECT_DELAY_MS = 30000;
 
 
 // TIMEZONE
@@ -1,6 +1,7 @@
 import { Injectable } from '@angular/core';
 import { CanActivate, Router } from '@angular/router';
 import { AuthService } from '../services/auth/auth.service';
+import { PresenceService } from '../services/presence/presence.service';
 import { Observable } from 'rxjs';
 import { map } from 'rxjs/operators';
 
@@ -9,7 +10,11 @@ import { map } from 'rxjs/operators';
 })
 export class AuthGuard implements CanActivate {
 
-  constructor(private authService: AuthService, private router: Router) {}
+  constructor(
+    private authService: AuthService,
+    private presenceService: PresenceService,
+    private router: Router,
+  ) {}
 
   canActivate(): Observable<boolean> {
     return this.authService.isLoggedIn().pipe(
@@ -18,6 +23,7 @@ export class AuthGuard implements CanActivate {
           this.router.navigate(['/sign-in']);
           return false;
         }
+        this.presenceService.connect();
         return true;
       })
     );
@@ -15,4 +15,5 @@ export interface GameSummaryResponse {
 export interface GameHistoryResponse {
   has_more: boolean;
   summaries: GameSummaryResponse[];
+  next_cursor: string | null;
 }
@@ -4,6 +4,7 @@ import { catchError, map, Observable, of } from 'rxjs';
 import { Router } from "@angular/router";
 import { API_AUTH } from "../../constants";
 import * as CryptoJS from 'crypto-js';
+import { PresenceService } from "../presence/presence.service";
 
 interface SignInResponse {
   detail: string;
@@ -14,7 +15,11 @@ interface SignInResponse {
 })
 
 export class AuthService {
-  constructor(private http: HttpClient, private router: Router) {}
+  constructor(
+    private http: HttpClient,
+    private router: Router,
+    private presenceService: PresenceService,
+  ) {}
 
   public signIn(login: string, password: string): Observable<SignInResponse> {
     password = this.hashPassword(password);
@@ -51,6 +56,7 @@ export class AuthService {
   }
 
   public logout(): void {
+    this.presenceService.disconnect();
     this.processLogout().subscribe(() => {
       this.router.navigate(['/sign-in']);
     });
@@ -65,6 +71,7 @@ export class AuthService {
   }
 
   public deleteAccount(): Observable<any> {
+    this.presenceService.disconnect();
     return this.http.post(`${API_AUTH}/delete_account/`, {});
   }
 }
@@ -13,6 +13,7 @@ export class ConnectionService {
   private connectionOpenedSubscription?: Subscription;
   private WebSocketSubscription?: Subscription;
   private WebSocketMessagesSubscription?: Subscription;
+  private WebSocketSnapshotsSubscription?: Subscription;
   private joinSubscription?: Subscription;
   private lobbyID: string = '';
 
@@ -33,6 +34,9 @@ export class ConnectionService {
         handleGameError(data.error);
       }
     });
+    this.WebSocketSnapshotsSubscription = this.webSocketService.getSnapshots().subscribe(async update => {
+      await handleGameUpdate(update);
+    });
   }
 
   public establishConnection(arenaSetter: (response: ArenaResponse) => void, lobby_id?: string, arena_id: number | null = null, isTournament: boolean =false) {
@@ -60,6 +64,7 @@ export class ConnectionService {
     this.joinSubscription?.unsubscribe();
     this.WebSocketSubscription?.unsubscribe();
     this.WebSocketMessagesSubscription?.unsubscribe();
+    this.WebSocketSnapshotsSubscription?.unsubscribe();
     console.log('WebSocket connection closed');
   }
 
@@ -4,13 +4,17 @@ import { BehaviorSubject, Observable } from 'rxjs';
 import { tap } from 'rxjs/operators';
 import { API_FRIENDS } from "../../constants";
 
-interface FriendsInfo {
+export interface FriendsInfo {
   requests: string[];
   playing: string[];
   online: string[];
   offline: string[];
 }
 
+export type Presence = 'playing' | 'online' | 'offline';
+
+const PRESENCES: Presence[] = ['playing', 'online', 'offline'];
+
 @Injectable({
   providedIn: 'root'
 })
@@ -36,6 +40,24 @@ export class FriendService {
     );
   }
 
+  public setFriendData(friendData: FriendsInfo): void {
+    this._friendsDataSubject.next(friendData);
+  }
+
+  // Moves a friend to the list of its new presence, pushed by the server.
+  public setPresence(friendName: string, presence: Presence): void {
+    const friendData = this._friendsDataSubject.getValue();
+    if (!PRESENCES.some(known => friendData[known].includes(friendName))) {
+      return;
+    }
+    const updated: FriendsInfo = { ...friendData };
+    for (const known of PRESENCES) {
+      updated[known] = friendData[known].filter(name => name !== friendName);
+    }
+    updated[presence] = [...updated[presence], friendName];
+    this._friendsDataSubject.next(updated);
+  }
+
   public sendRequest(friendName: string): Observable<any> {
     return this.http.post<any>(`${API_FRIENDS}/send_request/`, { friendName });
   }
@@ -0,0 +1,16 @@
+import { TestBed } from '@angular/core/testing';
+
+import { PresenceService } from './presence.service';
+
+describe('PresenceService', () => {
+  let service: PresenceService;
+
+  beforeEach(() => {
+    TestBed.configureTestingModule({});
+    service = TestBed.inject(PresenceService);
+  });
+
+  it('should be created', () => {
+    expect(service).toBeTruthy();
+  });
+});
@@ -0,0 +1,95 @@
+import { Injectable } from '@angular/core';
+import {
+  API_FRIENDS_SOCKET,
+  PRESENCE_HEARTBEAT_INTERVAL_MS,
+  PRESENCE_MAX_RECONNECT_DELAY_MS,
+  PRESENCE_RECONNECT_DELAY_MS
+} from "../../constants";
+import { FriendService } from "../friend/friend.service";
+
+// Keeps the user online while the app is open, and the friends data up to
+// date with the presence changes pushed by the server.
+@Injectable({
+  providedIn: 'root'
+})
+export class PresenceService {
+  private socket: WebSocket | null = null;
+  private heartbeat: ReturnType<typeof setInterval> | null = null;
+  private reconnect: ReturnType<typeof setTimeout> | null = null;
+  private reconnectDelay: number = PRESENCE_RECONNECT_DELAY_MS;
+  private active: boolean = false;
+
+  constructor(private friendService: FriendService) {}
+
+  public connect(): void {
+    this.active = true;
+    if (this.socket || this.reconnect) {
+      return;
+    }
+    const socket = new WebSocket(`${API_FRIENDS_SOCKET}/ws/presence/`);
+
+    socket.onopen = () => {
+      this.reconnectDelay = PRESENCE_RECONNECT_DELAY_MS;
+      this.heartbeat = setInterval(() => {
+        socket.send(JSON.stringify({ type: 'heartbeat' }));
+      }, PRESENCE_HEARTBEAT_INTERVAL_MS);
+    };
+
+    socket.onmessage = (event) => {
+      this.handleMessage(JSON.parse(event.data));
+    };
+
+    socket.onclose = () => {
+      this.stopHeartbeat();
+      this.socket = null;
+      if (this.active) {
+        this.scheduleReconnect();
+      }
+    };
+
+    this.socket = socket;
+  }
+
+  public disconnect(): void {
+    this.active = false;
+    if (this.reconnect) {
+      clearTimeout(this.reconnect);
+      this.reconnect = null;
+    }
+    this.stopHeartbeat();
+    if (this.socket) {
+      this.socket.onclose = null;
+      this.socket.close(1000, "Client disconnect.");
+      this.socket = null;
+    }
+  }
+
+  private handleMessage(data: any): void {
+    switch (data.type) {
+      case 'presence_snapshot':
+        this.friendService.setFriendData(data.friends_info);
+        break;
+      case 'presence_update':
+        this.friendService.setPresence(data.username, data.presence);
+        break;
+      case 'friends_update':
+        this.friendService.refreshFriendData().subscribe();
+        break;
+    }
+  }
+
+  private scheduleReconnect(): void {
+    this.reconnect = setTimeout(() => {
+      this.reconnect = null;
+      this.connect();
+    }, this.reconnectDelay);
+    this.reconnectDelay = Math.min(this.reconnectDelay * 2, PRESENCE_MAX_RECONNECT_DELAY_MS);
+  }
+
+  private stopHeartbeat(): void {
+    if (this.heartbeat) {
+      clearInterval(this.heartbeat);
+      this.heartbeat = null;
+    }
+  }
+}
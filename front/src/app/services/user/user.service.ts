@@ -146,8 +146,8 @@ export class UserService {
     }
   }
 
-  public getSummaries(startIndex: number, endIndex: number, filter: string): Observable<GameHistoryResponse> {
-    const postData: string = JSON.stringify({'user_id': this.getUserID(), 'start_index': startIndex, 'end_index': endIndex, filter: filter});
+  public getSummaries(cursor: string | null, limit: number, filter: string): Observable<GameHistoryResponse> {
+    const postData: string = JSON.stringify({'user_id': this.getUserID(), 'cursor': cursor, 'limit': limit, filter: filter});
     return this.http.post<GameHistoryResponse>(`${API_USER}/get_game_summaries/`, postData);
   }
 
@@ -0,0 +1,76 @@
+// Decoder for the binary snapshot frames sent by back_game/app_settings/snapshot_encoder.py.
+// Each frame only holds the fields that changed since the previous frame of the same arena
+// and names the arena by a one byte ref, so the decoder keeps the arena id of each ref.
+
+const ARENA_ID_FIELD = 0x01;
+const BALL_FIELD = 0x02;
+const STATUS_FIELD = 0x04;
+const PADDLE_FIELD = 0x08;
+const PADDLES_FIELD = 0x10;
+// The ball is sent in fixed point, in 1/BALL_SCALE pixels
+const BALL_SCALE = 16;
+
+interface ArenaState {
+  arenaId: string;
+}
+
+export class SnapshotDecoder {
+  private arenas: Map<number, ArenaState> = new Map();
+
+  public reset(): void {
+    this.arenas.clear();
+  }
+
+  // Returns the game update carried by the frame, or null if the frame refers to an arena
+  // the decoder has no baseline for, in which case the caller should ask for a resync.
+  public decode(buffer: ArrayBuffer): any | null {
+    const view = new DataView(buffer);
+    const arenaRef = view.getUint8(0);
+    const fieldMask = view.getUint8(1);
+    let offset = 2;
+
+    if (fieldMask & ARENA_ID_FIELD) {
+      this.arenas.set(arenaRef, { arenaId: view.getBigUint64(offset, true).toString() });
+      offset += 8;
+    }
+    const arena = this.arenas.get(arenaRef);
+    if (!arena) {
+      return null;
+    }
+
+    const update: any = { arena_id: arena.arenaId };
+    if (fieldMask & BALL_FIELD) {
+      update.ball = {
+        position: {
+          x: view.getInt32(offset, true) / BALL_SCALE,
+          y: view.getInt32(offset + 4, true) / BALL_SCALE,
+        },
+      };
+      offset += 8;
+    }
+    if (fieldMask & STATUS_FIELD) {
+      update.status = view.getUint8(offset);
+      offset += 1;
+    }
+    if (fieldMask & PADDLE_FIELD) {
+      update.paddle = {
+        slot: view.getUint8(offset),
+        position: { x: view.getInt16(offset + 1, true), y: view.getInt16(offset + 3, true) },
+      };
+      offset += 5;
+    }
+    if (fieldMask & PADDLES_FIELD) {
+      const count = view.getUint8(offset);
+      offset += 1;
+      update.paddles = [];
+      for (let i = 0; i < count; i++) {
+        update.paddles.push({
+          slot: view.getUint8(offset),
+          position: { x: view.getInt16(offset + 1, true), y: view.getInt16(offset + 3, true) },
+        });
+        offset += 5;
+      }
+    }
+    return update;
+  }
+}
@@ -3,7 +3,8 @@ import { Observable, Subject } from 'rxjs';
 import {ArenaResponse} from "../../interfaces/arena-response.interface";
 import {UserService} from "../user/user.service";
 import { OnInit } from '@angular/core';
-import { API_GAME_SOCKET } from "../../constants";
+import { API_GAME_SOCKET, BINARY_SNAPSHOT_PROTOCOL, USE_BINARY_SNAPSHOTS } from "../../constants";
+import { SnapshotDecoder } from "./snapshot-decoder";
 
 @Injectable({
   providedIn: 'root'
@@ -12,6 +13,8 @@ export class WebSocketService implements OnInit, OnDestroy {
   socket?: WebSocket | null;
   private _connectionOpened: Subject<void> = new Subject<void>();
   private _messages: Subject<string> = new Subject<string>();
+  private _snapshots: Subject<any> = new Subject<any>();
+  private _snapshotDecoder: SnapshotDecoder = new SnapshotDecoder();
   private _logoutLobby: BroadcastChannel;
   private _username: string = '';
   private _usernameLoaded: Promise<void> | null = null;
@@ -53,14 +56,22 @@ export class WebSocketService implements OnInit, OnDestroy {
       url = `${API_GAME_SOCKET}/ws/game/classic/${lobby_id}/`;
     }
 
-    const socket = new WebSocket(url);
+    const socket = USE_BINARY_SNAPSHOTS ? new WebSocket(url, [BINARY_SNAPSHOT_PROTOCOL]) : new WebSocket(url);
+    socket.binaryType = 'arraybuffer';
+    this._snapshotDecoder.reset();
 
     socket.onopen = (event) => {
       console.log('WebSocket connection opened:', event);
       this._connectionOpened.next();
     };
 
-    socket.onmessage = (event) => this._messages.next(event.data);
+    socket.onmessage = (event) => {
+      if (event.data instanceof ArrayBuffer) {
+        this.handleSnapshot(event.data);
+      } else {
+        this._messages.next(event.data);
+      }
+    };
 
     socket.onerror = (event) => {
       console.error('WebSocket error observed:', event);
@@ -84,6 +95,22 @@ export class WebSocketService implements OnInit, OnDestroy {
     this.socket = socket;
   }
 
+  private handleSnapshot(frame: ArrayBuffer): void {
+    const update = this._snapshotDecoder.decode(frame);
+    if (update === null) {
+      this.resync();
+      return;
+    }
+    this._snapshots.next(update);
+  }
+
+  // Asks the server to start again from full frames, after losing track of an arena ref.
+  public resync(): void {
+    console.log('Resyncing binary snapshots');
+    this._snapshotDecoder.reset();
+    this.send('resync', {});
+  }
+
   public disconnect(): void {
     if (this.socket) {
       // Remove event listeners
@@ -109,6 +136,16 @@ export class WebSocketService implements OnInit, OnDestroy {
     }
   }
 
+  // Returns whether the input was sent.
+  public sendPaddleInput(playerName: string, direction: number): boolean {
+    if (this.socket && this.socket.readyState === WebSocket.OPEN) {
+      this.send('paddle_input', {"player": playerName, "direction": direction});
+      return true;
+    }
+    console.log('WebSocket is not open when trying to send paddle input');
+    return false;
+  }
+
   public giveUp(): void {
     console.log('Giving Up');
     if (this.socket && this.socket.readyState === WebSocket.OPEN) {
@@ -155,6 +192,10 @@ export class WebSocketService implements OnInit, OnDestroy {
     return this._messages.asObservable();
   }
 
+  public getSnapshots(): Observable<any> {
+    return this._snapshots.asObservable();
+  }
+
   async ngOnInit() : Promise<void> {
     await this.userService.whenUserDataLoaded();
     this._username = await this.userService.getUsername();
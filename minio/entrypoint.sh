@@ -10,5 +10,6 @@ mc alias set data https://localhost:443 "$MINIO_ROOT_USER" "$MINIO_ROOT_PASSWORD
 mc mb data/avatars --insecure
 mc cp /media/default_avatar.jpg data/avatars/default_avatar.jpg --insecure
 mc anonymous set public data/avatars --insecure
+mc mb data/replays --insecure
 
 wait $MINIO_PID